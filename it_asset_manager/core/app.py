@@ -14,6 +14,11 @@ from typing import Optional
 from config.settings import get_config
 from .database import init_db, create_tables
 from .auth import init_auth
+from .cache import init_cache
+from .autocomplete import init_autocomplete
+from .jobs import init_jobs
+from .instrumentation import init_instrumentation
+from .commands import register_commands
 
 
 def create_app(config_name: Optional[str] = None) -> Flask:
@@ -37,14 +42,24 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     
     # Initialize extensions
     init_db(app)
+    init_cache(app)
+    init_autocomplete(app)
     init_auth(app)
+    init_jobs(app)
+    init_instrumentation(app)
     
     # Register blueprints
     register_blueprints(app)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Create database tables
     create_tables(app)
     
+    # Fail import jobs left behind by stopped workers
+    recover_jobs(app)
+    
     # Setup logging
     setup_logging(app)
     
@@ -66,12 +81,31 @@ def register_blueprints(app: Flask) -> None:
     from ..routes.access import access_bp
     from ..routes.main import main_bp
     from ..routes.health import health_bp
+    from ..routes.jobs import jobs_bp
+    from ..routes.api import api_bp
     
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(assets_bp, url_prefix='/assets')
     app.register_blueprint(access_bp, url_prefix='/access')
     app.register_blueprint(health_bp)
+    app.register_blueprint(jobs_bp, url_prefix='/jobs')
+    app.register_blueprint(api_bp, url_prefix='/api/v1')
+
+
+def recover_jobs(app: Flask) -> None:
+    """
+    Fail import jobs whose worker stopped before they finished.
+    
+    Args:
+        app: Flask application instance
+    """
+    from ..services.import_job_service import ImportJobService
+    
+    with app.app_context():
+        failed = ImportJobService.fail_stale_jobs()
+    if failed:
+        app.logger.warning('Marked %d interrupted import jobs as failed', failed)
 
 
 def setup_logging(app: Flask) -> None:
@@ -0,0 +1,236 @@
+"""
+In-memory prefix indexes for autocomplete.
+
+This module keeps, per process, the sorted distinct values of the columns
+that autocomplete fields read. A lookup bisects to the first value with
+the typed prefix (case-insensitively) and reads at most a capped number of
+values from there, so suggesting never touches the database while the
+index is current.
+
+Each index remembers the generation of its table (see core.cache) it was
+built at. Values of rows inserted through the ORM are added in place when
+their commit bumps the generation by exactly one; anything else, such as
+a changed or deleted value, an INSERT/UPDATE/DELETE statement or a write
+from another process, leaves the index behind and the next lookup rebuilds
+it with one DISTINCT read of the column. Rows added with
+Session.bulk_insert_mappings() must not share a commit with flushed
+inserts into the same table, or the index misses them until its next
+rebuild.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .database import db
+
+# Session.info keys: tables written by flushes, values of flushed inserts
+# per (table, column) and tables written in ways the indexes cannot follow
+_WRITTEN_TABLES_KEY = 'autocomplete_written'
+_ADDED_VALUES_KEY = 'autocomplete_added'
+_UNTRACKED_TABLES_KEY = 'autocomplete_untracked'
+
+
+class SortedValues:
+    """
+    Sorted distinct strings searchable by case-insensitive prefix.
+    
+    Values are kept as (casefolded, value) pairs so that differently cased
+    values sort together and both remain suggestible.
+    """
+    
+    def __init__(self, values: Iterable[Optional[str]] = ()) -> None:
+        self._entries: List[Tuple[str, str]] = sorted({(value.casefold(), value) for value in values if value})
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add(self, value: Optional[str]) -> None:
+        """
+        Add a value unless it is empty or already present.
+        
+        Args:
+            value: Value to add
+        """
+        if not value:
+            return
+        entry = (value.casefold(), value)
+        position = bisect_left(self._entries, entry)
+        if position == len(self._entries) or self._entries[position] != entry:
+            insort(self._entries, entry, position)
+    
+    def search(self, prefix: str, limit: int) -> List[str]:
+        """
+        Find values starting with a prefix, ignoring case.
+        
+        Args:
+            prefix: Typed prefix; an empty prefix matches every value
+            limit: Maximum number of values to return
+            
+        Returns:
+            Matching values in sorted order
+        """
+        key = prefix.casefold()
+        matches = []
+        for folded, value in self._entries[bisect_left(self._entries, (key,)):]:
+            if len(matches) >= limit or not folded.startswith(key):
+                break
+            matches.append(value)
+        return matches
+
+
+class AutocompleteIndex:
+    """Per-process SortedValues of columns, kept at their table's generation."""
+    
+    def __init__(self, counter: Any) -> None:
+        self.counter = counter
+        self._indexes: Dict[Tuple[str, str], Tuple[int, SortedValues]] = {}
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+    
+    def suggest(self, column: Any, prefix: str, limit: int) -> List[str]:
+        """
+        Suggest values of a column starting with a prefix.
+        
+        Args:
+            column: Model column, e.g. GitHubAccess.repo_name
+            prefix: Typed prefix
+            limit: Maximum number of suggestions
+            
+        Returns:
+            Matching distinct values in sorted order
+        """
+        key = (column.table.name, column.key)
+        # Read the generation before the values: a commit landing meanwhile
+        # leaves the index at the older generation, never the newer one
+        generation = self.counter.get(key[0])
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and entry[0] == generation:
+                return entry[1].search(prefix, limit)
+        
+        values = SortedValues(value for value, in db.session.query(column).distinct())
+        with self._lock:
+            self._indexes[key] = (generation, values)
+            self.rebuilds += 1
+        return values.search(prefix, limit)
+    
+    def indexed_columns(self, table: str) -> List[str]:
+        """Keys of the indexed columns of a table."""
+        return [column for indexed_table, column in list(self._indexes) if indexed_table == table]
+    
+    def apply_commit(self, added: Dict[Tuple[str, str], Set[str]], tables: Iterable[str]) -> None:
+        """
+        Add the inserted values of a commit to indexes that were current before it.
+        
+        Args:
+            added: Inserted values per (table, column)
+            tables: Tables whose writes in the commit the indexes can follow
+        """
+        for table in tables:
+            generation = self.counter.get(table)
+            with self._lock:
+                for key, (indexed_at, values) in list(self._indexes.items()):
+                    if key[0] != table or indexed_at != generation - 1:
+                        continue
+                    for value in added.get(key, ()):
+                        values.add(value)
+                    self._indexes[key] = (generation, values)
+    
+    def clear(self) -> None:
+        """Drop all indexes."""
+        with self._lock:
+            self._indexes.clear()
+
+
+def init_autocomplete(app: Flask) -> None:
+    """
+    Attach the autocomplete index to the Flask app.
+    
+    Must be called after init_cache(), whose generation counters the
+    index follows and whose commit hook must bump them first.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.extensions['autocomplete'] = AutocompleteIndex(app.extensions['stats_generation'])
+    _register_session_events()
+
+
+def get_autocomplete() -> AutocompleteIndex:
+    """
+    Get the autocomplete index of the current app.
+    
+    Returns:
+        AutocompleteIndex instance
+    """
+    return current_app.extensions['autocomplete']
+
+
+def _register_session_events() -> None:
+    """Install the session hooks that follow writes to indexed columns (once per process)."""
+    if event.contains(Session, 'after_commit', _apply_after_commit):
+        return
+    event.listen(Session, 'after_flush', _track_flush)
+    event.listen(Session, 'do_orm_execute', _track_execute)
+    event.listen(Session, 'after_commit', _apply_after_commit)
+    event.listen(Session, 'after_rollback', _discard_changes)
+
+
+def _current_index() -> Optional[AutocompleteIndex]:
+    """Autocomplete index of the current app, if any."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('autocomplete')
+
+
+def _track_flush(session: Session, flush_context: Any) -> None:
+    """Record flushed tables and inserted values; changes and deletes of indexed values untrack the table."""
+    index = _current_index()
+    if index is None:
+        return
+    
+    written = session.info.setdefault(_WRITTEN_TABLES_KEY, set())
+    added = session.info.setdefault(_ADDED_VALUES_KEY, {})
+    untracked = session.info.setdefault(_UNTRACKED_TABLES_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        columns = index.indexed_columns(table) if table else []
+        if not columns:
+            continue
+        written.add(table)
+        if obj in session.new:
+            for column in columns:
+                added.setdefault((table, column), set()).add(getattr(obj, column))
+        elif obj in session.deleted:
+            untracked.add(table)
+        elif any(inspect(obj).attrs[column].history.has_changes() for column in columns):
+            untracked.add(table)
+
+
+def _track_execute(orm_execute_state: Any) -> None:
+    """Untrack tables targeted by INSERT/UPDATE/DELETE statements run on the session."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault(_UNTRACKED_TABLES_KEY, set()).add(table.name)
+
+
+def _apply_after_commit(session: Session) -> None:
+    """Bring the indexes of tables written only by followed flushes up to date."""
+    written = session.info.pop(_WRITTEN_TABLES_KEY, set())
+    added = session.info.pop(_ADDED_VALUES_KEY, {})
+    untracked = session.info.pop(_UNTRACKED_TABLES_KEY, set())
+    index = _current_index()
+    if index is not None and written - untracked:
+        index.apply_commit(added, written - untracked)
+
+
+def _discard_changes(session: Session) -> None:
+    """Forget tracked writes of a rolled back transaction."""
+    for key in (_WRITTEN_TABLES_KEY, _ADDED_VALUES_KEY, _UNTRACKED_TABLES_KEY):
+        session.info.pop(key, None)
@@ -0,0 +1,350 @@
+"""
+Write-invalidated caching keyed by data generations.
+
+This module keeps one generation counter per tracked table in a small
+memory-mapped file that every worker process of the app maps. Committing
+a session that wrote to a tracked table bumps that table's counter from
+the session's after_commit hook. Cached values are stored together with
+the generations they were computed at, so a lookup is one read of the
+shared counters plus a dictionary lookup, and a value computed before a
+commit can never be returned once that commit has returned.
+
+The same counters version HTTP responses: conditional_on_data() gives a
+view a strong ETag derived from the generations of the tables it reads
+and answers a matching If-None-Match with 304 Not Modified before the
+view runs.
+
+Writes are detected from flushes and from INSERT/UPDATE/DELETE statements
+executed on the session. Writes that bypass both, such as
+Session.bulk_insert_mappings(), must call mark_changed().
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes invalidate cached statistics, in counter slot order
+TRACKED_TABLES = ('assets', 'application_access', 'github_access')
+
+# File layout: an epoch identifying the file, then one counter per table.
+# Slots are 8-byte aligned, so each is read and written as one machine word.
+_SLOT = struct.Struct('<Q')
+_FILE_SIZE = _SLOT.size * (1 + len(TRACKED_TABLES))
+
+# Session.info key collecting tracked tables written in the current transaction
+_CHANGED_TABLES_KEY = 'changed_tables'
+
+
+class GenerationCounter:
+    """
+    Per-table generation counters shared by all processes mapping one file.
+    
+    Without a path the counters live in anonymous memory and are only
+    shared by the threads of this process. Increments take an exclusive
+    fcntl lock on the file, so they are atomic across processes; where
+    fcntl is unavailable (Windows) only threads are serialized, which is
+    fine for the single-process development server.
+    """
+    
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            with self._file_lock():
+                if os.fstat(self._fd).st_size < _FILE_SIZE:
+                    os.ftruncate(self._fd, _FILE_SIZE)
+                self._map = mmap.mmap(self._fd, _FILE_SIZE)
+                if not self._read(0):
+                    self._write(0, int.from_bytes(os.urandom(7), 'little') or 1)
+        else:
+            self._map = mmap.mmap(-1, _FILE_SIZE)
+            self._write(0, int.from_bytes(os.urandom(7), 'little') or 1)
+        
+        self.epoch = self._read(0)
+    
+    def get(self, table: str) -> int:
+        """
+        Current generation of a table.
+        
+        Args:
+            table: Tracked table name
+            
+        Returns:
+            Generation counter value
+        """
+        return self._read(1 + TRACKED_TABLES.index(table))
+    
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Generations of several tables, prefixed with the file epoch.
+        
+        The epoch changes if the counter file is recreated, so keys taken
+        before that can never match counters that restarted from zero.
+        """
+        return (self.epoch,) + tuple(self.get(table) for table in tables)
+    
+    def bump(self, tables: Iterable[str]) -> None:
+        """
+        Increment the generations of tables.
+        
+        Args:
+            tables: Tracked table names
+        """
+        slots = sorted({1 + TRACKED_TABLES.index(table) for table in tables})
+        if not slots:
+            return
+        with self._file_lock():
+            for slot in slots:
+                self._write(slot, self._read(slot) + 1)
+    
+    def close(self) -> None:
+        """Unmap the counters and close the file."""
+        self._map.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def _read(self, slot: int) -> int:
+        return _SLOT.unpack_from(self._map, slot * _SLOT.size)[0]
+    
+    def _write(self, slot: int, value: int) -> None:
+        _SLOT.pack_into(self._map, slot * _SLOT.size, value)
+    
+    def _file_lock(self) -> '_FileLock':
+        return _FileLock(self._lock, self._fd if FCNTL_AVAILABLE else None)
+
+
+class _FileLock:
+    """Thread lock plus, when a file descriptor is given, an exclusive flock."""
+    
+    def __init__(self, lock: threading.Lock, fd: Optional[int]) -> None:
+        self._thread_lock = lock
+        self._fd = fd
+    
+    def __enter__(self) -> None:
+        self._thread_lock.acquire()
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+class GenerationCache:
+    """
+    Per-process cache of values keyed by the generations of their tables.
+    
+    Each name holds a single entry; an entry computed at older
+    generations is simply replaced on the next miss.
+    """
+    
+    def __init__(self, counter: GenerationCounter) -> None:
+        self.counter = counter
+        self._entries: Dict[Hashable, Tuple[Hashable, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, name: Hashable, tables: Iterable[str], compute: Callable[[], Any],
+                       extra_key: Hashable = None) -> Any:
+        """
+        Return a cached value, computing it if any of its tables changed.
+        
+        Args:
+            name: Cache entry name
+            tables: Tracked tables the value is derived from
+            compute: Callable producing the value
+            extra_key: Anything else the value depends on, e.g. today's date
+            
+        Returns:
+            Cached or freshly computed value; callers must not mutate it
+        """
+        # Read generations before computing: a commit landing meanwhile
+        # leaves this entry under the older key, never the newer one
+        key = (self.counter.snapshot(tables), extra_key)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        value = compute()
+        self._entries[name] = (key, value)
+        return value
+    
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._entries.clear()
+
+
+def init_cache(app: Flask) -> None:
+    """
+    Attach the generation counter and statistics cache to the Flask app.
+    
+    The counters are kept in STATS_GENERATION_FILE, by default
+    instance/stats_generation.bin, which all workers of a deployment share.
+    Testing apps keep them in process memory unless the file is configured.
+    
+    Args:
+        app: Flask application instance
+    """
+    path = app.config.get('STATS_GENERATION_FILE')
+    if path is None and not app.testing:
+        path = os.path.join(app.instance_path, 'stats_generation.bin')
+    
+    counter = GenerationCounter(path)
+    app.extensions['stats_generation'] = counter
+    app.extensions['stats_cache'] = GenerationCache(counter)
+    
+    _register_session_events()
+
+
+def get_stats_cache() -> GenerationCache:
+    """
+    Get the statistics cache of the current app.
+    
+    Returns:
+        GenerationCache instance
+    """
+    return current_app.extensions['stats_cache']
+
+
+def data_etag(tables: Iterable[str], daily: bool = False) -> str:
+    """
+    Build an entity tag for data read from tracked tables.
+    
+    Args:
+        tables: Tracked tables the data is derived from
+        daily: Whether the data also depends on today's date
+        
+    Returns:
+        Opaque tag value, without quotes
+    """
+    parts = [format(value, 'x') for value in current_app.extensions['stats_generation'].snapshot(tables)]
+    if daily:
+        parts.append(date.today().strftime('%Y%m%d'))
+    return '-'.join(parts)
+
+
+def conditional_on_data(tables: Iterable[str], daily: bool = False) -> Callable:
+    """
+    Decorate a view whose response only depends on tracked tables.
+    
+    Successful responses get a strong ETag from data_etag() and
+    Cache-Control: private, no-cache, so clients revalidate on every
+    poll. A request whose If-None-Match holds the current tag gets 304
+    Not Modified without running the view.
+    
+    Args:
+        tables: Tracked tables the view reads
+        daily: Whether the response also depends on today's date
+        
+    Returns:
+        View decorator
+    """
+    tables = tuple(tables)
+    
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Taken before the view reads: a commit landing meanwhile only
+            # makes the tag older than the data, never newer
+            etag = data_etag(tables, daily)
+            
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        
+        return wrapper
+    
+    return decorator
+
+
+def _register_session_events() -> None:
+    """Install the session hooks that track writes and bump generations (once per process)."""
+    if event.contains(Session, 'after_commit', _bump_after_commit):
+        return
+    event.listen(Session, 'after_flush', _track_flush)
+    event.listen(Session, 'do_orm_execute', _track_execute)
+    event.listen(Session, 'after_commit', _bump_after_commit)
+    event.listen(Session, 'after_rollback', _discard_changes)
+
+
+def mark_changed(session: Session, *tables: str) -> None:
+    """
+    Record writes to tables so committing the session bumps their generations.
+    
+    Args:
+        session: Session the writes belong to
+        *tables: Table names; untracked tables are ignored
+    """
+    for table in tables:
+        if table in TRACKED_TABLES:
+            session.info.setdefault(_CHANGED_TABLES_KEY, set()).add(table)
+
+
+def _track_flush(session: Session, flush_context: Any) -> None:
+    """Record tracked tables of objects written by a flush."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is not None:
+            mark_changed(session, table.name)
+
+
+def _track_execute(orm_execute_state: Any) -> None:
+    """Record tracked tables targeted by INSERT/UPDATE/DELETE statements run on the session."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            mark_changed(orm_execute_state.session, table.name)
+
+
+def _bump_after_commit(session: Session) -> None:
+    """Bump the generations of tables written in the committed transaction."""
+    changed = session.info.pop(_CHANGED_TABLES_KEY, None)
+    if not changed or not has_app_context():
+        return
+    counter = current_app.extensions.get('stats_generation')
+    if counter is None:
+        return
+    try:
+        counter.bump(changed)
+    except Exception:
+        # Never let bookkeeping fail a commit that already happened
+        logger.exception("Failed to bump data generations for %s", sorted(changed))
+        current_app.extensions['stats_cache'].clear()
+
+
+def _discard_changes(session: Session) -> None:
+    """Forget tracked writes of a rolled back transaction."""
+    session.info.pop(_CHANGED_TABLES_KEY, None)
@@ -0,0 +1,77 @@
+"""
+Flask CLI commands for database maintenance.
+
+This module registers maintenance commands such as search index rebuilds
+with the application's ``flask`` command line interface.
+"""
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+search_cli = AppGroup('search-index', help='Manage the asset search indexes.')
+facets_cli = AppGroup('facets', help='Manage the asset filter facet counts.')
+stats_cli = AppGroup('stats', help='Manage the dashboard statistics counters.')
+expiry_cli = AppGroup('expiry', help='Report warranty and rental expiries.')
+
+
+@search_cli.command('rebuild')
+def rebuild_search_index_command() -> None:
+    """Create the search index if missing and repopulate it from all assets."""
+    from ..models.search_index import rebuild_search_index
+    
+    backends = rebuild_search_index()
+    summary = ', '.join(f"{name}: {backend}" for name, backend in backends.items())
+    click.echo(f"Search index rebuilt ({summary})")
+
+
+@facets_cli.command('rebuild')
+def rebuild_facets_command() -> None:
+    """Recompute the facet counts from all assets."""
+    from ..models.facet import rebuild_facets
+    
+    counts = rebuild_facets()
+    summary = ', '.join(f"{facet}: {values}" for facet, values in counts.items())
+    click.echo(f"Facets rebuilt ({summary})")
+
+
+@stats_cli.command('reconcile')
+def reconcile_stats_command() -> None:
+    """Reinstall the counter triggers and recount the statistics counters."""
+    from ..models.stats_counter import reconcile_counters
+    
+    drift = reconcile_counters()
+    summary = ', '.join(f"{scope}: {count}" for scope, count in drift.items())
+    click.echo(f"Statistics counters reconciled (drift {summary})")
+
+
+@stats_cli.command('snapshot')
+def snapshot_stats_command() -> None:
+    """Record today's statistics for the trends API; run once a day."""
+    from ..services.trend_service import TrendService
+    
+    success, message, _ = TrendService.take_snapshot()
+    if not success:
+        raise click.ClickException(message)
+    click.echo(message)
+
+
+@expiry_cli.command('digest')
+def expiry_digest_command() -> None:
+    """Print the assets whose warranty or rental ends soon; run once a day."""
+    from ..services.expiry_service import ExpiryService
+    
+    click.echo(ExpiryService.digest())
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Register CLI command groups with the Flask app.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(search_cli)
+    app.cli.add_command(facets_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(expiry_cli)
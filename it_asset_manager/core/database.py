@@ -19,9 +19,28 @@ def init_db(app) -> None:
     Args:
         app: Flask application instance
     """
+    configure_binds(app)
     db.init_app(app)
 
 
+def configure_binds(app) -> None:
+    """
+    Add the secondary database binds used by the application.
+    
+    Import job bookkeeping lives in its own SQLite database (the 'jobs'
+    bind) so progress can be written while an import transaction holds
+    the main database. Override it with IMPORT_JOBS_DATABASE_URI.
+    
+    Args:
+        app: Flask application instance
+    """
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    if 'jobs' not in binds:
+        default_uri = 'sqlite://' if app.testing else 'sqlite:///import_jobs.db'
+        binds['jobs'] = app.config.get('IMPORT_JOBS_DATABASE_URI', default_uri)
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+
 def create_tables(app) -> None:
     """
     Create all database tables.
@@ -31,6 +50,20 @@ def create_tables(app) -> None:
     """
     with app.app_context():
         db.create_all()
+        ensure_indexes()
+
+
+def ensure_indexes() -> None:
+    """
+    Create declared indexes that are missing from existing tables.
+    
+    create_all() only creates indexes together with new tables, so indexes
+    added to a model later would otherwise never reach existing databases.
+    Must be called within an application context.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
 
 
 def drop_tables(app) -> None:
@@ -0,0 +1,157 @@
+"""
+Per-request SQL instrumentation.
+
+This module counts the SQL statements each request executes and the time
+spent in them, using SQLAlchemy's cursor execution events and Flask's
+request hooks. Every response gets a Server-Timing header, readable in
+the browser's network panel, and a structured log line such as:
+    
+    request method=GET path=/access/github endpoint=access.list_github_access
+    status=200 queries=2 db_ms=1.2 total_ms=12.7
+    
+Statements executed while a streamed response body is being sent run
+after the response hooks and are not counted. count_queries() records
+statements in any context and backs the tests' query budget helper.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Connection.info key holding start times of the statements in flight
+_STARTED_KEY = 'query_started'
+
+
+class QueryStats:
+    """
+    Statements executed and database time spent within some scope.
+    
+    Attributes:
+        count: Number of statements executed
+        duration: Total execution time in seconds
+        statements: SQL text of the statements, when recorded
+    """
+    
+    def __init__(self, record_statements: bool = False) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+    
+    def add(self, statement: str, duration: float) -> None:
+        """
+        Account for one executed statement.
+        
+        Args:
+            statement: SQL text
+            duration: Execution time in seconds
+        """
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+# QueryStats of active count_queries() blocks
+_recorders: List[QueryStats] = []
+_recorders_lock = threading.Lock()
+
+
+def init_instrumentation(app: Flask) -> None:
+    """
+    Install the query counting hooks for the Flask app.
+    
+    The Server-Timing header can be turned off with SERVER_TIMING = False,
+    e.g. where timings should not be visible to clients.
+    
+    Args:
+        app: Flask application instance
+    """
+    _register_engine_events()
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Record the statements executed on any engine inside the block.
+    
+    Yields:
+        QueryStats with the statements recorded
+    """
+    _register_engine_events()
+    stats = QueryStats(record_statements=True)
+    with _recorders_lock:
+        _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        with _recorders_lock:
+            _recorders.remove(stats)
+
+
+def _register_engine_events() -> None:
+    """Listen to cursor execution on every engine (once per process)."""
+    if event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a statement started."""
+    conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Account for a finished statement in the current request and active recorders."""
+    started = conn.info.get(_STARTED_KEY)
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    
+    if has_request_context():
+        stats = g.get('query_stats')
+        if stats is not None:
+            stats.add(statement, duration)
+    
+    if _recorders:
+        with _recorders_lock:
+            for recorder in _recorders:
+                recorder.add(statement, duration)
+
+
+def _start_request() -> None:
+    """Start counting for a request."""
+    g.query_stats = QueryStats()
+    g.request_started = time.perf_counter()
+
+
+def _finish_request(response: Response) -> Response:
+    """Report the request's query count and timings."""
+    stats = g.pop('query_stats', None)
+    started = g.pop('request_started', None)
+    if stats is None or started is None:
+        return response
+    
+    db_ms = stats.duration * 1000
+    total_ms = (time.perf_counter() - started) * 1000
+    
+    if current_app.config.get('SERVER_TIMING', True):
+        response.headers.add('Server-Timing', f'db;dur={db_ms:.1f};desc="{stats.count} queries"')
+        response.headers.add('Server-Timing', f'app;dur={total_ms:.1f}')
+    
+    logger.info(
+        "request method=%s path=%s endpoint=%s status=%s queries=%d db_ms=%.1f total_ms=%.1f",
+        request.method, request.path, request.endpoint, response.status_code,
+        stats.count, db_ms, total_ms
+    )
+    return response
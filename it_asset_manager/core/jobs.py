@@ -0,0 +1,97 @@
+"""
+Local background job runner.
+
+This module runs long tasks such as bulk CSV imports outside the request
+on a thread pool owned by the application. Each task runs inside its own
+application context, so it gets its own database session.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from flask import Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+
+
+class JobRunner:
+    """
+    Thread pool that executes callables within an application context.
+    
+    The pool is created on first use, which keeps it out of the parent
+    process when a pre-forking server such as gunicorn loads the app.
+    """
+    
+    def __init__(self, app: Flask, max_workers: int = DEFAULT_WORKERS) -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Run a callable in the background.
+        
+        Args:
+            func: Callable to run; it may use current_app and db.session
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Future for the callable's result
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='job-runner'
+                )
+        return self._executor.submit(self._run, func, args, kwargs)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and optionally wait for running ones.
+        
+        Args:
+            wait: True to block until queued jobs have finished
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+    
+    def _run(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        """Execute a job inside a fresh application context."""
+        with self.app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                logger.exception("Background job %s failed", getattr(func, '__qualname__', func))
+                raise
+
+
+def init_jobs(app: Flask) -> None:
+    """
+    Attach a job runner to the Flask app.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.extensions['job_runner'] = JobRunner(
+        app,
+        max_workers=app.config.get('JOB_RUNNER_WORKERS', DEFAULT_WORKERS)
+    )
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Get the job runner of the current app.
+    
+    Returns:
+        JobRunner instance
+    """
+    return current_app.extensions['job_runner']
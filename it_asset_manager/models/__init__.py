@@ -7,10 +7,18 @@ This module exports all database models for easy importing.
 from .user import User
 from .asset import Asset
 from .access import ApplicationAccess, GitHubAccess
+from .facet import AssetFacet
+from .job import ImportJob
+from .stats_counter import StatsCounter
+from .stats_snapshot import StatsSnapshot
 
 __all__ = [
     'User',
     'Asset', 
     'ApplicationAccess',
-    'GitHubAccess'
+    'GitHubAccess',
+    'AssetFacet',
+    'ImportJob',
+    'StatsCounter',
+    'StatsSnapshot'
 ]
@@ -10,6 +10,7 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy import and_, or_
 
 from ..core.database import db
+from ..utils.serializers import RowSerializer
 
 
 class ApplicationAccess(db.Model):
@@ -23,7 +24,7 @@ class ApplicationAccess(db.Model):
     __tablename__ = 'application_access'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_name = db.Column(db.String(100), nullable=False, index=True)
+    user_name = db.Column(db.String(100), nullable=False)
     application_name = db.Column(db.String(100), nullable=False, index=True)
     access_level = db.Column(db.String(50), nullable=False, index=True)  # Admin, Read, Write
     assign_date = db.Column(db.Date, nullable=False)
@@ -33,6 +34,16 @@ class ApplicationAccess(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Keyset pagination of the listing, newest first, optionally by status;
+    # user lookups use the (user_name, status) index and CSV imports the
+    # non-unique record key (revoked access stays next to later grants)
+    __table_args__ = (
+        db.Index('ix_application_access_created_at_id', 'created_at', 'id'),
+        db.Index('ix_application_access_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_application_access_user_name_status', 'user_name', 'status'),
+        db.Index('ix_application_access_key', 'user_name', 'application_name', 'id'),
+    )
+    
     def __repr__(self) -> str:
         """String representation of ApplicationAccess object."""
         return f'<ApplicationAccess {self.user_name}@{self.application_name}:{self.access_level}>'
@@ -159,7 +170,7 @@ class GitHubAccess(db.Model):
     __tablename__ = 'github_access'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_name = db.Column(db.String(100), nullable=False, index=True)
+    user_name = db.Column(db.String(100), nullable=False)
     organization_name = db.Column(db.String(100), nullable=False, index=True)
     repo_name = db.Column(db.String(100), nullable=False, index=True)
     access_type = db.Column(db.String(50), nullable=False, index=True)  # Admin, Write, Read, Maintainer
@@ -170,6 +181,16 @@ class GitHubAccess(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Keyset pagination of the listing, newest first, optionally by status;
+    # user lookups use the (user_name, status) index and CSV imports the
+    # non-unique record key (revoked access stays next to later grants)
+    __table_args__ = (
+        db.Index('ix_github_access_created_at_id', 'created_at', 'id'),
+        db.Index('ix_github_access_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_github_access_user_name_status', 'user_name', 'status'),
+        db.Index('ix_github_access_key', 'user_name', 'organization_name', 'repo_name', 'id'),
+    )
+    
     def __repr__(self) -> str:
         """String representation of GitHubAccess object."""
         return f'<GitHubAccess {self.user_name}@{self.organization_name}/{self.repo_name}:{self.access_type}>'
@@ -323,3 +344,34 @@ class GitHubAccess(db.Model):
             'is_active': self.is_active,
             'days_since_assigned': self.days_since_assigned
         }
+
+
+def _is_active(row: Dict[str, Any], as_of: date) -> bool:
+    """Serialized is_active, as of a date."""
+    return row['status'] == 'active' and (not row['remove_date'] or row['remove_date'] >= as_of)
+
+
+def _days_since_assigned(row: Dict[str, Any], as_of: date) -> int:
+    """Serialized days_since_assigned, counted to as_of."""
+    return (as_of - row['assign_date']).days
+
+
+# Serializers from selected access columns to the dictionaries of to_dict(),
+# with dates left as date objects for the JSON encoder
+APPLICATION_ACCESS_SERIALIZER = RowSerializer(
+    [(column.key, getattr(ApplicationAccess, column.key)) for column in ApplicationAccess.__table__.columns],
+    derived=[
+        ('is_active', _is_active, ['status', 'remove_date']),
+        ('days_since_assigned', _days_since_assigned, ['assign_date']),
+    ]
+)
+
+GITHUB_ACCESS_SERIALIZER = RowSerializer(
+    [(column.key, getattr(GitHubAccess, column.key)) for column in GitHubAccess.__table__.columns],
+    derived=[
+        ('full_repo_name', lambda row, as_of: f"{row['organization_name']}/{row['repo_name']}",
+         ['organization_name', 'repo_name']),
+        ('is_active', _is_active, ['status', 'remove_date']),
+        ('days_since_assigned', _days_since_assigned, ['assign_date']),
+    ]
+)
@@ -11,6 +11,8 @@ from sqlalchemy import and_, or_
 from flask_sqlalchemy import SQLAlchemy
 
 from ..core.database import db
+from ..utils.serializers import RowSerializer
+from .search_index import tokenize_query, match_clause, ranked_matches, fragment_clause
 
 
 class Asset(db.Model):
@@ -38,11 +40,11 @@ class Asset(db.Model):
     ownership_type = db.Column(db.String(20), nullable=False, default='purchased', index=True)
     vendor_name = db.Column(db.String(100))
     rental_start_date = db.Column(db.Date)
-    rental_end_date = db.Column(db.Date)
+    rental_end_date = db.Column(db.Date, index=True)
     rental_cost_monthly = db.Column(db.Float)
     purchase_date = db.Column(db.Date)
     purchase_cost = db.Column(db.Float)
-    warranty_expiry = db.Column(db.Date)
+    warranty_expiry = db.Column(db.Date, index=True)
     
     # Basic asset information
     brand = db.Column(db.String(50), index=True)
@@ -84,6 +86,12 @@ class Asset(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    # Composite indexes backing keyset pagination on (timestamp, id)
+    __table_args__ = (
+        db.Index('ix_assets_updated_at_id', 'updated_at', 'id'),
+        db.Index('ix_assets_created_at_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self) -> str:
         """String representation of Asset object."""
         return f'<Asset {self.asset_tag}: {self.asset_type}>'
@@ -189,6 +197,36 @@ class Asset(db.Model):
         """
         return cls.query.filter_by(serial_number=serial_number).first()
     
+    @classmethod
+    def find_by_tag_fragment(cls, fragment: str, limit: Optional[int] = None) -> List['Asset']:
+        """
+        Find assets whose tag contains a fragment (e.g. "789" matches "LAP0789").
+        
+        Args:
+            fragment: Part of an asset tag (case-insensitive)
+            limit: Optional maximum number of results
+            
+        Returns:
+            List of matching Asset objects ordered by asset tag
+        """
+        query = cls.query.filter(fragment_clause('asset_tag', fragment)).order_by(cls.asset_tag)
+        return query.limit(limit).all() if limit else query.all()
+    
+    @classmethod
+    def find_by_serial_fragment(cls, fragment: str, limit: Optional[int] = None) -> List['Asset']:
+        """
+        Find assets whose serial number contains a fragment.
+        
+        Args:
+            fragment: Part of a serial number (case-insensitive)
+            limit: Optional maximum number of results
+            
+        Returns:
+            List of matching Asset objects ordered by serial number
+        """
+        query = cls.query.filter(fragment_clause('serial_number', fragment)).order_by(cls.serial_number)
+        return query.limit(limit).all() if limit else query.all()
+    
     @classmethod
     def find_assigned_to_user(cls, username: str) -> List['Asset']:
         """
@@ -233,19 +271,49 @@ class Asset(db.Model):
                 cls.warranty_expiry <= cutoff_date,
                 cls.warranty_expiry >= date.today()
             )
-        ).all()
+        ).order_by(cls.warranty_expiry).all()
     
     @classmethod
     def search(cls, query: str) -> List['Asset']:
         """
         Search assets by multiple fields.
         
+        Uses the full-text index when available, in which case every word
+        of the query must prefix-match and results are ordered by relevance.
+        A single-term query also matches anywhere inside tags and serials.
+        
         Args:
             query: Search query string
             
         Returns:
             List of matching Asset objects
         """
+        tokens = tokenize_query(query)
+        ranked = ranked_matches(tokens, cls._search_fragment(query)) if tokens else None
+        if ranked is None:
+            return cls.search_query(query).all()
+        
+        return cls.query.join(ranked, cls.id == ranked.c.id).order_by(ranked.c.rank, cls.id).all()
+    
+    @classmethod
+    def search_query(cls, query: str):
+        """
+        Build an unordered query for assets matching a search string.
+        
+        Unlike search(), the result can be further filtered and paginated.
+        
+        Args:
+            query: Search query string
+            
+        Returns:
+            SQLAlchemy query of matching assets
+        """
+        tokens = tokenize_query(query)
+        clause = match_clause(tokens, cls._search_fragment(query)) if tokens else None
+        if clause is not None:
+            return cls.query.filter(clause)
+        
+        # Fallback for databases without a full-text index
         search_term = f'%{query}%'
         return cls.query.filter(
             or_(
@@ -257,7 +325,13 @@ class Asset(db.Model):
                 cls.assigned_to.ilike(search_term),
                 cls.location.ilike(search_term)
             )
-        ).all()
+        )
+    
+    @staticmethod
+    def _search_fragment(query: str) -> Optional[str]:
+        """Single-term queries may also match inside asset tags and serial numbers."""
+        terms = query.split()
+        return terms[0] if len(terms) == 1 else None
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -306,3 +380,30 @@ class Asset(db.Model):
             'is_warranty_expired': self.is_warranty_expired,
             'rental_days_remaining': self.rental_days_remaining
         }
+
+
+def _is_rental(row: Dict[str, Any], as_of: date) -> bool:
+    """Serialized is_rental."""
+    return row['ownership_type'] in ['rented', 'leased']
+
+
+def _rental_days_remaining(row: Dict[str, Any], as_of: date) -> Optional[int]:
+    """Serialized rental_days_remaining, counted from as_of."""
+    if not _is_rental(row, as_of) or not row['rental_end_date']:
+        return None
+    return max(0, (row['rental_end_date'] - as_of).days)
+
+
+# Serializer from selected asset columns to the dictionaries of to_dict(),
+# with dates left as date objects for the JSON encoder
+ASSET_SERIALIZER = RowSerializer(
+    [(column.key, getattr(Asset, column.key)) for column in Asset.__table__.columns],
+    derived=[
+        ('is_assigned', lambda row, as_of: row['status'] == 'assigned' and row['assigned_to'] is not None,
+         ['status', 'assigned_to']),
+        ('is_rental', _is_rental, ['ownership_type']),
+        ('is_warranty_expired', lambda row, as_of: bool(row['warranty_expiry']) and as_of > row['warranty_expiry'],
+         ['warranty_expiry']),
+        ('rental_days_remaining', _rental_days_remaining, ['ownership_type', 'rental_end_date']),
+    ]
+)
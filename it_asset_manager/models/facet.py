@@ -0,0 +1,259 @@
+"""
+Facet counts for asset filters.
+
+This module keeps a small table of (facet, value, count) rows for the asset
+columns offered as filters in the asset listing. The table is maintained
+incrementally by database triggers on the assets table, so ORM writes, bulk
+statements and raw SQL all keep it current, and reading every filter with
+its counts costs one scan of the facet table instead of a DISTINCT scan of
+the assets table per column.
+
+- SQLite: AFTER INSERT/UPDATE/DELETE triggers using UPSERT
+- PostgreSQL: a plpgsql row trigger
+- Other dialects: counts are computed with GROUP BY queries on demand
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event, text, func
+
+from ..core.database import db
+
+# Facet name -> assets column, in the order filters are displayed
+FACET_COLUMNS = OrderedDict([
+    ('asset_type', 'asset_type'),
+    ('status', 'status'),
+    ('category', 'asset_category'),
+    ('condition', 'condition'),
+    ('brand', 'brand'),
+    ('location', 'location'),
+])
+
+TRIGGER_DIALECTS = ('sqlite', 'postgresql')
+
+
+class AssetFacet(db.Model):
+    """
+    Number of assets per distinct value of a filterable asset column.
+    
+    Rows are written by database triggers only; rows whose count drops to
+    zero are deleted. NULL and empty values are not counted.
+    """
+    
+    __tablename__ = 'asset_facets'
+    
+    facet = db.Column(db.String(30), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of AssetFacet object."""
+        return f'<AssetFacet {self.facet}={self.value}:{self.count}>'
+    
+    @classmethod
+    def all_counts(cls) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Get the values and asset counts of every facet.
+        
+        Returns:
+            Dictionary mapping facet name to a list of (value, count) tuples
+            ordered by value; every facet in FACET_COLUMNS is present
+        """
+        facets = OrderedDict((name, []) for name in FACET_COLUMNS)
+        
+        if db.engine.dialect.name in TRIGGER_DIALECTS:
+            rows = db.session.query(cls.facet, cls.value, cls.count).filter(
+                cls.count > 0
+            ).order_by(cls.facet, cls.value).all()
+            for facet, value, count in rows:
+                if facet in facets:
+                    facets[facet].append((value, count))
+        else:
+            for name in FACET_COLUMNS:
+                facets[name] = _grouped_counts(name)
+        
+        return facets
+    
+    @classmethod
+    def counts(cls, facet: str) -> List[Tuple[str, int]]:
+        """
+        Get the values and asset counts of a single facet.
+        
+        Args:
+            facet: Facet name (see FACET_COLUMNS)
+            
+        Returns:
+            List of (value, count) tuples ordered by value
+            
+        Raises:
+            ValueError: If the facet is unknown
+        """
+        if facet not in FACET_COLUMNS:
+            raise ValueError(f"Unknown facet: {facet}")
+        
+        if db.engine.dialect.name not in TRIGGER_DIALECTS:
+            return _grouped_counts(facet)
+        
+        rows = db.session.query(cls.value, cls.count).filter(
+            cls.facet == facet, cls.count > 0
+        ).order_by(cls.value).all()
+        return [(value, count) for value, count in rows]
+
+
+def rebuild_facets() -> Dict[str, int]:
+    """
+    Recompute the facet table from the assets table.
+    
+    Used to backfill the table and to repair it after writes that bypassed
+    the triggers. Must be called within an application context.
+    
+    Returns:
+        Dictionary mapping facet name to its number of distinct values
+    """
+    with db.engine.begin() as connection:
+        if connection.dialect.name in TRIGGER_DIALECTS:
+            _install_triggers(connection)
+        _refill(connection)
+    
+    return {name: len(values) for name, values in AssetFacet.all_counts().items()}
+
+
+def _grouped_counts(facet: str) -> List[Tuple[str, int]]:
+    """Count assets per value of a facet column with a GROUP BY query."""
+    from .asset import Asset
+    
+    column = getattr(Asset, FACET_COLUMNS[facet])
+    rows = db.session.query(column, func.count(Asset.id)).filter(
+        column.isnot(None), column != ''
+    ).group_by(column).order_by(column).all()
+    return [(value, count) for value, count in rows]
+
+
+def _sqlite_bump(column: str, row: str, delta: int, condition: str = '') -> List[str]:
+    """Statements adding delta to the facet row of a trigger's old/new value."""
+    facet = _facet_name(column)
+    value = f'{row}.{column}'
+    guard = f"{value} IS NOT NULL AND {value} <> ''" + (f' AND {condition}' if condition else '')
+    if delta > 0:
+        return [
+            f"INSERT INTO asset_facets(facet, value, count) SELECT '{facet}', {value}, 1 "
+            f"WHERE {guard} ON CONFLICT(facet, value) DO UPDATE SET count = count + 1;"
+        ]
+    return [
+        f"UPDATE asset_facets SET count = count - 1 "
+        f"WHERE facet = '{facet}' AND value = {value} AND {guard};",
+        f"DELETE FROM asset_facets WHERE facet = '{facet}' AND value = {value} AND count <= 0;",
+    ]
+
+
+def _sqlite_trigger_statements() -> List[str]:
+    """Build the SQLite triggers maintaining asset_facets."""
+    columns = list(FACET_COLUMNS.values())
+    inserts, deletes, updates = [], [], []
+    for column in columns:
+        inserts += _sqlite_bump(column, 'new', 1)
+        deletes += _sqlite_bump(column, 'old', -1)
+        changed = f'old.{column} IS NOT new.{column}'
+        updates += _sqlite_bump(column, 'old', -1, changed) + _sqlite_bump(column, 'new', 1, changed)
+    
+    separator = '\n            '
+    return [
+        "DROP TRIGGER IF EXISTS asset_facets_ai",
+        "DROP TRIGGER IF EXISTS asset_facets_ad",
+        "DROP TRIGGER IF EXISTS asset_facets_au",
+        f"""CREATE TRIGGER asset_facets_ai AFTER INSERT ON assets BEGIN
+            {separator.join(inserts)}
+        END""",
+        f"""CREATE TRIGGER asset_facets_ad AFTER DELETE ON assets BEGIN
+            {separator.join(deletes)}
+        END""",
+        f"""CREATE TRIGGER asset_facets_au AFTER UPDATE OF {', '.join(columns)} ON assets BEGIN
+            {separator.join(updates)}
+        END""",
+    ]
+
+
+def _pg_trigger_statements() -> List[str]:
+    """Build the PostgreSQL function and trigger maintaining asset_facets."""
+    inserts, deletes, updates = [], [], []
+    for name, column in FACET_COLUMNS.items():
+        inserts.append(f"PERFORM asset_facets_bump('{name}', NEW.{column}, 1);")
+        deletes.append(f"PERFORM asset_facets_bump('{name}', OLD.{column}, -1);")
+        updates.append(
+            f"IF OLD.{column} IS DISTINCT FROM NEW.{column} THEN "
+            f"PERFORM asset_facets_bump('{name}', OLD.{column}, -1); "
+            f"PERFORM asset_facets_bump('{name}', NEW.{column}, 1); END IF;"
+        )
+    
+    separator = '\n                '
+    return [
+        """CREATE OR REPLACE FUNCTION asset_facets_bump(f text, v text, delta integer) RETURNS void AS $$
+        BEGIN
+            IF v IS NULL OR v = '' THEN
+                RETURN;
+            END IF;
+            INSERT INTO asset_facets(facet, value, count) VALUES (f, v, delta)
+            ON CONFLICT (facet, value) DO UPDATE SET count = asset_facets.count + delta;
+            DELETE FROM asset_facets WHERE facet = f AND value = v AND count <= 0;
+        END
+        $$ LANGUAGE plpgsql""",
+        f"""CREATE OR REPLACE FUNCTION asset_facets_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {separator.join(inserts)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {separator.join(deletes)}
+            ELSE
+                {separator.join(updates)}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS asset_facets_sync ON assets",
+        """CREATE TRIGGER asset_facets_sync AFTER INSERT OR UPDATE OR DELETE ON assets
+        FOR EACH ROW EXECUTE FUNCTION asset_facets_sync()""",
+    ]
+
+
+def _facet_name(column: str) -> str:
+    """Map an assets column back to its facet name."""
+    for name, facet_column in FACET_COLUMNS.items():
+        if facet_column == column:
+            return name
+    raise ValueError(f"Not a facet column: {column}")
+
+
+def _install_triggers(connection) -> None:
+    """Create (or replace) the facet triggers for the connected database."""
+    if connection.dialect.name == 'sqlite':
+        statements = _sqlite_trigger_statements()
+    else:
+        statements = _pg_trigger_statements()
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _refill(connection) -> None:
+    """Replace the facet table contents with fresh GROUP BY counts."""
+    connection.execute(text("DELETE FROM asset_facets"))
+    for name, column in FACET_COLUMNS.items():
+        connection.execute(text(
+            f"INSERT INTO asset_facets(facet, value, count) "
+            f"SELECT '{name}', {column}, COUNT(*) FROM assets "
+            f"WHERE {column} IS NOT NULL AND {column} <> '' GROUP BY {column}"
+        ))
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _install_facet_triggers(target, connection, **kw) -> None:
+    """Install the facet triggers whenever tables are created."""
+    if connection.dialect.name not in TRIGGER_DIALECTS:
+        return
+    
+    _install_triggers(connection)
+    
+    # Backfill when the facet table is added to a database that already has assets
+    empty = connection.execute(text("SELECT 1 FROM asset_facets LIMIT 1")).first() is None
+    if empty and connection.execute(text("SELECT 1 FROM assets LIMIT 1")).first() is not None:
+        _refill(connection)
@@ -0,0 +1,239 @@
+"""
+Background import job model.
+
+This module contains the ImportJob model used to track bulk CSV imports
+that run outside the request in the local job runner.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from ..core.database import db
+
+
+class ImportJob(db.Model):
+    """
+    Model for tracking a background CSV import.
+    
+    Stored in the 'jobs' bind so progress updates never contend with the
+    import transaction on the main database.
+    """
+    
+    __bind_key__ = 'jobs'
+    __tablename__ = 'import_jobs'
+    
+    STATUSES = ['queued', 'running', 'completed', 'failed']
+    ACTIVE_STATUSES = ['queued', 'running']
+    
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = db.Column(db.String(30), nullable=False)  # assets, application_access, github_access
+    status = db.Column(db.String(20), default='queued', nullable=False, index=True)
+    filename = db.Column(db.String(255))
+    file_path = db.Column(db.String(500))
+    created_by = db.Column(db.String(80), index=True)
+    
+    # Progress
+    total_bytes = db.Column(db.Integer, default=0, nullable=False)
+    bytes_processed = db.Column(db.Integer, default=0, nullable=False)
+    rows_processed = db.Column(db.Integer, default=0, nullable=False)
+    valid_rows = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Outcome
+    created_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_count = db.Column(db.Integer, default=0, nullable=False)
+    message = db.Column(db.Text)
+    errors_json = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Last write by the worker that queued or runs the job
+    heartbeat_at = db.Column(db.DateTime)
+    
+    def __repr__(self) -> str:
+        """String representation of ImportJob object."""
+        return f'<ImportJob {self.id} {self.kind}:{self.status}>'
+    
+    @property
+    def is_finished(self) -> bool:
+        """Check if the job has completed or failed."""
+        return self.status in ('completed', 'failed')
+    
+    @property
+    def errors(self) -> List[str]:
+        """Error messages reported by the import."""
+        return json.loads(self.errors_json) if self.errors_json else []
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds spent running so far, or in total once finished."""
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or datetime.utcnow()
+        return max((end - self.started_at).total_seconds(), 0.0)
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Average import throughput in rows per second."""
+        elapsed = self.elapsed_seconds
+        return self.rows_processed / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def progress_percent(self) -> float:
+        """Share of the uploaded file read so far, from 0 to 100."""
+        if self.is_finished:
+            return 100.0
+        if not self.total_bytes:
+            return 0.0
+        return min(100.0, 100.0 * self.bytes_processed / self.total_bytes)
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the file is fully read, if it can be estimated yet."""
+        if self.is_finished:
+            return 0.0
+        if self.status != 'running' or not self.bytes_processed or not self.total_bytes:
+            return None
+        remaining = max(self.total_bytes - self.bytes_processed, 0)
+        return self.elapsed_seconds * remaining / self.bytes_processed
+    
+    @property
+    def last_seen_at(self) -> datetime:
+        """When the job's worker last wrote to it."""
+        return self.heartbeat_at or self.created_at
+    
+    @classmethod
+    def find_by_id(cls, job_id: str) -> Optional['ImportJob']:
+        """
+        Find job by id.
+        
+        Args:
+            job_id: Job id to search for
+            
+        Returns:
+            ImportJob object if found, None otherwise
+        """
+        # Rows are written out of band by update_fields(), so never trust the identity map
+        return db.session.get(cls, job_id, populate_existing=True)
+    
+    @classmethod
+    def stale_query(cls, cutoff: datetime):
+        """
+        Query queued and running jobs not written to since a cutoff.
+        
+        Args:
+            cutoff: Jobs last seen before this time are stale
+            
+        Returns:
+            Query of ImportJob objects
+        """
+        return cls.query.filter(
+            cls.status.in_(cls.ACTIVE_STATUSES),
+            db.func.coalesce(cls.heartbeat_at, cls.created_at) < cutoff
+        )
+    
+    @classmethod
+    def update_fields(cls, job_id: str, **values: Any) -> None:
+        """
+        Write job fields in a short transaction of their own.
+        
+        Used by the job runner while an import transaction is open on the
+        session, so progress is visible immediately and committing it never
+        commits the import. Every write also records a heartbeat.
+        
+        Args:
+            job_id: Job to update
+            **values: Column values to set
+        """
+        cls._update(cls.__table__.c.id == job_id, values)
+    
+    @classmethod
+    def start(cls, job_id: str) -> bool:
+        """
+        Mark a queued job running.
+        
+        Args:
+            job_id: Job to start
+            
+        Returns:
+            True if the job was started, False if it was no longer queued
+        """
+        table = cls.__table__
+        condition = db.and_(table.c.id == job_id, table.c.status == 'queued')
+        return cls._update(condition, {'status': 'running', 'started_at': datetime.utcnow()}) == 1
+    
+    @classmethod
+    def touch_queued(cls, job_ids: List[str]) -> None:
+        """
+        Record a heartbeat for jobs that are still queued.
+        
+        Args:
+            job_ids: Jobs waiting on a live job runner
+        """
+        table = cls.__table__
+        cls._update(db.and_(table.c.id.in_(job_ids), table.c.status == 'queued'), {})
+    
+    @classmethod
+    def fail_if_stale(cls, job_id: str, cutoff: datetime, message: str) -> bool:
+        """
+        Mark a job failed unless it finished or was written to since a cutoff.
+        
+        Args:
+            job_id: Job to fail
+            cutoff: Jobs last seen before this time are stale
+            message: Failure message
+            
+        Returns:
+            True if the job was failed, False if it was not stale
+        """
+        table = cls.__table__
+        condition = db.and_(
+            table.c.id == job_id,
+            table.c.status.in_(cls.ACTIVE_STATUSES),
+            db.func.coalesce(table.c.heartbeat_at, table.c.created_at) < cutoff
+        )
+        return cls._update(condition, {
+            'status': 'failed',
+            'message': message,
+            'finished_at': datetime.utcnow()
+        }) == 1
+    
+    @classmethod
+    def _update(cls, condition: Any, values: Dict[str, Any]) -> int:
+        """Update matching jobs in a transaction of their own and return the row count."""
+        if 'errors' in values:
+            values['errors_json'] = json.dumps(values.pop('errors'))
+        values.setdefault('heartbeat_at', datetime.utcnow())
+        engine = db.engines[cls.__bind_key__]
+        with engine.begin() as connection:
+            result = connection.execute(cls.__table__.update().where(condition).values(**values))
+        return result.rowcount
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job to dictionary for the progress API."""
+        eta = self.eta_seconds
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'filename': self.filename,
+            'rows_processed': self.rows_processed,
+            'valid_rows': self.valid_rows,
+            'bytes_processed': self.bytes_processed,
+            'total_bytes': self.total_bytes,
+            'progress_percent': round(self.progress_percent, 1),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'elapsed_seconds': round(self.elapsed_seconds, 1),
+            'eta_seconds': round(eta, 1) if eta is not None else None,
+            'summary': {
+                'created': self.created_count,
+                'updated': self.updated_count,
+                'message': self.message,
+                'errors': self.errors
+            } if self.is_finished else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
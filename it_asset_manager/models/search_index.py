@@ -0,0 +1,380 @@
+"""
+Full-text and substring search indexes for assets.
+
+This module maintains database-native indexes over the asset fields used by
+Asset.search:
+- SQLite: an external-content FTS5 table for word-prefix search and an FTS5
+  trigram table for infix matches on asset tags and serial numbers, both
+  kept in sync by triggers
+- PostgreSQL: a GIN index over a tsvector expression and pg_trgm GIN
+  indexes on asset_tag and serial_number, maintained by the database itself
+  
+Other dialects, and SQLite builds without FTS5, fall back to ILIKE scans.
+"""
+
+import logging
+import re
+import weakref
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text, or_, column as sql_column, Integer, Float
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from ..core.database import db
+
+logger = logging.getLogger(__name__)
+
+# Asset columns covered by the full-text index
+SEARCH_COLUMNS = (
+    'asset_tag', 'asset_type', 'brand', 'model',
+    'serial_number', 'assigned_to', 'location'
+)
+
+# Identifier columns covered by the substring (trigram) index
+FRAGMENT_COLUMNS = ('asset_tag', 'serial_number')
+
+# Trigram indexes cannot answer fragments shorter than one trigram
+MIN_FRAGMENT_LENGTH = 3
+
+FTS_TABLE = 'assets_fts'
+TRIGRAM_TABLE = 'assets_trigram'
+
+
+def _sqlite_index_statements(table: str, columns, options: str) -> List[str]:
+    """Build the CREATE statements for an external-content FTS5 table and its triggers."""
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            {column_list}, content='assets', content_rowid='id', {options}
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON assets BEGIN
+            INSERT INTO {table}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON assets BEGIN
+            INSERT INTO {table}({table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {column_list} ON assets BEGIN
+            INSERT INTO {table}({table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {table}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+# '.', '-' and '_' are kept inside tokens so that tags, serial numbers and
+# user names such as "john.doe" index as single words.
+SQLITE_INDEXES: Dict[str, List[str]] = {
+    FTS_TABLE: _sqlite_index_statements(
+        FTS_TABLE, SEARCH_COLUMNS,
+        "tokenize=\"unicode61 remove_diacritics 2 tokenchars '-_.'\", prefix='2 3'"
+    ),
+    # The trigram tokenizer needs SQLite 3.34+; older builds skip this index
+    TRIGRAM_TABLE: _sqlite_index_statements(
+        TRIGRAM_TABLE, FRAGMENT_COLUMNS, "tokenize='trigram'"
+    ),
+}
+
+# The same expression is used by the index and by queries so the planner can match them
+PG_DOCUMENT = "to_tsvector('simple', {})".format(
+    " || ' ' || ".join(f"coalesce({c}, '')" for c in SEARCH_COLUMNS)
+)
+
+PG_CREATE_STATEMENTS = [
+    f"CREATE INDEX IF NOT EXISTS ix_assets_search_document ON assets USING gin ({PG_DOCUMENT})",
+]
+
+# pg_trgm lets ILIKE '%fragment%' use a GIN index. Creating the extension
+# may need privileges the application user lacks, so it is optional.
+PG_TRIGRAM_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+] + [
+    f"CREATE INDEX IF NOT EXISTS ix_assets_{c}_trgm ON assets USING gin ({c} gin_trgm_ops)"
+    for c in FRAGMENT_COLUMNS
+]
+
+_TOKEN_PATTERN = re.compile(r'[\w.\-]+', re.UNICODE)
+
+# Detected search backends per engine, see _detect_backends()
+_backends = weakref.WeakKeyDictionary()
+
+
+def tokenize_query(query: str) -> List[str]:
+    """
+    Split a user search string into index tokens.
+    
+    Args:
+        query: Raw search string
+        
+    Returns:
+        List of lower-cased tokens, without surrounding punctuation
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(query or ''):
+        token = token.strip('.-_').lower()
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def search_backends() -> Dict[str, str]:
+    """
+    Get the search backends available on the current database.
+    
+    Returns:
+        Dictionary with 'fulltext' ('fts5', 'tsvector' or 'like') and
+        'fragment' ('fts5', 'pg_trgm' or 'like') entries
+    """
+    engine = db.engine
+    backends = _backends.get(engine)
+    if backends is None:
+        with engine.connect() as connection:
+            backends = _detect_backends(connection)
+        _backends[engine] = backends
+    return backends
+
+
+def search_backend() -> str:
+    """
+    Get the full-text search backend available on the current database.
+    
+    Returns:
+        'fts5', 'tsvector' or 'like'
+    """
+    return search_backends()['fulltext']
+
+
+def match_clause(tokens: List[str], fragment: Optional[str] = None):
+    """
+    Build a WHERE clause selecting assets that match every token as a prefix.
+    
+    Args:
+        tokens: Tokens from tokenize_query()
+        fragment: Optional single search term that may also match anywhere
+            inside an asset tag or serial number
+        
+    Returns:
+        SQL expression usable in Asset.query.filter(), or None if full-text
+        search is not available
+    """
+    backend = search_backend()
+    if backend == 'fts5':
+        clause = text(
+            f"assets.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_query)"
+        ).bindparams(fts_query=_fts5_query(tokens))
+    elif backend == 'tsvector':
+        clause = text(
+            f"{PG_DOCUMENT} @@ to_tsquery('simple', :ts_query)"
+        ).bindparams(ts_query=_tsquery(tokens))
+    else:
+        return None
+    
+    if fragment and len(fragment) >= MIN_FRAGMENT_LENGTH:
+        clause = or_(clause, *(fragment_clause(c, fragment) for c in FRAGMENT_COLUMNS))
+    return clause
+
+
+def fragment_clause(column: str, fragment: str):
+    """
+    Build a WHERE clause matching a fragment anywhere inside an identifier column.
+    
+    Uses the trigram index when the fragment is long enough; shorter
+    fragments, or databases without a trigram index, use an ILIKE scan.
+    
+    Args:
+        column: One of FRAGMENT_COLUMNS
+        fragment: Text to look for (case-insensitive)
+        
+    Returns:
+        SQL expression usable in Asset.query.filter()
+        
+    Raises:
+        ValueError: If the column has no substring index
+    """
+    if column not in FRAGMENT_COLUMNS:
+        raise ValueError(f"No substring index for column: {column}")
+    
+    if len(fragment) >= MIN_FRAGMENT_LENGTH and search_backends()['fragment'] == 'fts5':
+        return text(
+            f"assets.id IN (SELECT rowid FROM {TRIGRAM_TABLE} WHERE {TRIGRAM_TABLE} MATCH :trigram_{column})"
+        ).bindparams(**{f'trigram_{column}': _trigram_query([column], fragment)})
+    
+    return sql_column(column).ilike(f'%{_escape_like(fragment)}%', escape='\\')
+
+
+def ranked_matches(tokens: List[str], fragment: Optional[str] = None):
+    """
+    Build a subquery of (id, rank) for assets matching every token.
+    
+    Lower rank values are better matches. Assets found only through a
+    tag/serial fragment rank after all word matches.
+    
+    Args:
+        tokens: Tokens from tokenize_query()
+        fragment: Optional single search term to match inside tags and serials
+        
+    Returns:
+        Subquery with id and rank columns, or None if full-text search is
+        not available
+    """
+    backend = search_backend()
+    if backend == 'fts5':
+        statement = (
+            f"SELECT rowid AS id, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :fts_query"
+        )
+        params = {'fts_query': _fts5_query(tokens)}
+    elif backend == 'tsvector':
+        statement = (
+            f"SELECT id, -ts_rank({PG_DOCUMENT}, to_tsquery('simple', :ts_query)) AS rank "
+            f"FROM assets WHERE {PG_DOCUMENT} @@ to_tsquery('simple', :ts_query)"
+        )
+        params = {'ts_query': _tsquery(tokens)}
+    else:
+        return None
+    
+    if fragment and len(fragment) >= MIN_FRAGMENT_LENGTH:
+        statement = (
+            f"SELECT id, MIN(rank) AS rank FROM ({statement} UNION ALL "
+            f"{_fragment_statement()}) AS matches GROUP BY id"
+        )
+        params.update(_fragment_params(fragment))
+    
+    return text(statement).bindparams(**params).columns(id=Integer, rank=Float).subquery('search_rank')
+
+
+def rebuild_search_index() -> Dict[str, str]:
+    """
+    Create the search indexes if missing and repopulate them from the assets table.
+    
+    Must be called within an application context.
+    
+    Returns:
+        Dictionary of the backends now in use
+    """
+    with db.engine.begin() as connection:
+        dialect = connection.dialect.name
+        if dialect == 'sqlite':
+            for table in SQLITE_INDEXES:
+                if _create_sqlite_index(connection, table):
+                    connection.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+        elif dialect == 'postgresql':
+            _create_pg_indexes(connection)
+            connection.execute(text("REINDEX TABLE assets"))
+        backends = _detect_backends(connection)
+    
+    _backends[db.engine] = backends
+    return backends
+
+
+def _fts5_query(tokens: List[str]) -> str:
+    """Quote each token as an FTS5 prefix phrase; phrases are ANDed."""
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _tsquery(tokens: List[str]) -> str:
+    """Combine tokens into a prefix tsquery; phrases are ANDed."""
+    return ' & '.join(f"'{token}':*" for token in tokens)
+
+
+def _trigram_query(columns: List[str], fragment: str) -> str:
+    """Build an FTS5 trigram phrase query restricted to the given columns."""
+    return '{%s} : "%s"' % (' '.join(columns), fragment.replace('"', '""'))
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value matches literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _fragment_statement() -> str:
+    """SQL selecting (id, rank) for assets whose tag or serial contains :fragment."""
+    if search_backends()['fragment'] == 'fts5':
+        return (
+            f"SELECT rowid AS id, 0.0 AS rank FROM {TRIGRAM_TABLE} "
+            f"WHERE {TRIGRAM_TABLE} MATCH :fragment"
+        )
+    if db.engine.dialect.name == 'postgresql':
+        conditions = ' OR '.join(f"{c} ILIKE :fragment ESCAPE '\\'" for c in FRAGMENT_COLUMNS)
+    else:
+        conditions = ' OR '.join(f"lower({c}) LIKE lower(:fragment) ESCAPE '\\'" for c in FRAGMENT_COLUMNS)
+    return f"SELECT id, 0.0 AS rank FROM assets WHERE {conditions}"
+
+
+def _fragment_params(fragment: str) -> Dict[str, str]:
+    """Bind parameters for _fragment_statement()."""
+    if search_backends()['fragment'] == 'fts5':
+        return {'fragment': _trigram_query(list(FRAGMENT_COLUMNS), fragment)}
+    return {'fragment': f'%{_escape_like(fragment)}%'}
+
+
+def _sqlite_has_table(connection, table: str) -> bool:
+    """Check whether a table exists in a SQLite database."""
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': table}
+    ).first() is not None
+
+
+def _create_sqlite_index(connection, table: str) -> bool:
+    """Create an FTS5 index table and its triggers; returns False if unsupported."""
+    try:
+        for statement in SQLITE_INDEXES[table]:
+            connection.execute(text(statement))
+        return True
+    except OperationalError as e:
+        logger.warning("SQLite index %s unavailable, falling back to LIKE scans: %s", table, e)
+        return False
+
+
+def _create_pg_indexes(connection) -> None:
+    """Create the PostgreSQL full-text and, if permitted, trigram indexes."""
+    for statement in PG_CREATE_STATEMENTS:
+        connection.execute(text(statement))
+    
+    savepoint = connection.begin_nested()
+    try:
+        for statement in PG_TRIGRAM_STATEMENTS:
+            connection.execute(text(statement))
+        savepoint.commit()
+    except (OperationalError, ProgrammingError) as e:
+        savepoint.rollback()
+        logger.warning("pg_trgm unavailable, fragment search will scan: %s", e)
+
+
+def _detect_backends(connection) -> Dict[str, str]:
+    """Determine which search backends the connected database supports."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        return {
+            'fulltext': 'fts5' if _sqlite_has_table(connection, FTS_TABLE) else 'like',
+            'fragment': 'fts5' if _sqlite_has_table(connection, TRIGRAM_TABLE) else 'like',
+        }
+    if dialect == 'postgresql':
+        # ILIKE picks up the pg_trgm indexes automatically when they exist
+        return {'fulltext': 'tsvector', 'fragment': 'pg_trgm'}
+    return {'fulltext': 'like', 'fragment': 'like'}
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _install_search_index(target, connection, **kw) -> None:
+    """Install the search indexes whenever tables are created."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        for table in SQLITE_INDEXES:
+            existed = _sqlite_has_table(connection, table)
+            if _create_sqlite_index(connection, table) and not existed:
+                # Backfill rows that predate the index (no-op for a new database)
+                connection.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        _create_pg_indexes(connection)
+    _backends.pop(connection.engine, None)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_search_index(target, connection, **kw) -> None:
+    """Drop the FTS5 tables, which are not part of the model metadata."""
+    if connection.dialect.name == 'sqlite':
+        for table in SQLITE_INDEXES:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    _backends.pop(connection.engine, None)
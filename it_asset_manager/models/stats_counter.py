@@ -0,0 +1,309 @@
+"""
+Materialized statistics counters.
+
+This module keeps a stats_counters table of (scope, key, count) rows with
+the numbers behind the dashboard statistics: assets by status, type and
+ownership, and access records by status, level, type, application and
+repository. Like the asset facets, the table is maintained by database
+triggers in the same transaction as the write, so ORM writes, bulk
+statements and raw SQL all keep it exact, and reading the statistics
+costs a handful of index lookups regardless of table size.
+
+- SQLite: AFTER INSERT/UPDATE/DELETE triggers using UPSERT
+- PostgreSQL: plpgsql row triggers
+- Other dialects: no counters; statistics fall back to aggregation queries
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event, text, select, union_all
+
+from ..core.database import db
+
+TRIGGER_DIALECTS = ('sqlite', 'postgresql')
+
+# A counter scope: rows of table where condition holds, counted per key.
+# key and condition are SQL expressions over the row alias {row}.
+CounterScope = namedtuple('CounterScope', ['table', 'columns', 'key', 'condition'])
+
+ACTIVE = "{row}.status = 'active'"
+
+COUNTER_SCOPES = OrderedDict([
+    ('asset_status', CounterScope('assets', ['status'], '{row}.status', None)),
+    ('asset_type', CounterScope('assets', ['asset_type'], '{row}.asset_type', None)),
+    ('asset_ownership', CounterScope('assets', ['ownership_type'], '{row}.ownership_type', None)),
+    ('app_access_status', CounterScope('application_access', ['status'], '{row}.status', None)),
+    ('app_access_level', CounterScope(
+        'application_access', ['status', 'access_level'], '{row}.access_level', ACTIVE)),
+    ('app_access_application', CounterScope(
+        'application_access', ['status', 'application_name'], '{row}.application_name', ACTIVE)),
+    ('github_access_status', CounterScope('github_access', ['status'], '{row}.status', None)),
+    ('github_access_type', CounterScope(
+        'github_access', ['status', 'access_type'], '{row}.access_type', ACTIVE)),
+    ('github_repository', CounterScope(
+        'github_access', ['status', 'organization_name', 'repo_name'],
+        "{row}.organization_name || '/' || {row}.repo_name", ACTIVE)),
+])
+
+
+class StatsCounter(db.Model):
+    """
+    Number of rows per key of a counter scope (see COUNTER_SCOPES).
+    
+    Rows are written by database triggers only; rows whose count drops to
+    zero are deleted.
+    """
+    
+    __tablename__ = 'stats_counters'
+    __table_args__ = (
+        db.Index('ix_stats_counters_scope_count', 'scope', 'count'),
+    )
+    
+    scope = db.Column(db.String(30), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """String representation of StatsCounter object."""
+        return f'<StatsCounter {self.scope}:{self.key}={self.count}>'
+    
+    @staticmethod
+    def available() -> bool:
+        """Check if the connected database maintains the counters."""
+        return db.engine.dialect.name in TRIGGER_DIALECTS
+    
+    @classmethod
+    def read(cls, scopes: List[str], top: Dict[str, int] = None,
+             extra: List = None) -> Tuple[Dict[str, Dict[str, int]], List]:
+        """
+        Read several scopes in one query.
+        
+        Args:
+            scopes: Scopes to read in full
+            top: Scope -> limit for scopes of which only the highest counts
+                are read, ties broken by key
+            extra: Additional (scope, key, count) selects to run in the
+                same round trip; their rows are returned separately
+                
+        Returns:
+            Tuple of ({scope: {key: count}}, extra_rows)
+        """
+        columns = (cls.scope, cls.key, cls.count)
+        selects = [select(*columns).where(cls.scope.in_(scopes))]
+        for scope, limit in (top or {}).items():
+            ranked = select(*columns).where(cls.scope == scope).order_by(
+                cls.count.desc(), cls.key
+            ).limit(limit).subquery()
+            selects.append(select(ranked.c.scope, ranked.c.key, ranked.c.count))
+        selects += extra or []
+        
+        known = set(scopes) | set(top or {})
+        counts = OrderedDict((scope, OrderedDict()) for scope in list(scopes) + list(top or {}))
+        extra_rows = []
+        for scope, key, count in db.session.execute(union_all(*selects)):
+            if scope in known:
+                counts[scope][key] = count
+            else:
+                extra_rows.append((scope, key, count))
+        
+        # union_all does not keep the ranking of the top subqueries
+        for scope in top or {}:
+            ranked = sorted(counts[scope].items(), key=lambda item: (-item[1], item[0]))
+            counts[scope] = OrderedDict(ranked)
+        return counts, extra_rows
+
+
+def reconcile_counters() -> Dict[str, int]:
+    """
+    Rebuild the counters from the live tables.
+    
+    Reinstalls the triggers, recomputes every scope with GROUP BY queries
+    and replaces the table contents in one transaction. Must be called
+    within an application context.
+    
+    Returns:
+        Dictionary mapping scope to the number of keys whose stored count
+        was wrong or missing
+    """
+    with db.engine.begin() as connection:
+        if connection.dialect.name not in TRIGGER_DIALECTS:
+            return {}
+        
+        stored = {}
+        for scope, key, count in connection.execute(text("SELECT scope, key, count FROM stats_counters")):
+            stored[(scope, key)] = count
+        
+        _install_triggers(connection)
+        _refill(connection)
+        
+        drift = OrderedDict((scope, 0) for scope in COUNTER_SCOPES)
+        fresh = set()
+        for scope, key, count in connection.execute(text("SELECT scope, key, count FROM stats_counters")):
+            fresh.add((scope, key))
+            if stored.get((scope, key)) != count:
+                drift[scope] += 1
+        for scope, key in set(stored) - fresh:
+            if scope in drift:
+                drift[scope] += 1
+    
+    return drift
+
+
+def _row(expression: str, row: str) -> str:
+    """Substitute the row alias into a scope expression."""
+    return expression.format(row=row)
+
+
+def _sqlite_bump(scope: str, spec: CounterScope, row: str, delta: int, guard: str = '') -> List[str]:
+    """Statements adding delta to the counter of a trigger's old/new row."""
+    key = _row(spec.key, row)
+    conditions = [f'{key} IS NOT NULL']
+    if spec.condition:
+        conditions.append(_row(spec.condition, row))
+    if guard:
+        conditions.append(guard)
+    where = ' AND '.join(conditions)
+    if delta > 0:
+        return [
+            f"INSERT INTO stats_counters(scope, key, count) SELECT '{scope}', {key}, 1 "
+            f"WHERE {where} ON CONFLICT(scope, key) DO UPDATE SET count = count + 1;"
+        ]
+    return [
+        f"UPDATE stats_counters SET count = count - 1 WHERE scope = '{scope}' AND key = {key} AND {where};",
+        f"DELETE FROM stats_counters WHERE scope = '{scope}' AND key = {key} AND count <= 0;",
+    ]
+
+
+def _changed(spec: CounterScope, distinct: str) -> str:
+    """SQL condition: a column the scope depends on changed in an UPDATE."""
+    return '(' + ' OR '.join(f'old.{column} {distinct} new.{column}' for column in spec.columns) + ')'
+
+
+def _tables() -> List[str]:
+    """Tables with counter scopes, in first-seen order."""
+    return list(OrderedDict((spec.table, None) for spec in COUNTER_SCOPES.values()))
+
+
+def _sqlite_trigger_statements() -> List[str]:
+    """Build the SQLite triggers maintaining stats_counters."""
+    statements = []
+    separator = '\n            '
+    for table in _tables():
+        scopes = [(scope, spec) for scope, spec in COUNTER_SCOPES.items() if spec.table == table]
+        columns = sorted({column for _, spec in scopes for column in spec.columns})
+        inserts, deletes, updates = [], [], []
+        for scope, spec in scopes:
+            inserts += _sqlite_bump(scope, spec, 'new', 1)
+            deletes += _sqlite_bump(scope, spec, 'old', -1)
+            changed = _changed(spec, 'IS NOT')
+            updates += _sqlite_bump(scope, spec, 'old', -1, changed) + _sqlite_bump(scope, spec, 'new', 1, changed)
+        
+        statements += [
+            f"DROP TRIGGER IF EXISTS stats_counters_{table}_ai",
+            f"DROP TRIGGER IF EXISTS stats_counters_{table}_ad",
+            f"DROP TRIGGER IF EXISTS stats_counters_{table}_au",
+            f"""CREATE TRIGGER stats_counters_{table}_ai AFTER INSERT ON {table} BEGIN
+            {separator.join(inserts)}
+        END""",
+            f"""CREATE TRIGGER stats_counters_{table}_ad AFTER DELETE ON {table} BEGIN
+            {separator.join(deletes)}
+        END""",
+            f"""CREATE TRIGGER stats_counters_{table}_au AFTER UPDATE OF {', '.join(columns)} ON {table} BEGIN
+            {separator.join(updates)}
+        END""",
+        ]
+    return statements
+
+
+def _pg_trigger_statements() -> List[str]:
+    """Build the PostgreSQL functions and triggers maintaining stats_counters."""
+    statements = [
+        """CREATE OR REPLACE FUNCTION stats_counters_bump(s text, k text, delta integer) RETURNS void AS $$
+        BEGIN
+            IF k IS NULL THEN
+                RETURN;
+            END IF;
+            INSERT INTO stats_counters(scope, key, count) VALUES (s, k, delta)
+            ON CONFLICT (scope, key) DO UPDATE SET count = stats_counters.count + delta;
+            DELETE FROM stats_counters WHERE scope = s AND key = k AND count <= 0;
+        END
+        $$ LANGUAGE plpgsql""",
+    ]
+    
+    def bump(scope: str, spec: CounterScope, row: str, delta: int) -> str:
+        call = f"PERFORM stats_counters_bump('{scope}', {_row(spec.key, row)}, {delta});"
+        if spec.condition:
+            return f"IF {_row(spec.condition, row)} THEN {call} END IF;"
+        return call
+    
+    separator = '\n                '
+    for table in _tables():
+        inserts, deletes, updates = [], [], []
+        for scope, spec in COUNTER_SCOPES.items():
+            if spec.table != table:
+                continue
+            inserts.append(bump(scope, spec, 'NEW', 1))
+            deletes.append(bump(scope, spec, 'OLD', -1))
+            updates.append(
+                f"IF {_changed(spec, 'IS DISTINCT FROM').replace('old.', 'OLD.').replace('new.', 'NEW.')} THEN "
+                f"{bump(scope, spec, 'OLD', -1)} {bump(scope, spec, 'NEW', 1)} END IF;"
+            )
+        
+        statements += [
+            f"""CREATE OR REPLACE FUNCTION stats_counters_{table}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {separator.join(inserts)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {separator.join(deletes)}
+            ELSE
+                {separator.join(updates)}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+            f"DROP TRIGGER IF EXISTS stats_counters_sync ON {table}",
+            f"""CREATE TRIGGER stats_counters_sync AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_{table}_sync()""",
+        ]
+    return statements
+
+
+def _install_triggers(connection) -> None:
+    """Create (or replace) the counter triggers for the connected database."""
+    if connection.dialect.name == 'sqlite':
+        statements = _sqlite_trigger_statements()
+    else:
+        statements = _pg_trigger_statements()
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _refill(connection) -> None:
+    """Replace the counters with fresh GROUP BY counts."""
+    connection.execute(text("DELETE FROM stats_counters"))
+    for scope, spec in COUNTER_SCOPES.items():
+        key = _row(spec.key, spec.table)
+        conditions = [f'{key} IS NOT NULL']
+        if spec.condition:
+            conditions.append(_row(spec.condition, spec.table))
+        connection.execute(text(
+            f"INSERT INTO stats_counters(scope, key, count) "
+            f"SELECT '{scope}', {key}, COUNT(*) FROM {spec.table} "
+            f"WHERE {' AND '.join(conditions)} GROUP BY {key}"
+        ))
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _install_counter_triggers(target, connection, **kw) -> None:
+    """Install the counter triggers whenever tables are created."""
+    if connection.dialect.name not in TRIGGER_DIALECTS:
+        return
+    
+    _install_triggers(connection)
+    
+    # Backfill when the counters table is added to a database that already has data
+    if connection.execute(text("SELECT 1 FROM stats_counters LIMIT 1")).first() is None:
+        if any(connection.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() for table in _tables()):
+            _refill(connection)
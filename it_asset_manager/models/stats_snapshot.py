@@ -0,0 +1,92 @@
+"""
+Daily statistics snapshots.
+
+This module contains the StatsSnapshot model, a narrow time-series table
+holding one (metric, date) -> value row per flattened dashboard statistic
+per day. History cannot be recomputed from the live tables because
+unassigning an asset or revoking access overwrites their state, so the
+snapshot job records it once a day and trend queries read only this table.
+"""
+
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Tuple
+
+from sqlalchemy import or_
+
+from ..core.database import db
+
+
+class StatsSnapshot(db.Model):
+    """
+    Value of one statistic on one day.
+    
+    The primary key leads with the metric, so the rows of a metric over a
+    date range are one contiguous index range.
+    """
+    
+    __tablename__ = 'stats_snapshots'
+    
+    metric = db.Column(db.String(120), primary_key=True)
+    snapshot_date = db.Column(db.Date, primary_key=True)
+    value = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_stats_snapshots_date', 'snapshot_date'),
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of StatsSnapshot object."""
+        return f'<StatsSnapshot {self.metric}@{self.snapshot_date}:{self.value}>'
+    
+    @classmethod
+    def replace_day(cls, day: date, metrics: Dict[str, int]) -> None:
+        """
+        Replace the snapshot of a day, so the job can safely run again.
+        
+        Changes are added to the session; the caller commits.
+        
+        Args:
+            day: Snapshot date
+            metrics: Metric name -> value
+        """
+        cls.query.filter(cls.snapshot_date == day).delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(cls, [
+            {'metric': metric, 'snapshot_date': day, 'value': value}
+            for metric, value in metrics.items()
+        ])
+    
+    @classmethod
+    def series(cls, metrics: List[str], start: date, end: date) -> Dict[str, List[Tuple[date, int]]]:
+        """
+        Read the values of metrics over a date range.
+        
+        Args:
+            metrics: Metric names; a name ending in '.*' selects every metric
+                with that prefix, e.g. 'assets.type.*'
+            start: First date, inclusive
+            end: Last date, inclusive
+            
+        Returns:
+            Dictionary mapping metric name to (date, value) tuples ordered
+            by date; metrics without snapshots in the range are omitted
+        """
+        exact = [metric for metric in metrics if not metric.endswith('.*')]
+        prefixes = [metric[:-1] for metric in metrics if metric.endswith('.*')]
+        
+        conditions = []
+        if exact:
+            conditions.append(cls.metric.in_(exact))
+        conditions.extend(cls.metric.startswith(prefix, autoescape=True) for prefix in prefixes)
+        if not conditions:
+            return OrderedDict()
+        
+        rows = db.session.query(cls.metric, cls.snapshot_date, cls.value).filter(
+            or_(*conditions),
+            cls.snapshot_date.between(start, end)
+        ).order_by(cls.metric, cls.snapshot_date).all()
+        
+        series = OrderedDict()
+        for metric, snapshot_date, value in rows:
+            series.setdefault(metric, []).append((snapshot_date, value))
+        return series
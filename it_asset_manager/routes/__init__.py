@@ -8,10 +8,14 @@ from .main import main_bp
 from .auth import auth_bp
 from .assets import assets_bp
 from .access import access_bp
+from .jobs import jobs_bp
+from .api import api_bp
 
 __all__ = [
     'main_bp',
     'auth_bp',
     'assets_bp',
-    'access_bp'
+    'access_bp',
+    'jobs_bp',
+    'api_bp'
 ]
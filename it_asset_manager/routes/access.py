@@ -4,62 +4,88 @@ Access management routes.
 This module contains all routes related to application and GitHub access management.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, jsonify, Response
-from flask_login import login_required
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response, current_app, stream_with_context
+from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-import io
 
-from ..services.access_service import AccessService
+from ..services.access_service import AccessService, MATCH_MODES
+from ..services.offboarding_service import OffboardingService
 from ..services.app_access_csv_service import AppAccessCSVService
 from ..services.github_access_csv_service import GitHubAccessCSVService
+from ..services.import_job_service import ImportJobService
 from ..models.access import ApplicationAccess, GitHubAccess
-from ..core.database import db
+from ..core.cache import conditional_on_data
+from .jobs import import_started_response
+from ..utils.pagination import keyset_paginate, clamp_page_size, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 access_bp = Blueprint('access', __name__)
 
 
+def _match_mode() -> str:
+    """Text filter match mode of the current request, 'contains' unless valid."""
+    match = request.args.get('match', 'contains')
+    return match if match in MATCH_MODES else 'contains'
+
+
+def _paginate(query, model):
+    """Fetch the requested page of an access listing, newest first."""
+    limit = clamp_page_size(
+        request.args.get('limit'),
+        default=current_app.config.get('ACCESS_PAGE_SIZE', DEFAULT_PAGE_SIZE),
+        maximum=current_app.config.get('ACCESS_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    )
+    try:
+        return keyset_paginate(query, model.created_at, model.id, cursor=request.args.get('cursor'), limit=limit)
+    except ValueError:
+        flash('Invalid page link, showing the first page', 'warning')
+        return keyset_paginate(query, model.created_at, model.id, limit=limit)
+
+
+def _page_url(cursor):
+    """Build a link to another page of the current listing, keeping all filters."""
+    if not cursor:
+        return None
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **args)
+
+
 # Application Access Routes
 
 @access_bp.route('/applications')
 @login_required
 def list_application_access():
     """
-    List all application access records.
+    List application access records, newest first, with cursor pagination.
+    
+    Query parameters:
+        user, app: Text filters
+        match: How the text filters match, 'contains', 'prefix' or 'exact'
+        status: Status filter
+        limit: Page size, capped at ACCESS_MAX_PAGE_SIZE
+        cursor: Cursor from a previous page's next/prev link
     
     Returns:
         Rendered application access list template
     """
     try:
         # Get filter parameters
-        username = request.args.get('user', '')
-        application = request.args.get('app', '')
+        filters = {name: request.args.get(name, '').strip() for name in AccessService.APPLICATION_ACCESS_FILTERS}
         status = request.args.get('status', '')
+        match = _match_mode()
         
-        # Build query
-        query = ApplicationAccess.query
-        
-        if username:
-            query = query.filter(ApplicationAccess.user_name.ilike(f'%{username}%'))
-        
-        if application:
-            query = query.filter(ApplicationAccess.application_name.ilike(f'%{application}%'))
-        
-        if status:
-            query = query.filter_by(status=status)
-        
-        access_records = query.order_by(ApplicationAccess.created_at.desc()).all()
-        
-        # Get unique values for filters
-        users = db.session.query(ApplicationAccess.user_name).distinct().all()
-        applications = db.session.query(ApplicationAccess.application_name).distinct().all()
+        query = AccessService.application_access_query(filters, status, match)
+        page = _paginate(query, ApplicationAccess)
         
         return render_template(
             'app_access.html',
-            accesses=access_records,
-            users=[u[0] for u in users],
-            applications=[a[0] for a in applications],
-            current_user=username,
-            current_app=application,
+            accesses=page.items,
+            page=page,
+            next_url=_page_url(page.next_cursor),
+            prev_url=_page_url(page.prev_cursor),
+            current_user=filters['user'],
+            current_app=filters['app'],
+            current_match=match,
             current_status=status
         )
         
@@ -144,49 +170,37 @@ def update_application_access(access_id: int):
 @login_required
 def list_github_access():
     """
-    List all GitHub access records.
+    List GitHub access records, newest first, with cursor pagination.
+    
+    Query parameters:
+        user, org, repo: Text filters
+        match: How the text filters match, 'contains', 'prefix' or 'exact'
+        status: Status filter
+        limit: Page size, capped at ACCESS_MAX_PAGE_SIZE
+        cursor: Cursor from a previous page's next/prev link
     
     Returns:
         Rendered GitHub access list template
     """
     try:
         # Get filter parameters
-        username = request.args.get('user', '')
-        organization = request.args.get('org', '')
-        repository = request.args.get('repo', '')
+        filters = {name: request.args.get(name, '').strip() for name in AccessService.GITHUB_ACCESS_FILTERS}
         status = request.args.get('status', '')
+        match = _match_mode()
         
-        # Build query
-        query = GitHubAccess.query
-        
-        if username:
-            query = query.filter(GitHubAccess.user_name.ilike(f'%{username}%'))
-        
-        if organization:
-            query = query.filter(GitHubAccess.organization_name.ilike(f'%{organization}%'))
-        
-        if repository:
-            query = query.filter(GitHubAccess.repo_name.ilike(f'%{repository}%'))
-        
-        if status:
-            query = query.filter_by(status=status)
-        
-        access_records = query.order_by(GitHubAccess.created_at.desc()).all()
-        
-        # Get unique values for filters
-        users = db.session.query(GitHubAccess.user_name).distinct().all()
-        organizations = db.session.query(GitHubAccess.organization_name).distinct().all()
-        repositories = db.session.query(GitHubAccess.repo_name).distinct().all()
+        query = AccessService.github_access_query(filters, status, match)
+        page = _paginate(query, GitHubAccess)
         
         return render_template(
             'github_access.html',
-            accesses=access_records,
-            users=[u[0] for u in users],
-            organizations=[o[0] for o in organizations],
-            repositories=[r[0] for r in repositories],
-            current_user=username,
-            current_org=organization,
-            current_repo=repository,
+            accesses=page.items,
+            page=page,
+            next_url=_page_url(page.next_cursor),
+            prev_url=_page_url(page.prev_cursor),
+            current_user=filters['user'],
+            current_org=filters['org'],
+            current_repo=filters['repo'],
+            current_match=match,
             current_status=status
         )
         
@@ -270,25 +284,19 @@ def update_github_access(access_id: int):
 
 @access_bp.route('/applications/export')
 @login_required
+@conditional_on_data([ApplicationAccess.__tablename__], daily=True)
 def export_application_access():
     """
     Export application access to CSV file.
     
     Returns:
-        CSV file download
+        Streaming CSV file download
     """
     try:
-        csv_data = AccessService.export_application_access_csv()
-        
-        # Create file-like object
-        output = io.StringIO(csv_data)
-        output.seek(0)
-        
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+        return Response(
+            stream_with_context(AccessService.iter_application_access_csv()),
             mimetype='text/csv',
-            as_attachment=True,
-            download_name='application_access_export.csv'
+            headers={'Content-Disposition': 'attachment; filename=application_access_export.csv'}
         )
         
     except Exception as e:
@@ -298,25 +306,19 @@ def export_application_access():
 
 @access_bp.route('/github/export')
 @login_required
+@conditional_on_data([GitHubAccess.__tablename__], daily=True)
 def export_github_access():
     """
     Export GitHub access to CSV file.
     
     Returns:
-        CSV file download
+        Streaming CSV file download
     """
     try:
-        csv_data = AccessService.export_github_access_csv()
-        
-        # Create file-like object
-        output = io.StringIO(csv_data)
-        output.seek(0)
-        
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+        return Response(
+            stream_with_context(AccessService.iter_github_access_csv()),
             mimetype='text/csv',
-            as_attachment=True,
-            download_name='github_access_export.csv'
+            headers={'Content-Disposition': 'attachment; filename=github_access_export.csv'}
         )
         
     except Exception as e:
@@ -328,6 +330,7 @@ def export_github_access():
 
 @access_bp.route('/api/statistics')
 @login_required
+@conditional_on_data([ApplicationAccess.__tablename__, GitHubAccess.__tablename__])
 def api_access_statistics():
     """
     API endpoint for access statistics.
@@ -342,6 +345,150 @@ def api_access_statistics():
         return jsonify({'error': str(e)}), 500
 
 
+@access_bp.route('/api/autocomplete/<field>')
+@login_required
+def api_autocomplete(field: str):
+    """
+    API endpoint for prefix suggestions of access filter fields.
+    
+    Args:
+        field: Autocomplete field (see AccessService.AUTOCOMPLETE_FIELDS)
+        
+    Query parameters:
+        q: Typed prefix
+        limit: Number of suggestions, capped at AUTOCOMPLETE_MAX_LIMIT
+        
+    Returns:
+        JSON response with the matching 'suggestions'
+    """
+    limit = clamp_page_size(
+        request.args.get('limit'),
+        default=current_app.config.get('AUTOCOMPLETE_LIMIT', 10),
+        maximum=current_app.config.get('AUTOCOMPLETE_MAX_LIMIT', 50)
+    )
+    success, message, suggestions = AccessService.suggest(field, request.args.get('q', '').strip(), limit)
+    if not success:
+        return jsonify({'error': message}), 400
+    return jsonify({'field': field, 'suggestions': suggestions})
+
+
+@access_bp.route('/api/applications/batch-grant', methods=['POST'])
+@login_required
+def api_batch_grant_application_access():
+    """
+    API endpoint granting application access for many items in one transaction.
+    
+    JSON body: {"items": [{"username", "application_name", "access_level"}, ...],
+    "remarks": optional}
+    
+    Returns:
+        JSON response with a summary 'message' and per-item 'results'
+    """
+    return _batch_response(AccessService.batch_grant_application_access)
+
+
+@access_bp.route('/api/applications/batch-revoke', methods=['POST'])
+@login_required
+def api_batch_revoke_application_access():
+    """
+    API endpoint revoking application access for many items in one transaction.
+    
+    JSON body: {"items": [{"username", "application_name"}, ...], "remarks": optional}
+    
+    Returns:
+        JSON response with a summary 'message' and per-item 'results'
+    """
+    return _batch_response(AccessService.batch_revoke_application_access)
+
+
+@access_bp.route('/api/github/batch-grant', methods=['POST'])
+@login_required
+def api_batch_grant_github_access():
+    """
+    API endpoint granting GitHub access for many items in one transaction.
+    
+    JSON body: {"items": [{"username", "organization", "repo_name", "access_type"}, ...],
+    "remarks": optional}
+    
+    Returns:
+        JSON response with a summary 'message' and per-item 'results'
+    """
+    return _batch_response(AccessService.batch_grant_github_access)
+
+
+@access_bp.route('/api/github/batch-revoke', methods=['POST'])
+@login_required
+def api_batch_revoke_github_access():
+    """
+    API endpoint revoking GitHub access for many items in one transaction.
+    
+    JSON body: {"items": [{"username", "organization", "repo_name"}, ...], "remarks": optional}
+    
+    Returns:
+        JSON response with a summary 'message' and per-item 'results'
+    """
+    return _batch_response(AccessService.batch_revoke_github_access)
+
+
+def _batch_response(apply):
+    """Run a batch service call on the request's JSON body."""
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get('items'), list):
+        return jsonify({'error': 'Request body must be a JSON object with an "items" list'}), 400
+    if len(payload['items']) > AccessService.MAX_BATCH_ITEMS:
+        return jsonify({'error': f"At most {AccessService.MAX_BATCH_ITEMS} items can be processed at once"}), 400
+    
+    remarks = payload.get('remarks')
+    success, message, results = apply(payload['items'], remarks.strip() if isinstance(remarks, str) else None)
+    if not success:
+        return jsonify({'error': message}), 500
+    return jsonify({'message': message, 'results': results})
+
+
+@access_bp.route('/api/offboard', methods=['POST'])
+@login_required
+def api_offboard():
+    """
+    API endpoint revoking all access and unassigning all assets of leaving users.
+    
+    JSON body: {"usernames": [...]} or {"username": "..."}, plus optional
+    "remarks"
+    
+    Query parameters:
+        format: 'csv' for the receipt as a CSV download instead of JSON
+        
+    Returns:
+        JSON response with a summary 'message' and the offboarding result,
+        or the CSV receipt
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    usernames = payload.get('usernames', [payload.get('username')] if payload.get('username') else [])
+    if not isinstance(usernames, list) or not all(isinstance(name, str) for name in usernames):
+        return jsonify({'error': '"usernames" must be a list of strings'}), 400
+    if not any(name.strip() for name in usernames):
+        return jsonify({'error': 'No usernames given'}), 400
+    if len(usernames) > OffboardingService.MAX_USERS:
+        return jsonify({'error': f"At most {OffboardingService.MAX_USERS} users can be offboarded at once"}), 400
+    
+    remarks = payload.get('remarks')
+    success, message, result = OffboardingService.offboard(
+        usernames, remarks.strip() if isinstance(remarks, str) else None
+    )
+    if not success:
+        return jsonify({'error': message}), 500
+    
+    if request.args.get('format') == 'csv':
+        return Response(
+            OffboardingService.receipt_csv(result),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f"attachment; filename=offboarding_{result['date']}.csv"}
+        )
+    return jsonify(dict(result, message=message))
+
+
 # Application Access CSV Routes
 
 @access_bp.route('/applications/bulk-upload', methods=['GET', 'POST'])
@@ -371,39 +518,13 @@ def bulk_upload_application_access():
             flash('Please upload a CSV file', 'error')
             return redirect(request.url)
         
-        try:
-            # Read file content
-            file_content = file.read().decode('utf-8')
-            
-            # Parse and validate CSV data
-            valid_rows, parse_errors = AppAccessCSVService.parse_csv_file(file_content)
-            
-            if parse_errors:
-                for error in parse_errors:
-                    flash(error, 'error')
-                return render_template('bulk_upload_app_access.html')
-            
-            if not valid_rows:
-                flash('No valid data found in CSV file', 'error')
-                return render_template('bulk_upload_app_access.html')
-            
-            # Import application access
-            created_count, updated_count, import_errors = AppAccessCSVService.bulk_import_app_access(valid_rows)
+        # Import in the background; the job page reports progress and the result
+        success, message, job = ImportJobService.submit('application_access', file, current_user.username)
+        if not success:
+            flash(message, 'error')
+            return render_template('bulk_upload_app_access.html')
             
-            # Display results
-            if import_errors:
-                for error in import_errors:
-                    flash(error, 'error')
-            
-            if created_count > 0 or updated_count > 0:
-                success_msg = f"Import completed: {created_count} access records created, {updated_count} access records updated"
-                flash(success_msg, 'success')
-                return redirect(url_for('access.list_application_access'))
-            else:
-                flash('No access records were imported', 'warning')
-                
-        except Exception as e:
-            flash(f'Error processing file: {str(e)}', 'error')
+        return import_started_response(job)
     
     return render_template('bulk_upload_app_access.html')
 
@@ -466,39 +587,13 @@ def bulk_upload_github_access():
             flash('Please upload a CSV file', 'error')
             return redirect(request.url)
         
-        try:
-            # Read file content
-            file_content = file.read().decode('utf-8')
-            
-            # Parse and validate CSV data
-            valid_rows, parse_errors = GitHubAccessCSVService.parse_csv_file(file_content)
-            
-            if parse_errors:
-                for error in parse_errors:
-                    flash(error, 'error')
-                return render_template('bulk_upload_github_access.html')
-            
-            if not valid_rows:
-                flash('No valid data found in CSV file', 'error')
-                return render_template('bulk_upload_github_access.html')
-            
-            # Import GitHub access
-            created_count, updated_count, import_errors = GitHubAccessCSVService.bulk_import_github_access(valid_rows)
-            
-            # Display results
-            if import_errors:
-                for error in import_errors:
-                    flash(error, 'error')
+        # Import in the background; the job page reports progress and the result
+        success, message, job = ImportJobService.submit('github_access', file, current_user.username)
+        if not success:
+            flash(message, 'error')
+            return render_template('bulk_upload_github_access.html')
             
-            if created_count > 0 or updated_count > 0:
-                success_msg = f"Import completed: {created_count} access records created, {updated_count} access records updated"
-                flash(success_msg, 'success')
-                return redirect(url_for('access.list_github_access'))
-            else:
-                flash('No access records were imported', 'warning')
-                
-        except Exception as e:
-            flash(f'Error processing file: {str(e)}', 'error')
+        return import_started_response(job)
     
     return render_template('bulk_upload_github_access.html')
 
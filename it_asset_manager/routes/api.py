@@ -0,0 +1,117 @@
+"""
+Versioned JSON API routes.
+
+This module contains the /api/v1 resources used by integrations. Responses
+are built from selected columns with the bulk serializers, never from ORM
+objects, and ?fields= narrows both the response and the selected columns.
+"""
+
+from flask import Blueprint, request, url_for, current_app
+from flask_login import login_required
+
+from ..models.asset import Asset, ASSET_SERIALIZER
+from ..services.asset_service import AssetService
+from ..utils.pagination import keyset_paginate, clamp_page_size, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..utils.serializers import json_response
+from .assets import SORTABLE_COLUMNS
+
+api_bp = Blueprint('api', __name__)
+
+
+def _error(message: str, status: int = 400):
+    """JSON error response."""
+    return json_response({'error': message}, status=status)
+
+
+def _split(value: str) -> list:
+    """Values of a comma separated query parameter."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+@api_bp.route('/assets')
+@login_required
+def list_assets():
+    """
+    List assets as JSON with cursor pagination, sparse fieldsets and filters.
+    
+    Query parameters:
+        fields: Comma separated fields to return, default all
+        tags: Comma separated asset tags to fetch in one request instead
+            of paginating; at most ASSETS_MAX_PAGE_SIZE
+        type, category, status, assigned_to, location, brand: Exact match
+            filters; repeat a parameter to accept several values
+        sort: Column to order by (updated_at, created_at, asset_tag, serial_number)
+        order: 'asc' or 'desc'
+        limit: Page size, capped at ASSETS_MAX_PAGE_SIZE
+        cursor: Cursor from a previous page's next/prev link
+        
+    Returns:
+        JSON response with 'data', plus 'links' to the neighbouring pages
+        or, for tags, the 'missing' tags
+    """
+    sort = request.args.get('sort', 'updated_at')
+    if sort not in SORTABLE_COLUMNS:
+        return _error(f"Invalid sort. Must be one of: {', '.join(SORTABLE_COLUMNS)}")
+    descending = request.args.get('order', 'desc') != 'asc'
+    maximum = current_app.config.get('ASSETS_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    
+    fields = _split(request.args.get('fields', ''))
+    tags = _split(request.args.get('tags', ''))
+    try:
+        serializer = ASSET_SERIALIZER.subset(
+            fields or ASSET_SERIALIZER.field_names,
+            required=['asset_tag'] if tags else ['id', sort]
+        )
+    except ValueError as e:
+        return _error(str(e))
+    
+    if tags:
+        if len(tags) > maximum:
+            return _error(f"At most {maximum} tags can be fetched at once")
+        rows = AssetService.find_asset_rows_by_tags(serializer.columns(), tags)
+        found = {row.asset_tag for row in rows}
+        return json_response({
+            'data': serializer.serialize(rows),
+            'missing': [tag for tag in tags if tag not in found]
+        })
+    
+    filters = {
+        name: request.args.getlist(name)
+        for name in AssetService.API_FILTERS
+        if request.args.getlist(name)
+    }
+    limit = clamp_page_size(
+        request.args.get('limit'),
+        default=current_app.config.get('ASSETS_PAGE_SIZE', DEFAULT_PAGE_SIZE),
+        maximum=maximum
+    )
+    
+    try:
+        page = keyset_paginate(
+            AssetService.asset_rows_query(serializer.columns(), filters),
+            SORTABLE_COLUMNS[sort],
+            Asset.id,
+            cursor=request.args.get('cursor'),
+            limit=limit,
+            descending=descending
+        )
+    except ValueError as e:
+        return _error(str(e))
+    
+    return json_response({
+        'data': serializer.serialize(page.items),
+        'links': {
+            'next': _page_url(page.next_cursor),
+            'prev': _page_url(page.prev_cursor)
+        },
+        'meta': {'limit': limit, 'sort': sort, 'order': 'desc' if descending else 'asc'}
+    })
+
+
+def _page_url(cursor):
+    """Build a link to another page of the current listing, keeping all parameters."""
+    if not cursor:
+        return None
+    args = request.args.to_dict(flat=False)
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **args)
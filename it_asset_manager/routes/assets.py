@@ -5,24 +5,52 @@ This module contains all routes related to asset management including
 CRUD operations, assignment, and reporting.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, jsonify, Response
-from flask_login import login_required
+from datetime import date
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response, current_app, stream_with_context
+from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-import io
 
 from ..services.asset_service import AssetService
 from ..services.csv_service import CSVService
+from ..services.import_job_service import ImportJobService
+from ..services.expiry_service import ExpiryService
+from ..services.financial_service import FinancialService
 from ..models.asset import Asset
+from ..models.facet import AssetFacet, FACET_COLUMNS
 from ..core.database import db
+from ..core.cache import conditional_on_data
+from .jobs import import_started_response
+from ..utils.pagination import keyset_paginate, clamp_page_size, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 assets_bp = Blueprint('assets', __name__)
 
+# Columns the asset listing can be ordered by; each is non-nullable and indexed
+SORTABLE_COLUMNS = {
+    'updated_at': Asset.updated_at,
+    'created_at': Asset.created_at,
+    'asset_tag': Asset.asset_tag,
+    'serial_number': Asset.serial_number
+}
+
+
+# Facet filters other than type/status, keyed by query parameter
+EXTRA_FILTERS = ('category', 'condition', 'brand', 'location')
+
 
 @assets_bp.route('/')
 @login_required
 def list_assets():
     """
-    List all assets with filtering and search capabilities.
+    List assets with filtering, search and cursor pagination.
+    
+    Query parameters:
+        type, status, category, condition, brand, location, search:
+            Filters applied to the listing
+        sort: Column to order by (see SORTABLE_COLUMNS)
+        order: 'asc' or 'desc'
+        limit: Page size, capped at ASSETS_MAX_PAGE_SIZE
+        cursor: Cursor from a previous page's next/prev link
     
     Returns:
         Rendered assets list template
@@ -33,8 +61,19 @@ def list_assets():
         status = request.args.get('status', '')
         search = request.args.get('search', '')
         
+        # Get pagination parameters
+        sort = request.args.get('sort', 'updated_at')
+        if sort not in SORTABLE_COLUMNS:
+            sort = 'updated_at'
+        descending = request.args.get('order', 'desc') != 'asc'
+        limit = clamp_page_size(
+            request.args.get('limit'),
+            default=current_app.config.get('ASSETS_PAGE_SIZE', DEFAULT_PAGE_SIZE),
+            maximum=current_app.config.get('ASSETS_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+        )
+        
         # Build query
-        query = Asset.query
+        query = Asset.search_query(search) if search else Asset.query
         
         if asset_type:
             query = query.filter_by(asset_type=asset_type)
@@ -42,23 +81,42 @@ def list_assets():
         if status:
             query = query.filter_by(status=status)
         
-        if search:
-            assets = Asset.search(search)
-        else:
-            assets = query.all()
+        filters = {name: request.args.get(name, '') for name in EXTRA_FILTERS}
+        for name, value in filters.items():
+            if value:
+                query = query.filter(getattr(Asset, FACET_COLUMNS[name]) == value)
         
-        # Get unique asset types and statuses for filters
-        asset_types = db.session.query(Asset.asset_type).distinct().all()
-        asset_statuses = db.session.query(Asset.status).distinct().all()
+        try:
+            page = keyset_paginate(
+                query,
+                SORTABLE_COLUMNS[sort],
+                Asset.id,
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                descending=descending
+            )
+        except ValueError:
+            flash('Invalid page link, showing the first page', 'warning')
+            page = keyset_paginate(query, SORTABLE_COLUMNS[sort], Asset.id, limit=limit, descending=descending)
+        
+        # Filter values with asset counts, read from the trigger-maintained facet table
+        facets = AssetFacet.all_counts()
         
         return render_template(
             'assets.html',
-            assets=assets,
-            asset_types=[t[0] for t in asset_types],
-            asset_statuses=[s[0] for s in asset_statuses],
+            assets=page.items,
+            page=page,
+            next_url=_page_url(page.next_cursor),
+            prev_url=_page_url(page.prev_cursor),
+            facets=facets,
+            asset_types=[value for value, count in facets['asset_type']],
+            asset_statuses=[value for value, count in facets['status']],
             current_type=asset_type,
             current_status=status,
-            current_search=search
+            current_filters=filters,
+            current_search=search,
+            current_sort=sort,
+            current_order='desc' if descending else 'asc'
         )
         
     except Exception as e:
@@ -66,6 +124,15 @@ def list_assets():
         return render_template('assets.html', assets=[])
 
 
+def _page_url(cursor):
+    """Build a link to another page of the current listing, keeping all filters."""
+    if not cursor:
+        return None
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **args)
+
+
 @assets_bp.route('/add', methods=['GET', 'POST'])
 @login_required
 def add_asset():
@@ -227,25 +294,22 @@ def unassign_asset(asset_id: int):
 
 @assets_bp.route('/export')
 @login_required
+@conditional_on_data([Asset.__tablename__])
 def export_assets():
     """
     Export assets to CSV file.
     
+    The file is streamed in chunks as rows are read, so large exports
+    neither buffer in memory nor delay the first byte.
+    
     Returns:
-        CSV file download
+        Streaming CSV file download
     """
     try:
-        csv_data = AssetService.export_assets_csv()
-        
-        # Create file-like object
-        output = io.StringIO(csv_data)
-        output.seek(0)
-        
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+        return Response(
+            stream_with_context(AssetService.iter_assets_csv()),
             mimetype='text/csv',
-            as_attachment=True,
-            download_name='assets_export.csv'
+            headers={'Content-Disposition': 'attachment; filename=assets_export.csv'}
         )
         
     except Exception as e:
@@ -255,6 +319,7 @@ def export_assets():
 
 @assets_bp.route('/api/statistics')
 @login_required
+@conditional_on_data([Asset.__tablename__], daily=True)
 def api_statistics():
     """
     API endpoint for asset statistics.
@@ -269,6 +334,82 @@ def api_statistics():
         return jsonify({'error': str(e)}), 500
 
 
+@assets_bp.route('/api/expiring')
+@login_required
+@conditional_on_data([Asset.__tablename__], daily=True)
+def api_expiring():
+    """
+    API endpoint for assets whose warranty or rental ends soon.
+    
+    Query parameters:
+        kind: 'warranty' (default) or 'rental'
+        within: 7, 30 (default) or 90 days
+        
+    Returns:
+        JSON response with the matching assets ordered by end date
+    """
+    kind = request.args.get('kind', 'warranty')
+    within = request.args.get('within', 30, type=int)
+    
+    success, message, entries = ExpiryService.get_expiring(kind, within)
+    if not success:
+        return jsonify({'error': message}), 400
+    return jsonify({'kind': kind, 'within': within, 'count': len(entries), 'assets': entries})
+
+
+def _financial_report():
+    """Financial report for the method and as_of query parameters, or an error response."""
+    try:
+        as_of = date.fromisoformat(request.args['as_of']) if request.args.get('as_of') else None
+    except ValueError:
+        return None, (jsonify({'error': 'Invalid date. Use YYYY-MM-DD format.'}), 400)
+    
+    success, message, report = FinancialService.get_report(request.args.get('method', 'straight_line'), as_of)
+    if not success:
+        return None, (jsonify({'error': message}), 400)
+    return report, None
+
+
+@assets_bp.route('/api/financials')
+@login_required
+@conditional_on_data([Asset.__tablename__], daily=True)
+def api_financials():
+    """
+    API endpoint for fleet cost, book value and rental spend.
+    
+    Query parameters:
+        method: 'straight_line' (default) or 'declining_balance'
+        as_of: Valuation date as YYYY-MM-DD, defaults to today
+        
+    Returns:
+        JSON response with totals and totals by category, vendor and location
+    """
+    report, error = _financial_report()
+    return error or jsonify(report)
+
+
+@assets_bp.route('/financials/export')
+@login_required
+@conditional_on_data([Asset.__tablename__], daily=True)
+def export_financials():
+    """
+    Export the fleet financial report to CSV file.
+    
+    Takes the same query parameters as the financials API.
+    
+    Returns:
+        CSV file download
+    """
+    report, error = _financial_report()
+    if error:
+        return error
+    return Response(
+        FinancialService.report_csv(report),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f"attachment; filename=financials_{report['as_of']}.csv"}
+    )
+
+
 @assets_bp.route('/bulk-upload', methods=['GET', 'POST'])
 @login_required
 def bulk_upload():
@@ -296,39 +437,13 @@ def bulk_upload():
             flash('Please upload a CSV file', 'error')
             return redirect(request.url)
         
-        try:
-            # Read file content
-            file_content = file.read().decode('utf-8')
-            
-            # Parse and validate CSV data
-            valid_rows, parse_errors = CSVService.parse_csv_file(file_content)
-            
-            if parse_errors:
-                for error in parse_errors:
-                    flash(error, 'error')
-                return render_template('bulk_upload.html')
-            
-            if not valid_rows:
-                flash('No valid data found in CSV file', 'error')
-                return render_template('bulk_upload.html')
-            
-            # Import assets
-            created_count, updated_count, import_errors = CSVService.bulk_import_assets(valid_rows)
-            
-            # Display results
-            if import_errors:
-                for error in import_errors:
-                    flash(error, 'error')
+        # Import in the background; the job page reports progress and the result
+        success, message, job = ImportJobService.submit('assets', file, current_user.username)
+        if not success:
+            flash(message, 'error')
+            return render_template('bulk_upload.html')
             
-            if created_count > 0 or updated_count > 0:
-                success_msg = f"Import completed: {created_count} assets created, {updated_count} assets updated"
-                flash(success_msg, 'success')
-                return redirect(url_for('assets.list_assets'))
-            else:
-                flash('No assets were imported', 'warning')
-                
-        except Exception as e:
-            flash(f'Error processing file: {str(e)}', 'error')
+        return import_started_response(job)
     
     return render_template('bulk_upload.html')
 
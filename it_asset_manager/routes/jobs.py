@@ -0,0 +1,87 @@
+"""
+Background job routes.
+
+This module contains the status page and JSON progress endpoint for
+bulk import jobs running on the local job runner.
+"""
+
+from flask import Blueprint, render_template, jsonify, abort, url_for, request, redirect, flash
+from flask_login import login_required
+
+from ..models.job import ImportJob
+from ..services.import_job_service import ImportJobService
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Listing to return to once an import of each kind has finished
+RESULT_ENDPOINTS = {
+    'assets': 'assets.list_assets',
+    'application_access': 'access.list_application_access',
+    'github_access': 'access.list_github_access'
+}
+
+
+@jobs_bp.route('/<job_id>')
+@login_required
+def job_status(job_id: str):
+    """
+    Import job status page, which polls the progress endpoint.
+    
+    Args:
+        job_id: Import job id
+        
+    Returns:
+        Rendered job status template
+    """
+    job = ImportJob.find_by_id(job_id)
+    if not job:
+        abort(404)
+    
+    return render_template(
+        'import_job.html',
+        job=job,
+        progress_url=url_for('jobs.job_progress', job_id=job.id),
+        result_url=url_for(RESULT_ENDPOINTS[job.kind])
+    )
+
+
+@jobs_bp.route('/<job_id>/progress')
+@login_required
+def job_progress(job_id: str):
+    """
+    API endpoint for import job progress.
+    
+    Args:
+        job_id: Import job id
+        
+    Returns:
+        JSON with rows processed, throughput, ETA and, once finished, the summary
+    """
+    progress = ImportJobService.get_progress(job_id)
+    if progress is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(progress)
+
+
+def import_started_response(job: ImportJob):
+    """
+    Respond to a bulk upload that was queued as a job.
+    
+    JSON clients get 202 Accepted with the job and its progress URL;
+    browsers are redirected to the job status page.
+    
+    Args:
+        job: The queued import job
+        
+    Returns:
+        Flask response
+    """
+    progress_url = url_for('jobs.job_progress', job_id=job.id)
+    if request.accept_mimetypes.best == 'application/json':
+        response = jsonify({'job_id': job.id, 'status': job.status, 'progress_url': progress_url})
+        response.status_code = 202
+        response.headers['Location'] = progress_url
+        return response
+    
+    flash(f'Import of {job.filename} started', 'info')
+    return redirect(url_for('jobs.job_status', job_id=job.id))
@@ -4,11 +4,14 @@ Main application routes.
 This module contains the main routes including dashboard and home page.
 """
 
-from flask import Blueprint, render_template, redirect, url_for
+from datetime import date
+
+from flask import Blueprint, render_template, redirect, url_for, request, jsonify
 from flask_login import login_required, current_user
 
 from ..services.asset_service import AssetService
 from ..services.access_service import AccessService
+from ..services.trend_service import TrendService
 
 main_bp = Blueprint('main', __name__)
 
@@ -54,3 +57,33 @@ def dashboard():
             error=f"Error loading dashboard: {str(e)}",
             user=current_user
         )
+
+
+@main_bp.route('/api/statistics/trends')
+@login_required
+def api_statistics_trends():
+    """
+    API endpoint for statistics trends, read from the daily snapshots.
+    
+    Query parameters:
+        metric: Metric name or 'prefix.*', repeated or comma separated
+        start, end: Date range as YYYY-MM-DD
+        interval: day, week or month
+        
+    Returns:
+        JSON response with one series of points per metric
+    """
+    metrics = [name.strip() for value in request.args.getlist('metric') for name in value.split(',') if name.strip()]
+    
+    try:
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else None
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify({'error': 'Invalid date. Use YYYY-MM-DD format.'}), 400
+    
+    success, message, trends = TrendService.get_trends(
+        metrics or None, start, end, request.args.get('interval', 'day')
+    )
+    if not success:
+        return jsonify({'error': message}), 400
+    return jsonify(trends)
@@ -11,6 +11,12 @@ from .access_service import AccessService
 from .csv_service import CSVService
 from .app_access_csv_service import AppAccessCSVService
 from .github_access_csv_service import GitHubAccessCSVService
+from .import_job_service import ImportJobService
+from .statistics_service import StatisticsService
+from .trend_service import TrendService
+from .expiry_service import ExpiryService
+from .financial_service import FinancialService
+from .offboarding_service import OffboardingService
 
 __all__ = [
     'AssetService',
@@ -18,5 +24,11 @@ __all__ = [
     'AccessService',
     'CSVService',
     'AppAccessCSVService',
-    'GitHubAccessCSVService'
+    'GitHubAccessCSVService',
+    'ImportJobService',
+    'StatisticsService',
+    'TrendService',
+    'ExpiryService',
+    'FinancialService',
+    'OffboardingService'
 ]
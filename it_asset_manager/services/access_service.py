@@ -5,18 +5,145 @@ This module contains the AccessService class that handles business logic
 for managing user access to applications and GitHub repositories.
 """
 
+from collections import Counter, OrderedDict
 from datetime import date, datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 import csv
 import io
+import sys
+
+from sqlalchemy import and_, tuple_
 
 from ..models.access import ApplicationAccess, GitHubAccess
 from ..core.database import db
+from ..core.autocomplete import get_autocomplete
+from .statistics_service import StatisticsService
+
+# How listing text filters match; 'prefix' and 'exact' can use indexes,
+# 'contains' needs a leading-wildcard scan
+MATCH_MODES = ('contains', 'prefix', 'exact')
+
+
+def text_filter(column: Any, value: str, match: str = 'contains') -> Any:
+    """
+    Build a filter of a text column by a search value.
+    
+    'contains' matches case-insensitively anywhere in the value. 'exact'
+    compares for equality and 'prefix' with a range (value <= column <
+    value with its last character incremented), both case-sensitive, so
+    the database can seek an index instead of scanning every row.
+    
+    Args:
+        column: Text column to filter
+        value: Search value
+        match: One of MATCH_MODES
+        
+    Returns:
+        SQLAlchemy filter clause
+        
+    Raises:
+        ValueError: If the match mode is unknown
+    """
+    if match == 'exact':
+        return column == value
+    if match == 'prefix':
+        last = ord(value[-1])
+        if last < sys.maxunicode:
+            return and_(column >= value, column < value[:-1] + chr(last + 1))
+        return column >= value
+    if match == 'contains':
+        return column.ilike(f'%{value}%')
+    raise ValueError(f"Invalid match mode. Must be one of: {', '.join(MATCH_MODES)}")
+
+
+# Batch item key -> model attribute identifying a grant; the first key is the user
+_APPLICATION_KEYS = OrderedDict([('username', 'user_name'), ('application_name', 'application_name')])
+_GITHUB_KEYS = OrderedDict([('username', 'user_name'), ('organization', 'organization_name'), ('repo_name', 'repo_name')])
+
+
+def _batch_result(index: int, status: str, message: str, access: Any = None) -> Dict[str, Any]:
+    """Result of one batch item."""
+    return {'index': index, 'status': status, 'message': message, 'id': access.id if access is not None else None}
+
+
+def _batch_summary(results: List[Dict[str, Any]]) -> str:
+    """Summarize batch results as counts per status, e.g. '3 granted, 1 invalid'."""
+    counts = Counter(result['status'] for result in results)
+    return ', '.join(f"{count} {status.replace('_', ' ')}" for status, count in counts.items()) or "No items"
+
+
+def _validate_batch(items: List[Any], keys: Dict[str, str], level_field: Optional[str] = None,
+                    valid_levels: Sequence[str] = ()) -> Tuple[List[Optional[Dict[str, Any]]], Dict[tuple, Tuple[int, Optional[str]]]]:
+    """
+    Validate the items of a batch grant or revoke.
+    
+    Returns:
+        Tuple of (results, pending) where results holds the results of
+        invalid and duplicate items and None for the others, and pending
+        maps each distinct grant key to its item index and access level
+    """
+    results: List[Optional[Dict[str, Any]]] = []
+    pending: Dict[tuple, Tuple[int, Optional[str]]] = OrderedDict()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append(_batch_result(index, 'invalid', "Item must be an object"))
+            continue
+        
+        key = tuple(str(item.get(name) or '').strip() for name in keys)
+        level = str(item.get(level_field) or '').strip() if level_field else None
+        missing = [name for name, value in zip(keys, key) if not value]
+        if level_field and not level:
+            missing.append(level_field)
+        
+        if missing:
+            results.append(_batch_result(index, 'invalid', f"Missing {', '.join(missing)}"))
+        elif level_field and level not in valid_levels:
+            results.append(_batch_result(index, 'invalid', f"Invalid {level_field}. Must be one of: {', '.join(valid_levels)}"))
+        elif key in pending:
+            results.append(_batch_result(index, 'duplicate', f"Same grant as item {pending[key][0]}"))
+        else:
+            pending[key] = (index, level)
+            results.append(None)
+    return results, pending
 
 
 class AccessService:
     """Service class for access management business logic."""
     
+    # Valid access levels of application access and access types of GitHub access
+    APPLICATION_ACCESS_LEVELS = ['Admin', 'Read', 'Write']
+    GITHUB_ACCESS_TYPES = ['Admin', 'Write', 'Read', 'Maintainer']
+    
+    # Rows fetched and written per chunk of a streamed CSV export
+    EXPORT_BATCH_SIZE = 1000
+    
+    # Most items a batch grant or revoke accepts
+    MAX_BATCH_ITEMS = 5000
+    
+    # Keys per existing-grant lookup query of a batch; three columns per key
+    # stay below the 999 bind parameters of older SQLite versions
+    BATCH_LOOKUP_CHUNK = 300
+    
+    # Listing text filter parameter -> column, per access table
+    APPLICATION_ACCESS_FILTERS = {
+        'user': ApplicationAccess.user_name,
+        'app': ApplicationAccess.application_name
+    }
+    GITHUB_ACCESS_FILTERS = {
+        'user': GitHubAccess.user_name,
+        'org': GitHubAccess.organization_name,
+        'repo': GitHubAccess.repo_name
+    }
+    
+    # Autocomplete field -> column suggested from
+    AUTOCOMPLETE_FIELDS = {
+        'application_user': ApplicationAccess.user_name,
+        'application': ApplicationAccess.application_name,
+        'github_user': GitHubAccess.user_name,
+        'organization': GitHubAccess.organization_name,
+        'repository': GitHubAccess.repo_name
+    }
+    
     # Application Access Management
     
     @staticmethod
@@ -40,7 +167,7 @@ class AccessService:
         """
         try:
             # Validate access level
-            valid_levels = ['Admin', 'Read', 'Write']
+            valid_levels = AccessService.APPLICATION_ACCESS_LEVELS
             if access_level not in valid_levels:
                 return False, f"Invalid access level. Must be one of: {', '.join(valid_levels)}", None
             
@@ -123,7 +250,7 @@ class AccessService:
                 return False, "Cannot update inactive access record"
             
             if new_access_level:
-                valid_levels = ['Admin', 'Read', 'Write']
+                valid_levels = AccessService.APPLICATION_ACCESS_LEVELS
                 if new_access_level not in valid_levels:
                     return False, f"Invalid access level. Must be one of: {', '.join(valid_levels)}"
                 
@@ -169,7 +296,7 @@ class AccessService:
         """
         try:
             # Validate access type
-            valid_types = ['Admin', 'Write', 'Read', 'Maintainer']
+            valid_types = AccessService.GITHUB_ACCESS_TYPES
             if access_type not in valid_types:
                 return False, f"Invalid access type. Must be one of: {', '.join(valid_types)}", None
             
@@ -253,7 +380,7 @@ class AccessService:
                 return False, "Cannot update inactive access record"
             
             if new_access_type:
-                valid_types = ['Admin', 'Write', 'Read', 'Maintainer']
+                valid_types = AccessService.GITHUB_ACCESS_TYPES
                 if new_access_type not in valid_types:
                     return False, f"Invalid access type. Must be one of: {', '.join(valid_types)}"
                 
@@ -269,6 +396,290 @@ class AccessService:
             db.session.rollback()
             return False, f"Error updating GitHub access: {str(e)}"
     
+    # Batch Grants and Revocations
+    
+    @staticmethod
+    def batch_grant_application_access(
+        items: List[Dict[str, Any]],
+        remarks: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Grant application access for many users and applications in one transaction.
+        
+        Args:
+            items: Dictionaries with 'username', 'application_name' and 'access_level'
+            remarks: Optional remarks for granted and updated records
+            
+        Returns:
+            Tuple of (success, message, results), see _batch_grant()
+        """
+        return AccessService._batch_grant(
+            ApplicationAccess, _APPLICATION_KEYS, 'access_level', AccessService.APPLICATION_ACCESS_LEVELS,
+            items, remarks
+        )
+    
+    @staticmethod
+    def batch_revoke_application_access(
+        items: List[Dict[str, Any]],
+        remarks: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Revoke application access of many users and applications in one transaction.
+        
+        Args:
+            items: Dictionaries with 'username' and 'application_name'
+            remarks: Optional reason for revocation
+            
+        Returns:
+            Tuple of (success, message, results), see _batch_revoke()
+        """
+        return AccessService._batch_revoke(ApplicationAccess, _APPLICATION_KEYS, items, remarks)
+    
+    @staticmethod
+    def batch_grant_github_access(
+        items: List[Dict[str, Any]],
+        remarks: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Grant GitHub access for many users and repositories in one transaction.
+        
+        Args:
+            items: Dictionaries with 'username', 'organization', 'repo_name' and 'access_type'
+            remarks: Optional remarks for granted and updated records
+            
+        Returns:
+            Tuple of (success, message, results), see _batch_grant()
+        """
+        return AccessService._batch_grant(
+            GitHubAccess, _GITHUB_KEYS, 'access_type', AccessService.GITHUB_ACCESS_TYPES, items, remarks
+        )
+    
+    @staticmethod
+    def batch_revoke_github_access(
+        items: List[Dict[str, Any]],
+        remarks: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Revoke GitHub access of many users and repositories in one transaction.
+        
+        Args:
+            items: Dictionaries with 'username', 'organization' and 'repo_name'
+            remarks: Optional reason for revocation
+            
+        Returns:
+            Tuple of (success, message, results), see _batch_revoke()
+        """
+        return AccessService._batch_revoke(GitHubAccess, _GITHUB_KEYS, items, remarks)
+    
+    @staticmethod
+    def _batch_grant(model: Any, keys: Dict[str, str], level_field: str, valid_levels: List[str],
+                     items: List[Dict[str, Any]],
+                     remarks: Optional[str]) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Grant access for a batch of items.
+        
+        Active grants of all items are read with one set-based query per
+        BATCH_LOOKUP_CHUNK items. Items without an active grant are
+        inserted, active grants at another level are updated and all
+        changes are committed together.
+        
+        Args:
+            model: ApplicationAccess or GitHubAccess
+            keys: Item key -> model attribute identifying a grant
+            level_field: Item key and model attribute of the access level
+            valid_levels: Valid access levels
+            items: Items to grant
+            remarks: Optional remarks for granted and updated records
+            
+        Returns:
+            Tuple of (success, message, results) where results holds one
+            dictionary per item, in order, with its 'status' (granted,
+            updated, unchanged, duplicate or invalid), a 'message' and the
+            record 'id'
+        """
+        if len(items) > AccessService.MAX_BATCH_ITEMS:
+            return False, f"At most {AccessService.MAX_BATCH_ITEMS} items can be processed at once", None
+        
+        results, pending = _validate_batch(items, keys, level_field, valid_levels)
+        
+        try:
+            existing = AccessService._active_grants(model, list(keys.values()), list(pending))
+            granted = []
+            for key, (index, level) in pending.items():
+                user, target = key[0], '/'.join(key[1:])
+                records = existing.get(key)
+                if not records:
+                    access = model(**dict(zip(keys.values(), key)), assign_date=date.today(),
+                                   status='active', remarks=remarks or None)
+                    setattr(access, level_field, level)
+                    granted.append((index, access))
+                    continue
+                
+                access = records[0]
+                old_level = getattr(access, level_field)
+                if old_level == level:
+                    results[index] = _batch_result(index, 'unchanged', f"{user} already has {level} access to {target}", access)
+                    continue
+                
+                setattr(access, level_field, level)
+                if remarks:
+                    access.remarks = remarks
+                access.updated_at = datetime.utcnow()
+                results[index] = _batch_result(
+                    index, 'updated', f"Updated access to {target} from {old_level} to {level} for {user}", access
+                )
+            
+            db.session.add_all([access for index, access in granted])
+            # Flush before committing so the new ids are read without reloading every record
+            db.session.flush()
+            for index, access in granted:
+                target = '/'.join(getattr(access, attribute) for attribute in list(keys.values())[1:])
+                results[index] = _batch_result(
+                    index, 'granted', f"Granted {getattr(access, level_field)} access to {target} for {access.user_name}", access
+                )
+            db.session.commit()
+            
+            return True, _batch_summary(results), results
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error granting access: {str(e)}", None
+    
+    @staticmethod
+    def _batch_revoke(model: Any, keys: Dict[str, str], items: List[Dict[str, Any]],
+                      remarks: Optional[str]) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Revoke the active grants of a batch of items in one transaction.
+        
+        Args:
+            model: ApplicationAccess or GitHubAccess
+            keys: Item key -> model attribute identifying a grant
+            items: Items to revoke
+            remarks: Optional reason for revocation
+            
+        Returns:
+            Tuple of (success, message, results) where results holds one
+            dictionary per item, in order, with its 'status' (revoked,
+            not_found, duplicate or invalid), a 'message' and the revoked
+            record 'id'
+        """
+        if len(items) > AccessService.MAX_BATCH_ITEMS:
+            return False, f"At most {AccessService.MAX_BATCH_ITEMS} items can be processed at once", None
+        
+        results, pending = _validate_batch(items, keys)
+        
+        try:
+            existing = AccessService._active_grants(model, list(keys.values()), list(pending))
+            for key, (index, level) in pending.items():
+                user, target = key[0], '/'.join(key[1:])
+                records = existing.get(key)
+                if not records:
+                    results[index] = _batch_result(index, 'not_found', f"{user} has no active access to {target}")
+                    continue
+                
+                for access in records:
+                    access.revoke_access(remarks)
+                results[index] = _batch_result(index, 'revoked', f"Revoked access to {target} for {user}", records[0])
+            
+            db.session.commit()
+            
+            return True, _batch_summary(results), results
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error revoking access: {str(e)}", None
+    
+    @staticmethod
+    def _active_grants(model: Any, attributes: List[str], keys: List[tuple]) -> Dict[tuple, List[Any]]:
+        """Active records per grant key, read with one query per BATCH_LOOKUP_CHUNK keys."""
+        key_columns = tuple_(*[getattr(model, attribute) for attribute in attributes])
+        found: Dict[tuple, List[Any]] = {}
+        for start in range(0, len(keys), AccessService.BATCH_LOOKUP_CHUNK):
+            chunk = keys[start:start + AccessService.BATCH_LOOKUP_CHUNK]
+            query = model.query.filter(model.status == 'active', key_columns.in_(chunk)).order_by(model.id)
+            for record in query:
+                found.setdefault(tuple(getattr(record, attribute) for attribute in attributes), []).append(record)
+        return found
+    
+    # Listings
+    
+    @staticmethod
+    def application_access_query(filters: Dict[str, str], status: str = '', match: str = 'contains'):
+        """
+        Build an unordered query of application access records for the listing.
+        
+        Args:
+            filters: Filter name -> search value (see APPLICATION_ACCESS_FILTERS)
+            status: Exact status to filter by, if any
+            match: How the text filters match (see MATCH_MODES)
+            
+        Returns:
+            SQLAlchemy query, to be ordered by (created_at, id) for keyset pagination
+            
+        Raises:
+            ValueError: If the match mode is unknown
+        """
+        return AccessService._listing_query(
+            ApplicationAccess, AccessService.APPLICATION_ACCESS_FILTERS, filters, status, match
+        )
+    
+    @staticmethod
+    def github_access_query(filters: Dict[str, str], status: str = '', match: str = 'contains'):
+        """
+        Build an unordered query of GitHub access records for the listing.
+        
+        Args:
+            filters: Filter name -> search value (see GITHUB_ACCESS_FILTERS)
+            status: Exact status to filter by, if any
+            match: How the text filters match (see MATCH_MODES)
+            
+        Returns:
+            SQLAlchemy query, to be ordered by (created_at, id) for keyset pagination
+            
+        Raises:
+            ValueError: If the match mode is unknown
+        """
+        return AccessService._listing_query(
+            GitHubAccess, AccessService.GITHUB_ACCESS_FILTERS, filters, status, match
+        )
+    
+    @staticmethod
+    def suggest(field: str, prefix: str, limit: int) -> Tuple[bool, str, Optional[List[str]]]:
+        """
+        Suggest values of an access field starting with a prefix.
+        
+        Served from the in-memory autocomplete index (see core.autocomplete),
+        which only reads the database after the table changed.
+        
+        Args:
+            field: Autocomplete field (see AUTOCOMPLETE_FIELDS)
+            prefix: Typed prefix, matched case-insensitively
+            limit: Maximum number of suggestions
+            
+        Returns:
+            Tuple of (success, message, suggestions)
+        """
+        column = AccessService.AUTOCOMPLETE_FIELDS.get(field)
+        if column is None:
+            return False, f"Invalid field. Must be one of: {', '.join(AccessService.AUTOCOMPLETE_FIELDS)}", None
+        
+        try:
+            suggestions = get_autocomplete().suggest(column, prefix, limit)
+            return True, f"{len(suggestions)} suggestions", suggestions
+        except Exception as e:
+            return False, f"Error loading suggestions: {str(e)}", None
+    
+    @staticmethod
+    def _listing_query(model: Any, columns: Dict[str, Any], filters: Dict[str, str], status: str, match: str):
+        """Filter an access table by status and text filters."""
+        query = model.query
+        if status:
+            query = query.filter(model.status == status)
+        for name, value in filters.items():
+            if value:
+                query = query.filter(text_filter(columns[name], value, match))
+        return query
+    
     # Statistics and Reporting
     
     @staticmethod
@@ -276,59 +687,13 @@ class AccessService:
         """
         Get comprehensive access statistics.
         
+        Computed in one aggregation query per access table, see StatisticsService.
+        
         Returns:
             Dictionary containing access statistics
         """
         try:
-            # Application access statistics
-            total_app_access = ApplicationAccess.query.count()
-            active_app_access = ApplicationAccess.query.filter_by(status='active').count()
-            revoked_app_access = ApplicationAccess.query.filter_by(status='revoked').count()
-            
-            # GitHub access statistics
-            total_github_access = GitHubAccess.query.count()
-            active_github_access = GitHubAccess.query.filter_by(status='active').count()
-            revoked_github_access = GitHubAccess.query.filter_by(status='revoked').count()
-            
-            # Access by level/type
-            app_access_levels = db.session.query(
-                ApplicationAccess.access_level,
-                db.func.count(ApplicationAccess.id).label('count')
-            ).filter_by(status='active').group_by(ApplicationAccess.access_level).all()
-            
-            github_access_types = db.session.query(
-                GitHubAccess.access_type,
-                db.func.count(GitHubAccess.id).label('count')
-            ).filter_by(status='active').group_by(GitHubAccess.access_type).all()
-            
-            # Top applications and repositories
-            top_applications = db.session.query(
-                ApplicationAccess.application_name,
-                db.func.count(ApplicationAccess.id).label('count')
-            ).filter_by(status='active').group_by(ApplicationAccess.application_name).order_by(db.func.count(ApplicationAccess.id).desc()).limit(10).all()
-            
-            top_repositories = db.session.query(
-                GitHubAccess.organization_name,
-                GitHubAccess.repo_name,
-                db.func.count(GitHubAccess.id).label('count')
-            ).filter_by(status='active').group_by(GitHubAccess.organization_name, GitHubAccess.repo_name).order_by(db.func.count(GitHubAccess.id).desc()).limit(10).all()
-            
-            return {
-                'application_access': {
-                    'total': total_app_access,
-                    'active': active_app_access,
-                    'revoked': revoked_app_access,
-                    'by_level': {item.access_level: item.count for item in app_access_levels}
-                },
-                'github_access': {
-                    'total': total_github_access,
-                    'active': active_github_access,
-                    'revoked': revoked_github_access,
-                    'by_type': {item.access_type: item.count for item in github_access_types}
-                },
-                'top_applications': [{'name': item.application_name, 'users': item.count} for item in top_applications],
-                'top_repositories': [{'repo': f"{item.organization_name}/{item.repo_name}", 'users': item.count} for item in top_repositories]
-            }
+            return StatisticsService.access_statistics()
             
         except Exception as e:
             return {'error': f"Error getting access statistics: {str(e)}"}
@@ -342,28 +707,7 @@ class AccessService:
             CSV string containing application access data
         """
         try:
-            access_records = ApplicationAccess.query.all()
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            headers = [
-                'User Name', 'Application Name', 'Access Level', 'Assign Date',
-                'Remove Date', 'Status', 'Days Since Assigned', 'Remarks'
-            ]
-            writer.writerow(headers)
-            
-            # Write access data
-            for access in access_records:
-                row = [
-                    access.user_name, access.application_name, access.access_level,
-                    access.assign_date, access.remove_date, access.status,
-                    access.days_since_assigned, access.remarks
-                ]
-                writer.writerow(row)
-            
-            return output.getvalue()
+            return ''.join(AccessService.iter_application_access_csv())
             
         except Exception as e:
             return f"Error exporting application access: {str(e)}"
@@ -377,28 +721,86 @@ class AccessService:
             CSV string containing GitHub access data
         """
         try:
-            access_records = GitHubAccess.query.all()
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            headers = [
-                'User Name', 'Organization', 'Repository', 'Access Type', 'Assign Date',
-                'Remove Date', 'Status', 'Days Since Assigned', 'Remarks'
-            ]
-            writer.writerow(headers)
-            
-            # Write access data
-            for access in access_records:
-                row = [
-                    access.user_name, access.organization_name, access.repo_name,
-                    access.access_type, access.assign_date, access.remove_date,
-                    access.status, access.days_since_assigned, access.remarks
-                ]
-                writer.writerow(row)
-            
-            return output.getvalue()
+            return ''.join(AccessService.iter_github_access_csv())
             
         except Exception as e:
             return f"Error exporting GitHub access: {str(e)}"
+    
+    @staticmethod
+    def iter_application_access_csv(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+        """
+        Export application access records to CSV format as a stream of text chunks.
+        
+        Args:
+            batch_size: Number of rows fetched and yielded per chunk
+            
+        Yields:
+            CSV text chunks; the first chunk is the header line
+        """
+        headers = [
+            'User Name', 'Application Name', 'Access Level', 'Assign Date',
+            'Remove Date', 'Status', 'Days Since Assigned', 'Remarks'
+        ]
+        columns = [
+            ApplicationAccess.user_name, ApplicationAccess.application_name, ApplicationAccess.access_level,
+            ApplicationAccess.assign_date, ApplicationAccess.remove_date, ApplicationAccess.status,
+            ApplicationAccess.remarks
+        ]
+        return AccessService._iter_access_csv(headers, columns, ApplicationAccess.id, batch_size)
+    
+    @staticmethod
+    def iter_github_access_csv(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+        """
+        Export GitHub access records to CSV format as a stream of text chunks.
+        
+        Args:
+            batch_size: Number of rows fetched and yielded per chunk
+            
+        Yields:
+            CSV text chunks; the first chunk is the header line
+        """
+        headers = [
+            'User Name', 'Organization', 'Repository', 'Access Type', 'Assign Date',
+            'Remove Date', 'Status', 'Days Since Assigned', 'Remarks'
+        ]
+        columns = [
+            GitHubAccess.user_name, GitHubAccess.organization_name, GitHubAccess.repo_name,
+            GitHubAccess.access_type, GitHubAccess.assign_date, GitHubAccess.remove_date,
+            GitHubAccess.status, GitHubAccess.remarks
+        ]
+        return AccessService._iter_access_csv(headers, columns, GitHubAccess.id, batch_size)
+    
+    @staticmethod
+    def _iter_access_csv(headers: List[str], columns: List[Any], order_by: Any, batch_size: int) -> Iterator[str]:
+        """
+        Stream access rows as CSV, reading column tuples instead of ORM objects.
+        
+        The columns end with assign_date, remove_date, status and remarks;
+        days since assigned is inserted before remarks, counted to a single
+        date for the whole export.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def drain() -> str:
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+        
+        writer.writerow(headers)
+        yield drain()
+        
+        as_of = date.today()
+        rows = db.session.query(*columns).order_by(order_by).execution_options(stream_results=True).yield_per(batch_size)
+        
+        pending = 0
+        for row in rows:
+            writer.writerow(tuple(row[:-1]) + ((as_of - row[-4]).days, row[-1]))
+            pending += 1
+            if pending == batch_size:
+                yield drain()
+                pending = 0
+        
+        if pending:
+            yield drain()
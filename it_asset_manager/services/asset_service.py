@@ -6,17 +6,28 @@ related to asset management, including CRUD operations, validation, and reportin
 """
 
 from datetime import date, datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import csv
 import io
 
 from ..models.asset import Asset
 from ..core.database import db
+from .statistics_service import StatisticsService
 
 
 class AssetService:
     """Service class for asset management business logic."""
     
+    # API filter parameter -> indexed asset column it matches exactly
+    API_FILTERS = {
+        'type': Asset.asset_type,
+        'category': Asset.asset_category,
+        'status': Asset.status,
+        'assigned_to': Asset.assigned_to,
+        'location': Asset.location,
+        'brand': Asset.brand
+    }
+    
     @staticmethod
     def create_asset(asset_data: Dict[str, Any]) -> Tuple[bool, str, Optional[Asset]]:
         """
@@ -265,91 +276,131 @@ class AssetService:
         """
         Get comprehensive asset statistics.
         
+        Computed in a single aggregation query, see StatisticsService.
+        
         Returns:
             Dictionary containing various asset statistics
         """
         try:
-            total_assets = Asset.query.count()
-            assigned_assets = Asset.query.filter_by(status='assigned').count()
-            unassigned_assets = Asset.query.filter_by(status='unassigned').count()
-            maintenance_assets = Asset.query.filter_by(status='maintenance').count()
-            retired_assets = Asset.query.filter_by(status='retired').count()
-            
-            # Assets by type
-            asset_types = db.session.query(
-                Asset.asset_type,
-                db.func.count(Asset.id).label('count')
-            ).group_by(Asset.asset_type).all()
-            
-            # Assets by ownership
-            ownership_types = db.session.query(
-                Asset.ownership_type,
-                db.func.count(Asset.id).label('count')
-            ).group_by(Asset.ownership_type).all()
-            
-            # Expiring warranties
-            expiring_warranties = len(Asset.find_expiring_warranties(30))
-            
-            return {
-                'total_assets': total_assets,
-                'assigned_assets': assigned_assets,
-                'unassigned_assets': unassigned_assets,
-                'maintenance_assets': maintenance_assets,
-                'retired_assets': retired_assets,
-                'asset_types': {item.asset_type: item.count for item in asset_types},
-                'ownership_types': {item.ownership_type: item.count for item in ownership_types},
-                'expiring_warranties': expiring_warranties
-            }
+            return StatisticsService.asset_statistics()
             
         except Exception as e:
             return {'error': f"Error getting statistics: {str(e)}"}
     
+    # CSV export layout: (header, Asset column) pairs
+    EXPORT_COLUMNS = [
+        ('Asset Tag', Asset.asset_tag), ('Asset Type', Asset.asset_type),
+        ('Category', Asset.asset_category), ('Ownership Type', Asset.ownership_type),
+        ('Brand', Asset.brand), ('Model', Asset.model), ('Serial Number', Asset.serial_number),
+        ('Processor', Asset.processor), ('RAM (GB)', Asset.ram_gb),
+        ('Storage (GB)', Asset.storage_gb), ('Storage Type', Asset.storage_type),
+        ('Port Count', Asset.port_count), ('Network Type', Asset.network_type),
+        ('Screen Size', Asset.screen_size), ('Resolution', Asset.resolution),
+        ('Audio Type', Asset.audio_type), ('Connector Type', Asset.connector_type),
+        ('Assigned To', Asset.assigned_to), ('Assign Date', Asset.assign_date),
+        ('Location', Asset.location), ('Status', Asset.status), ('Condition', Asset.condition),
+        ('Purchase Date', Asset.purchase_date), ('Purchase Cost', Asset.purchase_cost),
+        ('Warranty Expiry', Asset.warranty_expiry), ('Vendor Name', Asset.vendor_name),
+        ('Rental Start', Asset.rental_start_date), ('Rental End', Asset.rental_end_date),
+        ('Monthly Cost', Asset.rental_cost_monthly), ('Remarks', Asset.remarks)
+    ]
+    
+    EXPORT_BATCH_SIZE = 1000
+    
+    @staticmethod
+    def iter_assets_csv(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+        """
+        Export all assets to CSV format as a stream of text chunks.
+        
+        The header is yielded before the query runs so clients get the first
+        byte immediately. Rows are read as plain column tuples in batches
+        using a server-side cursor where the database supports one, so
+        memory use does not grow with the number of assets.
+        
+        Args:
+            batch_size: Number of rows fetched and yielded per chunk
+            
+        Yields:
+            CSV text chunks; the first chunk is the header line
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def drain() -> str:
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+        
+        writer.writerow([header for header, column in AssetService.EXPORT_COLUMNS])
+        yield drain()
+        
+        rows = db.session.query(
+            *[column for header, column in AssetService.EXPORT_COLUMNS]
+        ).order_by(Asset.id).execution_options(stream_results=True).yield_per(batch_size)
+        
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending == batch_size:
+                yield drain()
+                pending = 0
+        
+        if pending:
+            yield drain()
+    
     @staticmethod
     def export_assets_csv() -> str:
         """
         Export all assets to CSV format.
         
+        Prefer iter_assets_csv() for large tables; this builds the whole
+        export in memory.
+        
         Returns:
             CSV string containing all asset data
         """
         try:
-            assets = Asset.query.all()
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            headers = [
-                'Asset Tag', 'Asset Type', 'Category', 'Ownership Type', 'Brand', 'Model',
-                'Serial Number', 'Processor', 'RAM (GB)', 'Storage (GB)', 'Storage Type',
-                'Port Count', 'Network Type', 'Screen Size', 'Resolution', 'Audio Type',
-                'Connector Type', 'Assigned To', 'Assign Date', 'Location', 'Status',
-                'Condition', 'Purchase Date', 'Purchase Cost', 'Warranty Expiry',
-                'Vendor Name', 'Rental Start', 'Rental End', 'Monthly Cost', 'Remarks'
-            ]
-            writer.writerow(headers)
-            
-            # Write asset data
-            for asset in assets:
-                row = [
-                    asset.asset_tag, asset.asset_type, asset.asset_category,
-                    asset.ownership_type, asset.brand, asset.model, asset.serial_number,
-                    asset.processor, asset.ram_gb, asset.storage_gb, asset.storage_type,
-                    asset.port_count, asset.network_type, asset.screen_size,
-                    asset.resolution, asset.audio_type, asset.connector_type,
-                    asset.assigned_to, asset.assign_date, asset.location,
-                    asset.status, asset.condition, asset.purchase_date,
-                    asset.purchase_cost, asset.warranty_expiry, asset.vendor_name,
-                    asset.rental_start_date, asset.rental_end_date,
-                    asset.rental_cost_monthly, asset.remarks
-                ]
-                writer.writerow(row)
-            
-            return output.getvalue()
+            return ''.join(AssetService.iter_assets_csv())
             
         except Exception as e:
             return f"Error exporting assets: {str(e)}"
     
+    @staticmethod
+    def asset_rows_query(columns: List[Any], filters: Dict[str, List[str]]):
+        """
+        Build a query selecting columns of the assets matching filters.
+        
+        Args:
+            columns: Asset columns to select
+            filters: API filter name -> accepted values (see API_FILTERS)
+            
+        Returns:
+            Unordered SQLAlchemy query of column tuples
+        """
+        query = db.session.query(*columns)
+        for name, values in filters.items():
+            column = AssetService.API_FILTERS[name]
+            query = query.filter(column == values[0] if len(values) == 1 else column.in_(values))
+        return query
+    
+    @staticmethod
+    def find_asset_rows_by_tags(columns: List[Any], tags: List[str]) -> List[Any]:
+        """
+        Select columns of the assets with the given tags in one query.
+        
+        Args:
+            columns: Asset columns to select; must include Asset.asset_tag
+            tags: Asset tags
+            
+        Returns:
+            Rows in the order of tags; unknown tags are skipped
+        """
+        rows = db.session.query(*columns).filter(Asset.asset_tag.in_(tags)).all()
+        by_tag = {row.asset_tag: row for row in rows}
+        return [by_tag[tag] for tag in tags if tag in by_tag]
+    
     @staticmethod
     def _determine_category(asset_type: str) -> str:
         """
@@ -0,0 +1,449 @@
+"""
+Streaming CSV import pipeline.
+
+This module provides the parse -> validate -> import pipeline shared by the
+asset, application access and GitHub access CSV services. The uploaded file
+is decoded incrementally, rows are validated lazily, and valid rows are
+handed to the importer in fixed-size chunks, so memory use is bounded by
+the chunk size rather than the file size. Validation can optionally be
+spread over a process pool (CSV_VALIDATION_WORKERS) for very large files.
+
+The whole import runs in one transaction. As with the previous
+read-everything implementation, a file containing any invalid row imports
+nothing: once a validation error is seen the pipeline stops writing, keeps
+validating to report further errors, and rolls back at the end.
+"""
+
+import codecs
+import csv
+import io
+import multiprocessing
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import bindparam, func, insert, select, update
+
+from ..core.database import db
+
+# Valid rows handed to the importer at a time
+DEFAULT_CHUNK_SIZE = 1000
+
+# Error messages kept per import; further errors are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Composite keys looked up per query by import_keyed_rows(); keeps the bind
+# parameters below the 999 of older SQLite versions
+KEY_LOOKUP_CHUNK = 300
+
+# Raw rows sent to a validation worker at a time
+VALIDATION_BATCH_SIZE = 2000
+
+# Batches in flight per validation worker; bounds memory like the import chunks
+VALIDATION_BATCHES_PER_WORKER = 2
+
+# (row_number, cleaned_row, error_message); exactly one of the last two is set
+ParsedRow = Tuple[Optional[int], Optional[Dict[str, Any]], Optional[str]]
+
+ProgressCallback = Callable[['ImportSummary'], None]
+
+RowValidator = Callable[[Dict[str, str], int], Dict[str, Any]]
+
+
+class ImportSummary:
+    """
+    Outcome of a streamed CSV import.
+    
+    Attributes:
+        rows_processed: Data rows read from the file, valid or not
+        valid_rows: Rows that passed validation
+        created: Records created
+        updated: Records updated
+        parse_errors: Validation error messages (capped)
+        import_errors: Errors reported while writing to the database
+    """
+    
+    def __init__(self) -> None:
+        self.rows_processed = 0
+        self.valid_rows = 0
+        self.created = 0
+        self.updated = 0
+        self.parse_errors: List[str] = []
+        self.import_errors: List[str] = []
+        self._suppressed_errors = 0
+    
+    @property
+    def imported(self) -> bool:
+        """Check if any records were written."""
+        return self.created > 0 or self.updated > 0
+    
+    def add_parse_error(self, message: str) -> None:
+        """Record a validation error, keeping at most MAX_REPORTED_ERRORS messages."""
+        if len(self.parse_errors) < MAX_REPORTED_ERRORS:
+            self.parse_errors.append(message)
+        else:
+            self._suppressed_errors += 1
+    
+    def finish(self) -> None:
+        """Append a note about errors that were counted but not kept."""
+        if self._suppressed_errors:
+            self.parse_errors.append(f"... and {self._suppressed_errors} more errors")
+            self._suppressed_errors = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the summary to a dictionary."""
+        return {
+            'rows_processed': self.rows_processed,
+            'valid_rows': self.valid_rows,
+            'created': self.created,
+            'updated': self.updated,
+            'parse_errors': self.parse_errors,
+            'import_errors': self.import_errors
+        }
+
+
+def open_text_stream(stream: Any, encoding: str = 'utf-8') -> Iterable[str]:
+    """
+    Wrap a binary upload stream for incremental, line-by-line decoding.
+    
+    Args:
+        stream: Binary file object, e.g. FileStorage.stream
+        encoding: Text encoding of the upload
+        
+    Returns:
+        Text file object suitable for csv.reader
+    """
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    
+    # SpooledTemporaryFile lacks the io.IOBase interface before Python 3.11
+    if all(hasattr(stream, name) for name in ('readable', 'readinto')):
+        return io.TextIOWrapper(stream, encoding=encoding, newline='')
+    return codecs.getreader(encoding)(stream)
+
+
+def validation_workers() -> int:
+    """
+    Number of processes to validate CSV rows with.
+    
+    Read from CSV_VALIDATION_WORKERS: 1 (the default) validates in the
+    importing thread, 0 uses one process per CPU.
+    
+    Returns:
+        Worker count, at least 1
+    """
+    workers = int(current_app.config.get('CSV_VALIDATION_WORKERS', 1))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def iter_validated_rows(text_stream: Iterable[str], validate_headers: Callable[[List[str]], bool],
+                        validate_row: RowValidator, workers: int = 1) -> Iterator[ParsedRow]:
+    """
+    Parse and validate CSV rows lazily.
+    
+    Args:
+        text_stream: Text file object or iterable of lines
+        validate_headers: Returns True if the header row is acceptable
+        validate_row: Cleans a row; raises ValueError for invalid rows.
+            Must be picklable (e.g. a service classmethod) if workers > 1.
+        workers: Validate rows in this many processes when greater than 1
+        
+    Yields:
+        (row_number, cleaned_row, None) for valid rows and
+        (row_number, None, error_message) for invalid ones, in file order.
+        File-level problems are yielded with a row number of None and end
+        the stream.
+    """
+    try:
+        csv_reader = csv.DictReader(text_stream)
+        
+        # Validate headers
+        if not validate_headers(csv_reader.fieldnames):
+            yield None, None, "Invalid CSV headers. Please use the sample CSV template."
+            return
+        
+        if workers > 1:
+            yield from _validate_in_processes(csv_reader, validate_row, workers)
+            return
+        
+        # Process each row
+        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (after header)
+            try:
+                validated_row = validate_row(row, row_num)
+                if validated_row:
+                    yield row_num, validated_row, None
+            except ValueError as e:
+                yield row_num, None, f"Row {row_num}: {str(e)}"
+    
+    except Exception as e:
+        yield None, None, f"Error parsing CSV file: {str(e)}"
+
+
+def _row_dict(fieldnames: List[str], values: List[str]) -> Dict[str, Any]:
+    """Build a row dictionary the way csv.DictReader does, with its default restkey and restval."""
+    row = dict(zip(fieldnames, values))
+    if len(values) > len(fieldnames):
+        row[None] = values[len(fieldnames):]
+    else:
+        for key in fieldnames[len(values):]:
+            row[key] = None
+    return row
+
+
+def _validate_batch(validate_row: RowValidator, fieldnames: List[str],
+                    batch: List[Tuple[int, List[str]]]) -> List[ParsedRow]:
+    """
+    Validate a batch of numbered raw rows in a worker process.
+    
+    Mirrors the serial loop of iter_validated_rows() exactly, including
+    stopping at the first unexpected exception, which is reported the way
+    the parent reports file-level errors.
+    """
+    results = []
+    for row_num, values in batch:
+        try:
+            validated_row = validate_row(_row_dict(fieldnames, values), row_num)
+            if validated_row:
+                results.append((row_num, validated_row, None))
+        except ValueError as e:
+            results.append((row_num, None, f"Row {row_num}: {str(e)}"))
+        except Exception as e:
+            results.append((None, None, f"Error parsing CSV file: {str(e)}"))
+            break
+    return results
+
+
+def _validate_in_processes(csv_reader: csv.DictReader, validate_row: RowValidator,
+                           workers: int) -> Iterator[ParsedRow]:
+    """
+    Validate CSV rows on a process pool, yielding results in file order.
+    
+    The parent only tokenizes the file; workers build the row dictionaries
+    and validate them. Rows are sent in batches with a bounded number of
+    batches in flight, so the file is still never held in memory as a whole.
+    """
+    fieldnames = csv_reader.fieldnames
+    # Skip blank lines like DictReader, so row numbers match the serial loop
+    raw_rows = (values for values in csv_reader.reader if values != [])
+    numbered_rows = enumerate(raw_rows, start=2)
+    
+    # spawn: the importing process may run other threads (job runner, server)
+    context = multiprocessing.get_context('spawn')
+    max_pending = workers * VALIDATION_BATCHES_PER_WORKER
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        batches = chunked(numbered_rows, VALIDATION_BATCH_SIZE)
+        pending = deque()
+        exhausted = False
+        
+        while pending or not exhausted:
+            # Keep the pool busy without reading ahead more than max_pending batches
+            while not exhausted and len(pending) < max_pending:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                else:
+                    pending.append(executor.submit(_validate_batch, validate_row, fieldnames, batch))
+            
+            if pending:
+                for result in pending.popleft().result():
+                    yield result
+                    if result[0] is None:
+                        # File-level error ends the stream, as in the serial loop
+                        for future in pending:
+                            future.cancel()
+                        return
+
+
+def collect_rows(parsed_rows: Iterable[ParsedRow]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Gather parsed rows into the (valid_rows, error_messages) form of parse_csv_file.
+    
+    Args:
+        parsed_rows: Output of iter_validated_rows()
+        
+    Returns:
+        Tuple of (valid_rows, error_messages)
+    """
+    valid_rows = []
+    errors = []
+    for row_num, row, error in parsed_rows:
+        if error:
+            errors.append(error)
+        else:
+            valid_rows.append(row)
+    return valid_rows, errors
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split an iterable into lists of at most size items.
+    
+    Args:
+        iterable: Items to split
+        size: Maximum chunk length
+        
+    Yields:
+        Lists of consecutive items
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_keyed_rows(model: Any, key_fields: Sequence[str], fields: Sequence[str],
+                      rows: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+    """
+    Write a chunk of validated rows identified by a composite key without committing.
+    
+    A row updates the oldest record with its key, keeping stored values
+    for empty cells, or creates a record. Keys are not unique in the table
+    (revoked access stays as history next to later grants), so the ids of
+    existing keys are preloaded with one query per KEY_LOOKUP_CHUNK keys
+    instead of relying on ON CONFLICT. Rows with the same key are merged in
+    memory, later cells winning, and the chunk is written with one
+    executemany UPDATE by id and one executemany INSERT.
+    
+    Args:
+        model: Model class of the records
+        key_fields: Columns identifying a record, e.g. user and application
+        fields: Columns a row can set, including the key columns
+        rows: Validated rows of one chunk
+        
+    Returns:
+        Tuple of (created_count, updated_count, error_messages); as with
+        row-by-row imports, a row for a key created earlier in the chunk
+        counts as an update
+    """
+    table = model.__table__
+    key_columns = [table.c[field] for field in key_fields]
+    keys = list(OrderedDict.fromkeys(tuple(row[field] for field in key_fields) for row in rows))
+    
+    # One IN list per key column can seek the composite key index, which
+    # SQLite does not do for a row value IN list; the superset of keys
+    # this matches is narrowed to the wanted keys here
+    existing = {}
+    for lookup in chunked(keys, KEY_LOOKUP_CHUNK):
+        wanted = set(lookup)
+        statement = select(table.c.id, *key_columns).where(
+            *(column.in_({key[position] for key in lookup}) for position, column in enumerate(key_columns))
+        ).order_by(table.c.id)
+        for record_id, *key in db.session.execute(statement):
+            key = tuple(key)
+            if key in wanted:
+                existing.setdefault(key, record_id)
+    
+    creates: Dict[tuple, Dict[str, Any]] = OrderedDict()
+    updates: Dict[tuple, Dict[str, Any]] = OrderedDict()
+    created_count = 0
+    updated_count = 0
+    for row in rows:
+        key = tuple(row[field] for field in key_fields)
+        values = {field: row[field] for field in fields if row.get(field) is not None}
+        if key in existing:
+            updates.setdefault(key, {}).update(values)
+            updated_count += 1
+        elif key in creates:
+            creates[key].update(values)
+            updated_count += 1
+        else:
+            creates[key] = values
+            created_count += 1
+    
+    now = datetime.utcnow()
+    if updates:
+        # Every parameter set needs the same keys; None keeps the stored value.
+        # Bind names must differ from the column names being set.
+        columns = [field for field in fields if field not in key_fields]
+        assignments = {column: func.coalesce(bindparam(f'new_{column}'), table.c[column]) for column in columns}
+        assignments['updated_at'] = now
+        statement = update(table).where(table.c.id == bindparam('record_id')).values(assignments)
+        db.session.execute(statement, [
+            dict({f'new_{column}': values.get(column) for column in columns}, record_id=existing[key])
+            for key, values in updates.items()
+        ])
+    
+    if creates:
+        db.session.execute(insert(table), [
+            dict({field: values.get(field) for field in fields}, created_at=now, updated_at=now)
+            for values in creates.values()
+        ])
+    
+    return created_count, updated_count, []
+
+
+def run_import(parsed_rows: Iterable[ParsedRow],
+               import_chunk: Callable[[List[Dict[str, Any]]], Tuple[int, int, List[str]]],
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               progress: Optional[ProgressCallback] = None) -> ImportSummary:
+    """
+    Feed validated rows to an importer in chunks within one transaction.
+    
+    Args:
+        parsed_rows: Output of iter_validated_rows()
+        import_chunk: Writes a list of valid rows without committing and
+            returns (created_count, updated_count, error_messages)
+        chunk_size: Number of valid rows per importer call
+        progress: Optional callable invoked with the running summary every
+            chunk_size rows read
+        
+    Returns:
+        ImportSummary; nothing is committed if any row failed validation
+    """
+    summary = ImportSummary()
+    pending = []
+    
+    def flush() -> None:
+        created, updated, errors = import_chunk(pending)
+        summary.created += created
+        summary.updated += updated
+        summary.import_errors.extend(errors)
+        pending.clear()
+    
+    try:
+        for row_num, row, error in parsed_rows:
+            if row_num is not None:
+                summary.rows_processed += 1
+                if progress and summary.rows_processed % chunk_size == 0:
+                    progress(summary)
+            
+            if error:
+                summary.add_parse_error(error)
+                pending.clear()
+                continue
+            
+            summary.valid_rows += 1
+            if summary.parse_errors:
+                # The import will be rolled back; only keep validating
+                continue
+            
+            pending.append(row)
+            if len(pending) >= chunk_size:
+                flush()
+        
+        if pending and not summary.parse_errors:
+            flush()
+        
+        if summary.parse_errors:
+            db.session.rollback()
+            summary.created = summary.updated = 0
+        else:
+            # Commit all changes
+            db.session.commit()
+    
+    except Exception as e:
+        db.session.rollback()
+        summary.created = summary.updated = 0
+        summary.import_errors.append(f"Database error during import: {str(e)}")
+    
+    summary.finish()
+    return summary
@@ -8,16 +8,36 @@ including sample file generation and bulk data upload.
 import csv
 import io
 from datetime import datetime, date
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator
 from flask import current_app
+from sqlalchemy import or_, func
 
 from ..models.asset import Asset
 from ..core.database import db
+from ..core.cache import mark_changed
+from ..utils.dates import DateParser
+from .csv_import import (
+    ImportSummary, ParsedRow, ProgressCallback,
+    chunked, collect_rows, iter_validated_rows, open_text_stream, run_import, validation_workers
+)
 
 
 class CSVService:
     """Service for handling CSV operations for assets."""
     
+    # Shared by imports; sniffs the format of each date column
+    DATE_PARSER = DateParser()
+    
+    # Rows written per set-based statement during bulk import
+    IMPORT_CHUNK_SIZE = 1000
+    
+    # Scalar Asset column defaults, applied to rows created by bulk import
+    IMPORT_DEFAULTS = {
+        column.key: column.default.arg
+        for column in Asset.__table__.columns
+        if column.default is not None and column.default.is_scalar
+    }
+    
     # Define CSV headers and their corresponding model fields
     CSV_HEADERS = [
         'asset_tag',
@@ -184,31 +204,38 @@ class CSVService:
         Returns:
             Tuple of (valid_rows, error_messages)
         """
-        valid_rows = []
-        errors = []
+        return collect_rows(cls.iter_csv_rows(io.StringIO(file_content)))
         
-        try:
-            # Parse CSV content
-            csv_reader = csv.DictReader(io.StringIO(file_content))
+    @classmethod
+    def iter_csv_rows(cls, text_stream: Iterable[str], workers: int = 1) -> Iterator[ParsedRow]:
+        """
+        Parse and validate CSV rows lazily.
             
-            # Validate headers
-            if not cls._validate_headers(csv_reader.fieldnames):
-                errors.append("Invalid CSV headers. Please use the sample CSV template.")
-                return valid_rows, errors
+        Args:
+            text_stream: Text file object or iterable of CSV lines
+            workers: Number of processes to validate rows in
             
-            # Process each row
-            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (after header)
-                try:
-                    validated_row = cls._validate_and_clean_row(row, row_num)
-                    if validated_row:
-                        valid_rows.append(validated_row)
-                except ValueError as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
+        Yields:
+            (row_number, cleaned_row, error_message) tuples, see iter_validated_rows()
+        """
+        return iter_validated_rows(text_stream, cls._validate_headers, cls._validate_and_clean_row, workers)
                     
-        except Exception as e:
-            errors.append(f"Error parsing CSV file: {str(e)}")
+    @classmethod
+    def import_csv_stream(cls, stream: Any, chunk_size: Optional[int] = None,
+                          progress: Optional[ProgressCallback] = None) -> ImportSummary:
+        """
+        Parse, validate and import an uploaded CSV file without reading it into memory.
         
-        return valid_rows, errors
+        Args:
+            stream: Binary file object of the upload
+            chunk_size: Valid rows imported per chunk (default IMPORT_CHUNK_SIZE)
+            progress: Optional callable receiving the running ImportSummary
+            
+        Returns:
+            ImportSummary; nothing is imported if any row is invalid
+        """
+        parsed_rows = cls.iter_csv_rows(open_text_stream(stream), validation_workers())
+        return run_import(parsed_rows, cls._import_chunk, chunk_size or cls.IMPORT_CHUNK_SIZE, progress)
     
     @classmethod
     def bulk_import_assets(cls, validated_rows: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
@@ -226,29 +253,11 @@ class CSVService:
         errors = []
         
         try:
-            for row in validated_rows:
-                try:
-                    # Check if asset already exists
-                    existing_asset = Asset.find_by_tag(row['asset_tag'])
-                    
-                    # Check for duplicate serial number
-                    existing_serial = Asset.find_by_serial(row['serial_number'])
-                    if existing_serial and (not existing_asset or existing_serial.asset_tag != row['asset_tag']):
-                        errors.append(f"Serial number {row['serial_number']} already exists for asset {existing_serial.asset_tag}")
-                        continue
-                    
-                    if existing_asset:
-                        # Update existing asset
-                        cls._update_asset_from_row(existing_asset, row)
-                        updated_count += 1
-                    else:
-                        # Create new asset
-                        new_asset = cls._create_asset_from_row(row)
-                        db.session.add(new_asset)
-                        created_count += 1
-                        
-                except Exception as e:
-                    errors.append(f"Error processing asset {row.get('asset_tag', 'Unknown')}: {str(e)}")
+            for chunk in chunked(validated_rows, cls.IMPORT_CHUNK_SIZE):
+                created, updated, chunk_errors = cls._import_chunk(chunk)
+                created_count += created
+                updated_count += updated
+                errors.extend(chunk_errors)
             
             # Commit all changes
             db.session.commit()
@@ -259,6 +268,177 @@ class CSVService:
         
         return created_count, updated_count, errors
     
+    @classmethod
+    def _import_chunk(cls, rows: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+        """
+        Write a chunk of validated rows without committing.
+        
+        The existing assets with the chunk's tags or serial numbers are
+        loaded in one query, rows are classified as creates or updates in
+        memory, and the chunk is written with one set-based statement. Rows
+        keep their sequential semantics: a later row sees the tags and
+        serial numbers created or changed by earlier rows. A row updating
+        an existing asset already updated earlier in the chunk starts a new
+        statement, as merging it into the earlier update could take a
+        serial number before the rows in between release it.
+        
+        Args:
+            rows: Validated asset dictionaries
+            
+        Returns:
+            Tuple of (created_count, updated_count, error_messages)
+        """
+        errors = []
+        created_count = 0
+        updated_count = 0
+        while rows:
+            creates, updates, created, updated, planned = cls._plan_import_chunk(rows, errors)
+            cls._write_import_chunk(creates, updates)
+            created_count += created
+            updated_count += updated
+            rows = rows[planned:]
+        return created_count, updated_count, errors
+    
+    @classmethod
+    def _plan_import_chunk(cls, rows: List[Dict[str, Any]],
+                           errors: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]], int, int, int]:
+        """
+        Classify the leading rows of a chunk into asset creates and updates.
+        
+        Planning stops before the first row that updates an existing asset
+        a second time; the remaining rows are planned after this part is
+        written.
+        
+        Args:
+            rows: Validated rows of one chunk
+            errors: List that row-level error messages are appended to
+            
+        Returns:
+            Tuple of (creates, updates, created_count, updated_count,
+            planned_rows); creates and updates map asset tag to the merged
+            column values to write
+        """
+        tags = {row.get('asset_tag') for row in rows}
+        serials = {row.get('serial_number') for row in rows}
+        
+        # One query loads every existing asset the chunk could touch
+        tag_to_id = {}
+        tag_to_serial = {}
+        serial_to_tag = {}
+        existing = db.session.query(Asset.id, Asset.asset_tag, Asset.serial_number).filter(
+            or_(Asset.asset_tag.in_(tags), Asset.serial_number.in_(serials))
+        ).all()
+        for asset_id, tag, serial in existing:
+            tag_to_id[tag] = asset_id
+            tag_to_serial[tag] = serial
+            serial_to_tag[serial] = tag
+        
+        creates = {}
+        updates = {}
+        created_count = 0
+        updated_count = 0
+        now = datetime.utcnow()
+        
+        for position, row in enumerate(rows):
+            if row.get('asset_tag') in updates:
+                return creates, updates, created_count, updated_count, position
+            
+            try:
+                tag = row['asset_tag']
+                serial = row['serial_number']
+                
+                # Check for duplicate serial number
+                serial_owner = serial_to_tag.get(serial)
+                if serial_owner and serial_owner != tag:
+                    errors.append(f"Serial number {serial} already exists for asset {serial_owner}")
+                    continue
+                
+                values = {field: value for field, value in row.items()
+                          if field in cls.CSV_HEADERS and value is not None}
+                values['updated_at'] = now
+                
+                if tag in tag_to_serial:
+                    # Update existing asset, or merge into an asset created earlier in the chunk
+                    target = creates.get(tag)
+                    if target is None:
+                        target = updates[tag] = {'id': tag_to_id[tag]}
+                    target.update(values)
+                    updated_count += 1
+                else:
+                    values.setdefault('created_at', now)
+                    creates[tag] = values
+                    created_count += 1
+                
+                serial_to_tag.pop(tag_to_serial.get(tag), None)
+                serial_to_tag[serial] = tag
+                tag_to_serial[tag] = serial
+                    
+            except Exception as e:
+                errors.append(f"Error processing asset {row.get('asset_tag', 'Unknown')}: {str(e)}")
+        
+        return creates, updates, created_count, updated_count, len(rows)
+    
+    @classmethod
+    def _write_import_chunk(cls, creates: Dict[str, Dict[str, Any]],
+                            updates: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write one chunk of planned creates and updates.
+        
+        SQLite and PostgreSQL get a single INSERT ... ON CONFLICT (asset_tag)
+        DO UPDATE statement in which missing values keep the stored column
+        value; other databases use bulk insert and update mappings. Updates
+        are written before creates so serial numbers released by an update
+        can be reused by a new asset in the same chunk.
+        """
+        dialect = db.engine.dialect.name
+        
+        if dialect not in ('sqlite', 'postgresql'):
+            # Bulk mappings bypass the session hooks that invalidate cached statistics
+            mark_changed(db.session(), Asset.__tablename__)
+            if updates:
+                db.session.bulk_update_mappings(Asset, list(updates.values()))
+            if creates:
+                db.session.bulk_insert_mappings(Asset, [cls._with_defaults(v) for v in creates.values()])
+            return
+        
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        
+        table = Asset.__table__
+        columns = list(cls.CSV_HEADERS) + ['created_at', 'updated_at']
+        
+        # Every parameter set needs the same keys; None keeps the stored value.
+        # created_at satisfies NOT NULL on the proposed row and is not updated.
+        rows = [{column: values.get(column) for column in columns} for values in updates.values()]
+        for row in rows:
+            row['created_at'] = row['updated_at']
+        rows += [{column: values.get(column) for column in columns}
+                 for values in (cls._with_defaults(v) for v in creates.values())]
+        if not rows:
+            return
+        
+        statement = insert(table)
+        assignments = {
+            column: func.coalesce(statement.excluded[column], table.c[column])
+            for column in columns if column not in ('asset_tag', 'created_at', 'updated_at')
+        }
+        assignments['updated_at'] = statement.excluded.updated_at
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.asset_tag],
+            set_=assignments
+        )
+        db.session.execute(statement, rows)
+    
+    @classmethod
+    def _with_defaults(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in scalar column defaults that bulk statements would not apply."""
+        for key, default in cls.IMPORT_DEFAULTS.items():
+            if values.get(key) is None:
+                values[key] = default
+        return values
+    
     @classmethod
     def export_assets_to_csv(cls, assets: List[Asset]) -> io.StringIO:
         """
@@ -335,7 +515,7 @@ class CSVService:
             elif field in ['rental_cost_monthly', 'purchase_cost']:
                 cleaned_row[field] = float(value) if value and cls._is_valid_float(value) else None
             elif field in ['rental_start_date', 'rental_end_date', 'purchase_date', 'warranty_expiry', 'assign_date']:
-                cleaned_row[field] = cls._parse_date(value) if value else None
+                cleaned_row[field] = cls._parse_date(value, field) if value else None
             else:
                 cleaned_row[field] = value if value else None
         
@@ -397,20 +577,9 @@ class CSVService:
             return False
     
     @classmethod
-    def _parse_date(cls, date_str: str) -> Optional[date]:
-        """Parse date string in various formats."""
-        if not date_str:
-            return None
-        
-        date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        
-        raise ValueError(f"Invalid date format: {date_str}. Use YYYY-MM-DD format.")
+    def _parse_date(cls, date_str: str, column: Optional[str] = None) -> Optional[date]:
+        """Parse date string in various formats (see DATE_FORMATS)."""
+        return cls.DATE_PARSER.parse(date_str, column)
     
     @classmethod
     def _get_category_from_type(cls, asset_type: str) -> str:
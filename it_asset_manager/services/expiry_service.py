@@ -0,0 +1,131 @@
+"""
+Warranty and rental expiry service.
+
+This module contains the ExpiryService class that sorts assets whose
+warranty or rental ends within the next 90 days into 7, 30 and 90 day
+buckets. Both end dates are indexed, so each kind is read with one index
+range scan of just the expiring rows. The buckets are computed at most
+once per day per process and reused until assets change (see core.cache);
+`flask expiry digest`, run daily from cron, reports them.
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.asset import Asset
+from ..core.cache import get_stats_cache
+from ..core.database import db
+
+
+class ExpiryService:
+    """Service class for warranty and rental expiry buckets."""
+    
+    # Bucket upper bounds in days; each asset lands in the first bucket that fits
+    BUCKETS = (7, 30, 90)
+    
+    # Kind -> (end date column, ownership types the kind applies to)
+    KINDS = OrderedDict([
+        ('warranty', (Asset.warranty_expiry, None)),
+        ('rental', (Asset.rental_end_date, ('rented', 'leased'))),
+    ])
+    
+    @staticmethod
+    def expiry_buckets() -> Dict[str, Any]:
+        """
+        Get the expiry buckets, recomputing them daily or after assets changed.
+        
+        Returns:
+            Dictionary in the format of compute_buckets()
+        """
+        return get_stats_cache().get_or_compute(
+            'expiry_buckets',
+            [Asset.__tablename__],
+            ExpiryService.compute_buckets,
+            extra_key=date.today()
+        )
+    
+    @staticmethod
+    def compute_buckets(today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Sort expiring assets into buckets, one indexed range query per kind.
+        
+        Args:
+            today: Day to count from, defaults to today
+            
+        Returns:
+            Dictionary with the 'date' counted from and, per kind, an ordered
+            mapping of bucket days -> list of entries ordered by end date
+        """
+        today = today or date.today()
+        horizon = today + timedelta(days=ExpiryService.BUCKETS[-1])
+        
+        buckets: Dict[str, Any] = {'date': today.isoformat()}
+        for kind, (column, ownership_types) in ExpiryService.KINDS.items():
+            query = db.session.query(
+                Asset.id, Asset.asset_tag, Asset.asset_type, Asset.assigned_to, Asset.location, column
+            ).filter(column.between(today, horizon))
+            if ownership_types:
+                query = query.filter(Asset.ownership_type.in_(ownership_types))
+            
+            kind_buckets = OrderedDict((days, []) for days in ExpiryService.BUCKETS)
+            for asset_id, asset_tag, asset_type, assigned_to, location, expires_on in query.order_by(column, Asset.id):
+                days_remaining = (expires_on - today).days
+                bucket = next(days for days in ExpiryService.BUCKETS if days_remaining <= days)
+                kind_buckets[bucket].append({
+                    'id': asset_id,
+                    'asset_tag': asset_tag,
+                    'asset_type': asset_type,
+                    'assigned_to': assigned_to,
+                    'location': location,
+                    'expires_on': expires_on.isoformat(),
+                    'days_remaining': days_remaining
+                })
+            buckets[kind] = kind_buckets
+        
+        return buckets
+    
+    @staticmethod
+    def get_expiring(kind: str = 'warranty', within: int = 30) -> Tuple[bool, str, Optional[List[Dict[str, Any]]]]:
+        """
+        Get assets whose warranty or rental ends within a bucket.
+        
+        Args:
+            kind: 'warranty' or 'rental'
+            within: Bucket size in days (see BUCKETS)
+            
+        Returns:
+            Tuple of (success, message, entries ordered by end date)
+        """
+        if kind not in ExpiryService.KINDS:
+            return False, f"Invalid kind. Must be one of: {', '.join(ExpiryService.KINDS)}", None
+        if within not in ExpiryService.BUCKETS:
+            return False, f"Invalid range. Must be one of: {', '.join(map(str, ExpiryService.BUCKETS))} days", None
+        
+        try:
+            kind_buckets = ExpiryService.expiry_buckets()[kind]
+            entries = [entry for days, bucket in kind_buckets.items() if days <= within for entry in bucket]
+            return True, f"{len(entries)} assets expiring within {within} days", entries
+        except Exception as e:
+            return False, f"Error loading expiring assets: {str(e)}", None
+    
+    @staticmethod
+    def digest() -> str:
+        """
+        Summarize the expiry buckets as plain text for a daily report.
+        
+        Returns:
+            Digest text, one line per bucket followed by the assets of the
+            shortest bucket
+        """
+        buckets = ExpiryService.expiry_buckets()
+        lines = [f"Expiry digest for {buckets['date']}"]
+        for kind in ExpiryService.KINDS:
+            total = 0
+            for days, entries in buckets[kind].items():
+                total += len(entries)
+                lines.append(f"  {kind} ending within {days} days: {total}")
+            for entry in buckets[kind][ExpiryService.BUCKETS[0]]:
+                holder = entry['assigned_to'] or 'unassigned'
+                lines.append(f"    {entry['asset_tag']} ({entry['asset_type']}, {holder}) on {entry['expires_on']}")
+        return '\n'.join(lines)
@@ -0,0 +1,311 @@
+"""
+Fleet financial reporting service.
+
+This module contains the FinancialService class that reports purchase
+cost, depreciated book value and monthly rental spend of the asset fleet,
+in total and by category, vendor and location.
+
+The report never loads ORM objects: the financial columns are read in one
+query straight from the database cursor, with dates converted to day
+numbers by the database, and then evaluated column-wise:
+
+- With NumPy installed the columns become arrays and every step, including
+  the group totals (bincount over factorized keys), is vectorized.
+- Without NumPy the same formulas run in a single pure-Python pass.
+"""
+
+import csv
+import io
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import func, literal_column, select
+
+from ..models.asset import Asset
+from ..core.cache import get_stats_cache
+from ..core.database import db
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+EPOCH = date(1970, 1, 1)
+
+# julianday() of 1970-01-01, to turn SQLite julian days into epoch days
+_JULIAN_EPOCH = 2440587.5
+
+DAYS_PER_YEAR = 365.25
+
+# Per-row amounts summed into totals and group entries
+_AMOUNTS = ('purchase_cost', 'book_value', 'monthly_rental_burn')
+
+
+def _day_number(column: Any, dialect: str) -> Any:
+    """SQL expression for a date column as days since 1970-01-01, where the dialect can compute it."""
+    if dialect == 'sqlite':
+        return func.julianday(column) - _JULIAN_EPOCH
+    if dialect == 'postgresql':
+        return column - literal_column("DATE '1970-01-01'")
+    return column
+
+
+def _to_day_number(value: Any) -> Optional[float]:
+    """Convert a date, ISO date string or day number to days since 1970-01-01."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return float((value - EPOCH).days)
+
+
+def _entry(name: Any, assets: int, active_rentals: int, amounts: Sequence[float]) -> Dict[str, Any]:
+    """Report entry with amounts rounded to cents."""
+    entry = {'name': name, 'assets': int(assets), 'active_rentals': int(active_rentals)}
+    for field, amount in zip(_AMOUNTS, amounts):
+        entry[field] = round(float(amount), 2)
+    return entry
+
+
+def _sorted_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order group entries by book value, largest first, then by name."""
+    return sorted(entries, key=lambda entry: (-entry['book_value'], entry['name'] is None, entry['name'] or ''))
+
+
+class FinancialService:
+    """Service class for fleet cost, depreciation and rental spend reports."""
+    
+    METHODS = ('straight_line', 'declining_balance')
+    
+    # Report group -> asset column
+    GROUPS = OrderedDict([
+        ('category', Asset.asset_category),
+        ('vendor', Asset.vendor_name),
+        ('location', Asset.location),
+    ])
+    
+    RENTAL_TYPES = ('rented', 'leased')
+    
+    # Useful life used when DEPRECIATION_YEARS is not configured
+    DEFAULT_USEFUL_LIFE_YEARS = 4
+    
+    CSV_HEADERS = ['Group', 'Name', 'Assets', 'Active Rentals', 'Purchase Cost', 'Book Value', 'Monthly Rental Burn']
+    
+    @staticmethod
+    def get_report(method: str = 'straight_line',
+                   as_of: Optional[date] = None) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+        """
+        Get the fleet financial report, recomputing it only after assets changed.
+        
+        Args:
+            method: Depreciation method, 'straight_line' or 'declining_balance'
+            as_of: Valuation date, defaults to today
+            
+        Returns:
+            Tuple of (success, message, report) where report is in the
+            format of compute_report()
+        """
+        if method not in FinancialService.METHODS:
+            return False, f"Invalid method. Must be one of: {', '.join(FinancialService.METHODS)}", None
+        
+        as_of = as_of or date.today()
+        life_years = current_app.config.get('DEPRECIATION_YEARS', FinancialService.DEFAULT_USEFUL_LIFE_YEARS)
+        
+        try:
+            report = get_stats_cache().get_or_compute(
+                f'financials:{method}',
+                [Asset.__tablename__],
+                lambda: FinancialService.compute_report(method, as_of, life_years),
+                extra_key=(as_of, life_years)
+            )
+            return True, "Financial report loaded", report
+        except Exception as e:
+            return False, f"Error computing financial report: {str(e)}", None
+    
+    @staticmethod
+    def compute_report(method: str, as_of: date, life_years: float) -> Dict[str, Any]:
+        """
+        Compute the fleet financial report.
+        
+        Book value depreciates the purchase cost over life_years from the
+        purchase date, either linearly to zero (straight_line) or by a
+        constant 2 / life_years per year (declining_balance, i.e. double
+        declining balance). Assets without a purchase date keep their cost.
+        The monthly rental burn sums rental_cost_monthly of rented or leased
+        assets whose rental period contains as_of.
+        
+        Args:
+            method: Depreciation method (see METHODS)
+            as_of: Valuation date
+            life_years: Useful life in years
+            
+        Returns:
+            Dictionary with 'totals' and one 'by_<group>' list of entries per
+            group, each entry holding assets, active_rentals, purchase_cost,
+            book_value and monthly_rental_burn
+        """
+        columns = FinancialService._load_columns()
+        as_of_day = float((as_of - EPOCH).days)
+        
+        if NUMPY_AVAILABLE:
+            totals, groups = FinancialService._compute_vectorized(columns, method, as_of_day, life_years)
+        else:
+            totals, groups = FinancialService._compute_python(columns, method, as_of_day, life_years)
+        
+        report = {
+            'as_of': as_of.isoformat(),
+            'method': method,
+            'useful_life_years': life_years,
+            'totals': totals
+        }
+        for group, entries in groups.items():
+            report[f'by_{group}'] = _sorted_entries(entries)
+        return report
+    
+    @staticmethod
+    def report_csv(report: Dict[str, Any]) -> str:
+        """
+        Format a financial report as CSV, one row per group entry plus a total row.
+        
+        Args:
+            report: Result of compute_report()
+            
+        Returns:
+            CSV string
+        """
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(FinancialService.CSV_HEADERS)
+        
+        def write(group: str, entry: Dict[str, Any]) -> None:
+            writer.writerow([group, entry['name'] or '', entry['assets'], entry['active_rentals']] +
+                            [f'{entry[field]:.2f}' for field in _AMOUNTS])
+        
+        for group in FinancialService.GROUPS:
+            for entry in report[f'by_{group}']:
+                write(group, entry)
+        write('total', dict(report['totals'], name='All assets'))
+        
+        return output.getvalue()
+    
+    @staticmethod
+    def _load_columns() -> List[Sequence[Any]]:
+        """
+        Read the financial columns of all assets, transposed into columns.
+        
+        Rows are fetched as plain tuples from the DBAPI cursor, skipping
+        result processing, so dates arrive as day numbers where the
+        database computes them and are converted here otherwise.
+        
+        Returns:
+            Columns in the order: purchase_cost, purchase_day, rental_cost_monthly,
+            ownership_type, rental_start_day, rental_end_day, then one per group
+        """
+        connection = db.session.connection()
+        dialect = connection.dialect.name
+        statement = select(
+            Asset.purchase_cost,
+            _day_number(Asset.purchase_date, dialect),
+            Asset.rental_cost_monthly,
+            Asset.ownership_type,
+            _day_number(Asset.rental_start_date, dialect),
+            _day_number(Asset.rental_end_date, dialect),
+            *FinancialService.GROUPS.values()
+        )
+        sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+        
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        width = 6 + len(FinancialService.GROUPS)
+        columns = list(zip(*rows)) if rows else [()] * width
+        if dialect not in ('sqlite', 'postgresql'):
+            for index in (1, 4, 5):
+                columns[index] = [_to_day_number(value) for value in columns[index]]
+        return columns
+    
+    @staticmethod
+    def _compute_vectorized(columns: List[Sequence[Any]], method: str, as_of_day: float,
+                            life_years: float) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+        """Evaluate the report with NumPy arrays; NULL numbers become NaN."""
+        cost_column, purchased_column, rent_column, ownership_column, start_column, end_column = columns[:6]
+        
+        cost = np.nan_to_num(np.array(cost_column, dtype=float))
+        purchased = np.array(purchased_column, dtype=float)
+        age = np.where(np.isnan(purchased), 0.0, np.maximum(as_of_day - purchased, 0.0)) / DAYS_PER_YEAR
+        if method == 'straight_line':
+            book_value = cost * np.clip(1.0 - age / life_years, 0.0, 1.0)
+        else:
+            book_value = cost * max(1.0 - 2.0 / life_years, 0.0) ** age
+        
+        rent = np.nan_to_num(np.array(rent_column, dtype=float))
+        start = np.array(start_column, dtype=float)
+        end = np.array(end_column, dtype=float)
+        is_rental = np.isin(np.array(ownership_column, dtype=object), FinancialService.RENTAL_TYPES)
+        # Comparisons with NaN are False, so open-ended periods are tested explicitly
+        active = is_rental & (np.isnan(start) | (start <= as_of_day)) & (np.isnan(end) | (end >= as_of_day))
+        burn = np.where(active, rent, 0.0)
+        
+        amounts = (cost, book_value, burn)
+        totals = _entry(None, len(cost), active.sum(), [amount.sum() for amount in amounts])
+        del totals['name']
+        
+        groups = OrderedDict()
+        for index, group in enumerate(FinancialService.GROUPS, start=6):
+            keys = columns[index]
+            names = list(set(keys))
+            codes = {name: code for code, name in enumerate(names)}
+            inverse = np.array(list(map(codes.__getitem__, keys)), dtype=np.intp)
+            
+            counts = np.bincount(inverse, minlength=len(names))
+            rentals = np.bincount(inverse, weights=active, minlength=len(names))
+            sums = [np.bincount(inverse, weights=amount, minlength=len(names)) for amount in amounts]
+            groups[group] = [
+                _entry(name, counts[code], rentals[code], [column[code] for column in sums])
+                for code, name in enumerate(names)
+            ]
+        
+        return totals, groups
+    
+    @staticmethod
+    def _compute_python(columns: List[Sequence[Any]], method: str, as_of_day: float,
+                        life_years: float) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+        """Evaluate the report in one pure-Python pass over the rows."""
+        decline = max(1.0 - 2.0 / life_years, 0.0)
+        group_totals = OrderedDict((group, {}) for group in FinancialService.GROUPS)
+        grand_total = [0, 0, 0.0, 0.0, 0.0]
+        
+        for row in zip(*columns):
+            cost, purchased, rent, ownership, start, end = row[:6]
+            cost = cost or 0.0
+            age = max(as_of_day - purchased, 0.0) / DAYS_PER_YEAR if purchased is not None else 0.0
+            if method == 'straight_line':
+                book_value = cost * min(max(1.0 - age / life_years, 0.0), 1.0)
+            else:
+                book_value = cost * decline ** age
+            
+            active = (ownership in FinancialService.RENTAL_TYPES and
+                      (start is None or start <= as_of_day) and (end is None or end >= as_of_day))
+            burn = (rent or 0.0) if active else 0.0
+            
+            values = (1, int(active), cost, book_value, burn)
+            for totals in [grand_total] + [
+                group.setdefault(key, [0, 0, 0.0, 0.0, 0.0]) for group, key in zip(group_totals.values(), row[6:])
+            ]:
+                for position, value in enumerate(values):
+                    totals[position] += value
+        
+        totals = _entry(None, grand_total[0], grand_total[1], grand_total[2:])
+        del totals['name']
+        groups = OrderedDict(
+            (group, [_entry(name, *sums[:2], sums[2:]) for name, sums in keys.items()])
+            for group, keys in group_totals.items()
+        )
+        return totals, groups
@@ -7,17 +7,25 @@ including sample file generation and bulk data upload.
 
 import csv
 import io
-from datetime import datetime, date
-from typing import List, Dict, Any, Tuple, Optional
+from datetime import date
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator
 from flask import current_app
 
 from ..models.access import GitHubAccess
 from ..core.database import db
+from ..utils.dates import DateParser
+from .csv_import import (
+    DEFAULT_CHUNK_SIZE, ImportSummary, ParsedRow, ProgressCallback,
+    collect_rows, import_keyed_rows, iter_validated_rows, open_text_stream, run_import, validation_workers
+)
 
 
 class GitHubAccessCSVService:
     """Service for handling CSV operations for GitHub access."""
     
+    # Shared by imports; sniffs the format of each date column
+    DATE_PARSER = DateParser()
+    
     # Define CSV headers and their corresponding model fields
     CSV_HEADERS = [
         'user_name',
@@ -30,6 +38,9 @@ class GitHubAccessCSVService:
         'remarks'
     ]
     
+    # Columns identifying the record a row updates
+    KEY_FIELDS = ['user_name', 'organization_name', 'repo_name']
+    
     # Sample data for GitHub access
     SAMPLE_DATA = [
         {
@@ -96,31 +107,38 @@ class GitHubAccessCSVService:
         Returns:
             Tuple of (valid_rows, error_messages)
         """
-        valid_rows = []
-        errors = []
+        return collect_rows(cls.iter_csv_rows(io.StringIO(file_content)))
         
-        try:
-            # Parse CSV content
-            csv_reader = csv.DictReader(io.StringIO(file_content))
+    @classmethod
+    def iter_csv_rows(cls, text_stream: Iterable[str], workers: int = 1) -> Iterator[ParsedRow]:
+        """
+        Parse and validate CSV rows lazily.
             
-            # Validate headers
-            if not cls._validate_headers(csv_reader.fieldnames):
-                errors.append("Invalid CSV headers. Please use the sample CSV template.")
-                return valid_rows, errors
+        Args:
+            text_stream: Text file object or iterable of CSV lines
+            workers: Number of processes to validate rows in
             
-            # Process each row
-            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (after header)
-                try:
-                    validated_row = cls._validate_and_clean_row(row, row_num)
-                    if validated_row:
-                        valid_rows.append(validated_row)
-                except ValueError as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
+        Yields:
+            (row_number, cleaned_row, error_message) tuples, see iter_validated_rows()
+        """
+        return iter_validated_rows(text_stream, cls._validate_headers, cls._validate_and_clean_row, workers)
                     
-        except Exception as e:
-            errors.append(f"Error parsing CSV file: {str(e)}")
+    @classmethod
+    def import_csv_stream(cls, stream: Any, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          progress: Optional[ProgressCallback] = None) -> ImportSummary:
+        """
+        Parse, validate and import an uploaded CSV file without reading it into memory.
         
-        return valid_rows, errors
+        Args:
+            stream: Binary file object of the upload
+            chunk_size: Valid rows imported per chunk
+            progress: Optional callable receiving the running ImportSummary
+            
+        Returns:
+            ImportSummary; nothing is imported if any row is invalid
+        """
+        parsed_rows = cls.iter_csv_rows(open_text_stream(stream), validation_workers())
+        return run_import(parsed_rows, cls._import_chunk, chunk_size, progress)
     
     @classmethod
     def bulk_import_github_access(cls, validated_rows: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
@@ -138,27 +156,7 @@ class GitHubAccessCSVService:
         errors = []
         
         try:
-            for row in validated_rows:
-                try:
-                    # Check if access already exists
-                    existing_access = GitHubAccess.query.filter_by(
-                        user_name=row['user_name'],
-                        organization_name=row['organization_name'],
-                        repo_name=row['repo_name']
-                    ).first()
-                    
-                    if existing_access:
-                        # Update existing access
-                        cls._update_access_from_row(existing_access, row)
-                        updated_count += 1
-                    else:
-                        # Create new access
-                        new_access = cls._create_access_from_row(row)
-                        db.session.add(new_access)
-                        created_count += 1
-                        
-                except Exception as e:
-                    errors.append(f"Error processing GitHub access for {row.get('user_name', 'Unknown')} - {row.get('repo_name', 'Unknown')}: {str(e)}")
+            created_count, updated_count, errors = cls._import_chunk(validated_rows)
             
             # Commit all changes
             db.session.commit()
@@ -169,6 +167,22 @@ class GitHubAccessCSVService:
         
         return created_count, updated_count, errors
     
+    @classmethod
+    def _import_chunk(cls, rows: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+        """
+        Write a chunk of validated rows without committing.
+        
+        Rows are matched to existing records by KEY_FIELDS, see
+        import_keyed_rows().
+        
+        Args:
+            rows: Validated access dictionaries
+            
+        Returns:
+            Tuple of (created_count, updated_count, error_messages)
+        """
+        return import_keyed_rows(GitHubAccess, cls.KEY_FIELDS, cls.CSV_HEADERS, rows)
+    
     @classmethod
     def export_github_access_to_csv(cls, access_records: List[GitHubAccess]) -> io.StringIO:
         """
@@ -241,7 +255,7 @@ class GitHubAccessCSVService:
             value = row.get(field, '').strip()
             
             if field in ['assign_date', 'remove_date']:
-                cleaned_row[field] = cls._parse_date(value) if value else None
+                cleaned_row[field] = cls._parse_date(value, field) if value else None
             else:
                 cleaned_row[field] = value if value else None
         
@@ -254,23 +268,6 @@ class GitHubAccessCSVService:
         
         return cleaned_row
     
-    @classmethod
-    def _create_access_from_row(cls, row: Dict[str, Any]) -> GitHubAccess:
-        """Create new GitHubAccess object from validated row data."""
-        access = GitHubAccess()
-        cls._update_access_from_row(access, row)
-        return access
-    
-    @classmethod
-    def _update_access_from_row(cls, access: GitHubAccess, row: Dict[str, Any]) -> None:
-        """Update GitHubAccess object with row data."""
-        for field, value in row.items():
-            if hasattr(access, field) and value is not None:
-                setattr(access, field, value)
-        
-        # Set updated timestamp
-        access.updated_at = datetime.utcnow()
-    
     @classmethod
     def _access_to_csv_row(cls, access: GitHubAccess) -> Dict[str, str]:
         """Convert GitHubAccess object to CSV row format."""
@@ -288,17 +285,6 @@ class GitHubAccessCSVService:
         return row
     
     @classmethod
-    def _parse_date(cls, date_str: str) -> Optional[date]:
-        """Parse date string in various formats."""
-        if not date_str:
-            return None
-        
-        date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        
-        raise ValueError(f"Invalid date format: {date_str}. Use YYYY-MM-DD format.")
+    def _parse_date(cls, date_str: str, column: Optional[str] = None) -> Optional[date]:
+        """Parse date string in various formats (see DATE_FORMATS)."""
+        return cls.DATE_PARSER.parse(date_str, column)
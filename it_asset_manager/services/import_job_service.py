@@ -0,0 +1,237 @@
+"""
+Background CSV import job service.
+
+This module contains the ImportJobService class that turns a bulk upload
+into an ImportJob: the file is saved to disk, the job is queued on the
+application's job runner, and the import reports progress to the jobs
+table while it runs.
+
+Jobs run on the in-process thread pool of the worker that queued them, so
+a job is lost when that worker is recycled, killed or redeployed. Every
+job write records a heartbeat, and each progress report of a running
+import also records one for the jobs queued behind it in the same worker.
+A queued or running job without a heartbeat for JOB_STALE_SECONDS is
+failed as interrupted and its upload is removed, both when the app starts
+and when its progress is polled.
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+
+from ..core.database import db
+from ..core.jobs import get_job_runner
+from ..models.job import ImportJob
+from .csv_import import ImportSummary
+from .csv_service import CSVService
+from .app_access_csv_service import AppAccessCSVService
+from .github_access_csv_service import GitHubAccessCSVService
+
+
+class ImportJobService:
+    """Service class for background bulk imports."""
+    
+    # Job kind -> (CSV service, record noun used in result messages)
+    IMPORTERS = {
+        'assets': (CSVService, 'assets'),
+        'application_access': (AppAccessCSVService, 'access records'),
+        'github_access': (GitHubAccessCSVService, 'access records'),
+    }
+    
+    # Seconds without a heartbeat after which a queued or running job is
+    # considered interrupted. Running imports write progress, and the
+    # heartbeats of the jobs queued behind them, every chunk.
+    DEFAULT_STALE_SECONDS = 600
+    
+    # Ids of the jobs submitted by this process that have not started yet
+    _waiting: Set[str] = set()
+    _waiting_lock = threading.Lock()
+    
+    INTERRUPTED_MESSAGE = 'Import interrupted because the server stopped it. Please upload the file again.'
+    
+    @classmethod
+    def submit(cls, kind: str, upload: FileStorage,
+               created_by: Optional[str] = None) -> Tuple[bool, str, Optional[ImportJob]]:
+        """
+        Save an uploaded CSV file and queue it for import.
+        
+        Args:
+            kind: Import kind (see IMPORTERS)
+            upload: Uploaded CSV file
+            created_by: Username of the uploader
+            
+        Returns:
+            Tuple of (success, message, job_object)
+        """
+        if kind not in cls.IMPORTERS:
+            return False, f"Unknown import kind: {kind}", None
+        
+        try:
+            job = ImportJob(id=uuid.uuid4().hex, kind=kind, filename=upload.filename, created_by=created_by,
+                            heartbeat_at=datetime.utcnow())
+            
+            folder = cls._upload_folder()
+            os.makedirs(folder, exist_ok=True)
+            job.file_path = os.path.join(folder, f'{job.id}.csv')
+            upload.save(job.file_path)
+            job.total_bytes = os.path.getsize(job.file_path)
+            
+            db.session.add(job)
+            db.session.commit()
+            
+            with cls._waiting_lock:
+                cls._waiting.add(job.id)
+            get_job_runner().submit(cls.run, job.id)
+            return True, "Import started", job
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error starting import: {str(e)}", None
+    
+    @classmethod
+    def run(cls, job_id: str) -> Optional[ImportSummary]:
+        """
+        Execute a queued import job.
+        
+        Called on the job runner inside an application context. Progress
+        is written to the job row every chunk; the final summary and
+        message are stored when the import finishes.
+        
+        Args:
+            job_id: Id of the job to run
+            
+        Returns:
+            ImportSummary of the import, or None if the job could not run
+        """
+        with cls._waiting_lock:
+            cls._waiting.discard(job_id)
+        
+        job = ImportJob.find_by_id(job_id)
+        if not job or job.status != 'queued':
+            return None
+        
+        service, noun = cls.IMPORTERS[job.kind]
+        file_path = job.file_path
+        total_bytes = job.total_bytes
+        
+        # End the read on the jobs database; all further job writes use update_fields()
+        db.session.rollback()
+        if not ImportJob.start(job_id):
+            # Failed as interrupted since it was read
+            return None
+        
+        try:
+            with open(file_path, 'rb') as stream:
+                def report(summary: ImportSummary) -> None:
+                    ImportJob.update_fields(
+                        job_id,
+                        rows_processed=summary.rows_processed,
+                        valid_rows=summary.valid_rows,
+                        bytes_processed=stream.tell()
+                    )
+                    cls._heartbeat_waiting()
+                
+                summary = service.import_csv_stream(stream, progress=report)
+            
+            status, message = cls._outcome(summary, noun)
+            ImportJob.update_fields(
+                job_id,
+                status=status,
+                message=message,
+                rows_processed=summary.rows_processed,
+                valid_rows=summary.valid_rows,
+                bytes_processed=total_bytes,
+                created_count=summary.created,
+                updated_count=summary.updated,
+                errors=summary.parse_errors + summary.import_errors,
+                finished_at=datetime.utcnow()
+            )
+            return summary
+        
+        except Exception as e:
+            db.session.rollback()
+            ImportJob.update_fields(
+                job_id,
+                status='failed',
+                message=f"Error processing file: {str(e)}",
+                finished_at=datetime.utcnow()
+            )
+            raise
+        
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    
+    @classmethod
+    def get_progress(cls, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress report of a job.
+        
+        Args:
+            job_id: Job id
+            
+        Returns:
+            Dictionary for the progress API, or None if the job does not exist
+        """
+        job = ImportJob.find_by_id(job_id)
+        if job and not job.is_finished and cls._fail_if_stale(job):
+            job = ImportJob.find_by_id(job_id)
+        return job.to_dict() if job else None
+    
+    @classmethod
+    def fail_stale_jobs(cls) -> int:
+        """
+        Fail queued and running jobs whose worker stopped and remove their uploads.
+        
+        Returns:
+            Number of jobs failed
+        """
+        stale = ImportJob.stale_query(cls._stale_cutoff()).all()
+        return sum(1 for job in stale if cls._fail_if_stale(job))
+    
+    @classmethod
+    def _fail_if_stale(cls, job: ImportJob) -> bool:
+        """Fail a job as interrupted if it has no recent heartbeat, removing its upload."""
+        if not ImportJob.fail_if_stale(job.id, cls._stale_cutoff(), cls.INTERRUPTED_MESSAGE):
+            return False
+        if job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        return True
+    
+    @classmethod
+    def _heartbeat_waiting(cls) -> None:
+        """Record a heartbeat for the jobs waiting on this process's job runner."""
+        with cls._waiting_lock:
+            waiting = list(cls._waiting)
+        if waiting:
+            ImportJob.touch_queued(waiting)
+    
+    @classmethod
+    def _stale_cutoff(cls) -> datetime:
+        """Jobs last seen before this time are interrupted."""
+        seconds = current_app.config.get('JOB_STALE_SECONDS', cls.DEFAULT_STALE_SECONDS)
+        return datetime.utcnow() - timedelta(seconds=seconds)
+    
+    @staticmethod
+    def _outcome(summary: ImportSummary, noun: str) -> Tuple[str, str]:
+        """Map an import summary to a final job status and message."""
+        if summary.parse_errors:
+            return 'failed', 'No records were imported because the file contains invalid rows'
+        if summary.imported:
+            return 'completed', (
+                f"Import completed: {summary.created} {noun} created, {summary.updated} {noun} updated"
+            )
+        if not summary.valid_rows and not summary.import_errors:
+            return 'failed', 'No valid data found in CSV file'
+        return 'failed', f"No {noun} were imported"
+    
+    @staticmethod
+    def _upload_folder() -> str:
+        """Directory where uploads wait for their import job."""
+        folder = current_app.config.get('IMPORT_UPLOAD_FOLDER')
+        return folder or os.path.join(current_app.instance_path, 'imports')
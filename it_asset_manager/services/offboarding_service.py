@@ -0,0 +1,158 @@
+"""
+Offboarding service.
+
+This module contains the OffboardingService class that, when people
+leave, revokes all their active application and GitHub access and
+unassigns all their assigned assets in one transaction. Each table is
+changed with set-based UPDATEs of the rows found by one locking select,
+so the receipt lists exactly the rows that were changed.
+"""
+
+import csv
+import io
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+
+from ..models.access import ApplicationAccess, GitHubAccess
+from ..models.asset import Asset
+from ..core.database import db
+
+
+def _chunks(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Split values into chunks of at most size values."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class OffboardingService:
+    """Service class for offboarding leaving users."""
+    
+    # Record type -> (model, user column, target columns, detail column,
+    # status of rows to change, new status, whether remarks are stored)
+    RECORD_TYPES = OrderedDict([
+        ('application_access', (ApplicationAccess, ApplicationAccess.user_name, [ApplicationAccess.application_name],
+                                ApplicationAccess.access_level, 'active', 'revoked', True)),
+        ('github_access', (GitHubAccess, GitHubAccess.user_name, [GitHubAccess.organization_name, GitHubAccess.repo_name],
+                           GitHubAccess.access_type, 'active', 'revoked', True)),
+        ('assets', (Asset, Asset.assigned_to, [Asset.asset_tag], Asset.asset_type, 'assigned', 'unassigned', False)),
+    ])
+    
+    # Most users offboarded at once
+    MAX_USERS = 1000
+    
+    # Values per IN list, below the 999 bind parameters of older SQLite versions
+    CHUNK_SIZE = 500
+    
+    RECEIPT_HEADERS = ['Record Type', 'Record ID', 'User', 'Target', 'Detail', 'Previous Status', 'New Status', 'Date']
+    
+    @staticmethod
+    def offboard(usernames: Iterable[str],
+                 remarks: Optional[str] = None) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+        """
+        Revoke all access and unassign all assets of users in one transaction.
+        
+        Revoked access gets today's remove date and the remarks, if given;
+        unassigned assets get today's remove date and keep assigned_to for
+        history, as Asset.unassign() does.
+        
+        Args:
+            usernames: Usernames to offboard
+            remarks: Optional reason stored on revoked access records
+            
+        Returns:
+            Tuple of (success, message, result) where result holds the
+            'date', the 'usernames', 'totals' and per-user counts
+            ('by_user') per record type, and the receipt 'items'
+        """
+        usernames = list(OrderedDict.fromkeys(name.strip() for name in usernames if name and name.strip()))
+        if not usernames:
+            return False, "No usernames given", None
+        if len(usernames) > OffboardingService.MAX_USERS:
+            return False, f"At most {OffboardingService.MAX_USERS} users can be offboarded at once", None
+        
+        today = date.today()
+        now = datetime.utcnow()
+        by_user = OrderedDict(
+            (name, OrderedDict((record_type, 0) for record_type in OffboardingService.RECORD_TYPES))
+            for name in usernames
+        )
+        items = []
+        
+        try:
+            for record_type, spec in OffboardingService.RECORD_TYPES.items():
+                model, user_column, target_columns, detail_column, current_status, new_status, takes_remarks = spec
+                
+                ids = []
+                for chunk in _chunks(usernames, OffboardingService.CHUNK_SIZE):
+                    rows = db.session.execute(
+                        select(model.id, user_column, detail_column, *target_columns)
+                        .where(user_column.in_(chunk), model.status == current_status)
+                        .order_by(user_column, model.id)
+                        .with_for_update()
+                    )
+                    for record_id, user, detail, *target in rows:
+                        ids.append(record_id)
+                        by_user[user][record_type] += 1
+                        items.append({
+                            'record_type': record_type,
+                            'id': record_id,
+                            'user': user,
+                            'target': '/'.join(target),
+                            'detail': detail,
+                            'previous_status': current_status,
+                            'new_status': new_status
+                        })
+                
+                values = {'status': new_status, 'remove_date': today, 'updated_at': now}
+                if takes_remarks and remarks:
+                    values['remarks'] = remarks
+                for chunk in _chunks(ids, OffboardingService.CHUNK_SIZE):
+                    db.session.execute(
+                        update(model).where(model.id.in_(chunk)).values(**values),
+                        execution_options={'synchronize_session': False}
+                    )
+            
+            db.session.commit()
+        
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error offboarding users: {str(e)}", None
+        
+        totals = OrderedDict(
+            (record_type, sum(counts[record_type] for counts in by_user.values()))
+            for record_type in OffboardingService.RECORD_TYPES
+        )
+        result = {
+            'date': today.isoformat(),
+            'usernames': usernames,
+            'totals': totals,
+            'by_user': by_user,
+            'items': items
+        }
+        message = (f"Offboarded {len(usernames)} users: revoked {totals['application_access']} application "
+                   f"and {totals['github_access']} GitHub access records, unassigned {totals['assets']} assets")
+        return True, message, result
+    
+    @staticmethod
+    def receipt_csv(result: Dict[str, Any]) -> str:
+        """
+        Format the changed records of an offboarding as a CSV receipt.
+        
+        Args:
+            result: Result of offboard()
+            
+        Returns:
+            CSV string, one row per changed record
+        """
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(OffboardingService.RECEIPT_HEADERS)
+        for item in result['items']:
+            writer.writerow([
+                item['record_type'], item['id'], item['user'], item['target'], item['detail'] or '',
+                item['previous_status'], item['new_status'], result['date']
+            ])
+        return output.getvalue()
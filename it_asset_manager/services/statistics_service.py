@@ -0,0 +1,266 @@
+"""
+Dashboard statistics service.
+
+This module contains the StatisticsService class that computes the asset
+and access statistics shown on the dashboard. Each table is read with a
+single aggregation query: rows are grouped by every dimension the
+dashboard breaks numbers down by, conditional sums (SUM(CASE ...)) count
+the subsets, and the totals are rolled up from the groups in Python. The
+number of groups is bounded by the distinct values of those dimensions,
+not by the number of rows.
+
+On SQLite and PostgreSQL the same numbers are read from the
+trigger-maintained stats_counters table instead (see models.stats_counter),
+which costs one query of index lookups regardless of table size; the
+aggregation queries remain the fallback for other databases and the
+reference the counters are reconciled against.
+
+Results are cached per process and keyed by the data generations of the
+tables they are computed from (see core.cache), so repeated requests cost
+a counter read until a commit changes one of those tables.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import case, func, literal, select
+
+from ..models.asset import Asset
+from ..models.access import ApplicationAccess, GitHubAccess
+from ..models.stats_counter import StatsCounter
+from ..core.cache import get_stats_cache
+from ..core.database import db
+
+
+def _count_where(condition) -> Any:
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END)."""
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _top(counts: Counter, limit: int) -> List[Any]:
+    """Keys with the highest counts, ties broken by key."""
+    return sorted(counts, key=lambda key: (-counts[key], str(key)))[:limit]
+
+
+class StatisticsService:
+    """Service class for single-pass dashboard statistics."""
+    
+    # Number of entries in the top applications / repositories lists
+    TOP_LIMIT = 10
+    
+    # Days ahead for which warranties count as expiring
+    WARRANTY_WINDOW_DAYS = 30
+    
+    @staticmethod
+    def asset_statistics() -> Dict[str, Any]:
+        """
+        Get asset statistics, recomputing them only after assets changed.
+        
+        Returns:
+            Dictionary in the format of AssetService.get_asset_statistics()
+        """
+        # Expiring warranties depend on the date as well as the data
+        return get_stats_cache().get_or_compute(
+            'asset_statistics',
+            [Asset.__tablename__],
+            StatisticsService._load_asset_statistics,
+            extra_key=date.today()
+        )
+    
+    @staticmethod
+    def access_statistics() -> Dict[str, Any]:
+        """
+        Get access statistics, recomputing them only after access records changed.
+        
+        Returns:
+            Dictionary in the format of AccessService.get_access_statistics()
+        """
+        return get_stats_cache().get_or_compute(
+            'access_statistics',
+            [ApplicationAccess.__tablename__, GitHubAccess.__tablename__],
+            StatisticsService._load_access_statistics
+        )
+    
+    @staticmethod
+    def _load_asset_statistics() -> Dict[str, Any]:
+        """Read asset statistics from the counters where maintained, else aggregate."""
+        if StatsCounter.available():
+            return StatisticsService.counted_asset_statistics()
+        return StatisticsService.compute_asset_statistics()
+    
+    @staticmethod
+    def _load_access_statistics() -> Dict[str, Any]:
+        """Read access statistics from the counters where maintained, else aggregate."""
+        if StatsCounter.available():
+            return StatisticsService.counted_access_statistics()
+        return StatisticsService.compute_access_statistics()
+    
+    @staticmethod
+    def counted_asset_statistics() -> Dict[str, Any]:
+        """
+        Read asset statistics from stats_counters.
+        
+        The expiring warranty count depends on today's date, so it is
+        counted from the assets table in the same round trip.
+        
+        Returns:
+            Dictionary in the format of AssetService.get_asset_statistics()
+        """
+        today = date.today()
+        cutoff = today + timedelta(days=StatisticsService.WARRANTY_WINDOW_DAYS)
+        expiring = select(
+            literal('expiring_warranties'), literal(''), func.count(Asset.id)
+        ).where(Asset.warranty_expiry.between(today, cutoff))
+        
+        counts, extra = StatsCounter.read(['asset_status', 'asset_type', 'asset_ownership'], extra=[expiring])
+        by_status = counts['asset_status']
+        
+        return {
+            'total_assets': sum(by_status.values()),
+            'assigned_assets': by_status.get('assigned', 0),
+            'unassigned_assets': by_status.get('unassigned', 0),
+            'maintenance_assets': by_status.get('maintenance', 0),
+            'retired_assets': by_status.get('retired', 0),
+            'asset_types': dict(counts['asset_type']),
+            'ownership_types': dict(counts['asset_ownership']),
+            'expiring_warranties': extra[0][2] if extra else 0
+        }
+    
+    @staticmethod
+    def counted_access_statistics() -> Dict[str, Any]:
+        """
+        Read access statistics from stats_counters in one query.
+        
+        Returns:
+            Dictionary in the format of AccessService.get_access_statistics()
+        """
+        limit = StatisticsService.TOP_LIMIT
+        counts, _ = StatsCounter.read(
+            ['app_access_status', 'app_access_level', 'github_access_status', 'github_access_type'],
+            top={'app_access_application': limit, 'github_repository': limit}
+        )
+        app_status = counts['app_access_status']
+        github_status = counts['github_access_status']
+        
+        return {
+            'application_access': {
+                'total': sum(app_status.values()),
+                'active': app_status.get('active', 0),
+                'revoked': app_status.get('revoked', 0),
+                'by_level': dict(counts['app_access_level'])
+            },
+            'github_access': {
+                'total': sum(github_status.values()),
+                'active': github_status.get('active', 0),
+                'revoked': github_status.get('revoked', 0),
+                'by_type': dict(counts['github_access_type'])
+            },
+            'top_applications': [
+                {'name': name, 'users': users} for name, users in counts['app_access_application'].items()
+            ],
+            'top_repositories': [
+                {'repo': repo, 'users': users} for repo, users in counts['github_repository'].items()
+            ]
+        }
+    
+    @staticmethod
+    def compute_asset_statistics() -> Dict[str, Any]:
+        """
+        Compute asset statistics in one query.
+        
+        Returns:
+            Dictionary in the format of AssetService.get_asset_statistics()
+        """
+        today = date.today()
+        cutoff = today + timedelta(days=StatisticsService.WARRANTY_WINDOW_DAYS)
+        
+        groups = db.session.query(
+            Asset.asset_type,
+            Asset.ownership_type,
+            Asset.status,
+            func.count(Asset.id).label('count'),
+            _count_where(Asset.warranty_expiry.between(today, cutoff)).label('expiring')
+        ).group_by(Asset.asset_type, Asset.ownership_type, Asset.status).all()
+        
+        by_status = Counter()
+        asset_types = Counter()
+        ownership_types = Counter()
+        expiring_warranties = 0
+        for group in groups:
+            by_status[group.status] += group.count
+            asset_types[group.asset_type] += group.count
+            ownership_types[group.ownership_type] += group.count
+            expiring_warranties += group.expiring or 0
+        
+        return {
+            'total_assets': sum(by_status.values()),
+            'assigned_assets': by_status['assigned'],
+            'unassigned_assets': by_status['unassigned'],
+            'maintenance_assets': by_status['maintenance'],
+            'retired_assets': by_status['retired'],
+            'asset_types': dict(asset_types),
+            'ownership_types': dict(ownership_types),
+            'expiring_warranties': expiring_warranties
+        }
+    
+    @staticmethod
+    def compute_access_statistics() -> Dict[str, Any]:
+        """
+        Compute access statistics in one query per access table.
+        
+        Returns:
+            Dictionary in the format of AccessService.get_access_statistics()
+        """
+        app_groups = db.session.query(
+            ApplicationAccess.access_level,
+            ApplicationAccess.application_name,
+            func.count(ApplicationAccess.id).label('count'),
+            _count_where(ApplicationAccess.status == 'active').label('active'),
+            _count_where(ApplicationAccess.status == 'revoked').label('revoked')
+        ).group_by(ApplicationAccess.access_level, ApplicationAccess.application_name).all()
+        
+        github_groups = db.session.query(
+            GitHubAccess.access_type,
+            GitHubAccess.organization_name,
+            GitHubAccess.repo_name,
+            func.count(GitHubAccess.id).label('count'),
+            _count_where(GitHubAccess.status == 'active').label('active'),
+            _count_where(GitHubAccess.status == 'revoked').label('revoked')
+        ).group_by(GitHubAccess.access_type, GitHubAccess.organization_name, GitHubAccess.repo_name).all()
+        
+        app_totals = Counter()
+        app_levels = Counter()
+        applications = Counter()
+        for group in app_groups:
+            app_totals.update(total=group.count, active=group.active or 0, revoked=group.revoked or 0)
+            if group.active:
+                app_levels[group.access_level] += group.active
+                applications[group.application_name] += group.active
+        
+        github_totals = Counter()
+        github_types = Counter()
+        repositories = Counter()
+        for group in github_groups:
+            github_totals.update(total=group.count, active=group.active or 0, revoked=group.revoked or 0)
+            if group.active:
+                github_types[group.access_type] += group.active
+                repositories[f"{group.organization_name}/{group.repo_name}"] += group.active
+        
+        limit = StatisticsService.TOP_LIMIT
+        return {
+            'application_access': {
+                'total': app_totals['total'],
+                'active': app_totals['active'],
+                'revoked': app_totals['revoked'],
+                'by_level': dict(app_levels)
+            },
+            'github_access': {
+                'total': github_totals['total'],
+                'active': github_totals['active'],
+                'revoked': github_totals['revoked'],
+                'by_type': dict(github_types)
+            },
+            'top_applications': [{'name': name, 'users': applications[name]} for name in _top(applications, limit)],
+            'top_repositories': [{'repo': repo, 'users': repositories[repo]} for repo in _top(repositories, limit)]
+        }
@@ -0,0 +1,164 @@
+"""
+Statistics trend service.
+
+This module contains the TrendService class that records the dashboard
+statistics as a daily snapshot and answers trend queries over those
+snapshots. Statistics are flattened into dotted metric names:
+
+- assets.total, assets.assigned, assets.unassigned, assets.maintenance,
+  assets.retired, assets.expiring_warranties
+- assets.type.<type>, assets.ownership.<ownership>
+- application_access.total / .active / .revoked, application_access.level.<level>
+- github_access.total / .active / .revoked, github_access.type.<type>
+
+Every metric is a level on the snapshot day, so coarser intervals report
+the last snapshot in each period; the change from the previous period
+gives flows such as access grants per month (application_access.total).
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.database import db
+from ..models.stats_snapshot import StatsSnapshot
+from .statistics_service import StatisticsService
+
+
+def _add_breakdown(metrics: Dict[str, int], prefix: str, counts: Dict[Any, int]) -> None:
+    """Add one metric per breakdown value; unset values have no name to report under."""
+    for value, count in counts.items():
+        if value is not None:
+            metrics[f'{prefix}.{value}'] = count
+
+
+def _period_start(day: date, interval: str) -> date:
+    """First day of the interval period containing a date."""
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+class TrendService:
+    """Service class for statistics snapshots and trends."""
+    
+    INTERVALS = ('day', 'week', 'month')
+    
+    # Metrics returned when a trend query names none
+    DEFAULT_METRICS = [
+        'assets.assigned',
+        'assets.unassigned',
+        'application_access.active',
+        'github_access.active'
+    ]
+    
+    # Range used when a trend query gives no start date, and the longest allowed
+    DEFAULT_RANGE_DAYS = 90
+    MAX_RANGE_DAYS = 3660
+    
+    @staticmethod
+    def flatten_statistics(asset_stats: Dict[str, Any], access_stats: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Flatten the statistics dictionaries into metric name -> value.
+        
+        Args:
+            asset_stats: Result of AssetService.get_asset_statistics()
+            access_stats: Result of AccessService.get_access_statistics()
+            
+        Returns:
+            Dictionary of metric values
+        """
+        metrics = OrderedDict()
+        for name in ('total', 'assigned', 'unassigned', 'maintenance', 'retired'):
+            metrics[f'assets.{name}'] = asset_stats[f'{name}_assets']
+        metrics['assets.expiring_warranties'] = asset_stats['expiring_warranties']
+        _add_breakdown(metrics, 'assets.type', asset_stats['asset_types'])
+        _add_breakdown(metrics, 'assets.ownership', asset_stats['ownership_types'])
+        
+        for kind, breakdown in (('application_access', 'level'), ('github_access', 'type')):
+            stats = access_stats[kind]
+            for name in ('total', 'active', 'revoked'):
+                metrics[f'{kind}.{name}'] = stats[name]
+            _add_breakdown(metrics, f'{kind}.{breakdown}', stats[f'by_{breakdown}'])
+        
+        return metrics
+    
+    @staticmethod
+    def take_snapshot() -> Tuple[bool, str, Optional[Dict[str, int]]]:
+        """
+        Record today's statistics, replacing an earlier snapshot of today.
+        
+        Returns:
+            Tuple of (success, message, metrics)
+        """
+        try:
+            today = date.today()
+            metrics = TrendService.flatten_statistics(
+                StatisticsService.asset_statistics(),
+                StatisticsService.access_statistics()
+            )
+            StatsSnapshot.replace_day(today, metrics)
+            db.session.commit()
+            return True, f"Recorded {len(metrics)} metrics for {today.isoformat()}", metrics
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error recording statistics snapshot: {str(e)}", None
+    
+    @staticmethod
+    def get_trends(metrics: Optional[List[str]] = None, start: Optional[date] = None,
+                   end: Optional[date] = None, interval: str = 'day') -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+        """
+        Get metric values over a date range from the snapshots.
+        
+        Args:
+            metrics: Metric names, or prefixes ending in '.*'; defaults to DEFAULT_METRICS
+            start: First date, defaults to DEFAULT_RANGE_DAYS before end
+            end: Last date, defaults to today
+            interval: 'day', 'week' or 'month'
+            
+        Returns:
+            Tuple of (success, message, trends) where trends maps 'series' to
+            metric -> list of {'date', 'value', 'change'} points, each dated
+            with the start of its period
+        """
+        if interval not in TrendService.INTERVALS:
+            return False, f"Invalid interval. Must be one of: {', '.join(TrendService.INTERVALS)}", None
+        
+        end = end or date.today()
+        start = start or end - timedelta(days=TrendService.DEFAULT_RANGE_DAYS)
+        if start > end:
+            return False, "Start date must not be after end date", None
+        if (end - start).days > TrendService.MAX_RANGE_DAYS:
+            return False, f"Date range must not exceed {TrendService.MAX_RANGE_DAYS} days", None
+        
+        try:
+            series = StatsSnapshot.series(metrics or TrendService.DEFAULT_METRICS, start, end)
+        except Exception as e:
+            return False, f"Error loading statistics trends: {str(e)}", None
+        
+        trends = OrderedDict()
+        for metric, values in series.items():
+            # Rows are ordered by date, so the last one per period wins
+            periods = OrderedDict()
+            for snapshot_date, value in values:
+                periods[_period_start(snapshot_date, interval)] = value
+            
+            points = []
+            previous = None
+            for period, value in periods.items():
+                points.append({
+                    'date': period.isoformat(),
+                    'value': value,
+                    'change': None if previous is None else value - previous
+                })
+                previous = value
+            trends[metric] = points
+        
+        return True, "Trends loaded", {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'interval': interval,
+            'series': trends
+        }
@@ -7,6 +7,9 @@ This module contains utility functions and helpers used across the application.
 from .validators import validate_email, validate_password, validate_asset_tag
 from .formatters import format_date, format_currency, format_file_size
 from .generators import generate_asset_tag, generate_secure_token
+from .pagination import KeysetPage, keyset_paginate, clamp_page_size
+from .dates import DateParser
+from .serializers import RowSerializer, dumps, json_response
 
 __all__ = [
     'validate_email',
@@ -16,5 +19,12 @@ __all__ = [
     'format_currency',
     'format_file_size',
     'generate_asset_tag',
-    'generate_secure_token'
+    'generate_secure_token',
+    'KeysetPage',
+    'keyset_paginate',
+    'clamp_page_size',
+    'DateParser',
+    'RowSerializer',
+    'dumps',
+    'json_response'
 ]
@@ -0,0 +1,205 @@
+"""
+Date parsing utilities for bulk imports.
+
+This module contains the DateParser used by the CSV services. It accepts
+the same formats, in the same priority order, as trying datetime.strptime
+with each format in turn, but avoids exceptions as control flow:
+
+- ISO dates (YYYY-MM-DD) take a date.fromisoformat fast path.
+- Other values are matched against regular expressions equivalent to
+  strptime's, and the format a column uses is sniffed from its first
+  values so later values try it first.
+- Results, including failures, are memoized since import files repeat
+  the same dates many times.
+"""
+
+import re
+import threading
+from datetime import date
+from typing import Dict, Optional, Pattern, Tuple
+
+# Accepted formats, highest priority first; ambiguous values such as
+# 03/04/2023 resolve to the first format that parses them
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d')
+
+# Regular expressions strptime uses for each directive, and the lengths they match
+_DIRECTIVES = {
+    'Y': (r'(?P<Y>\d\d\d\d)', 4, 4),
+    'm': (r'(?P<m>1[0-2]|0[1-9]|[1-9])', 1, 2),
+    'd': (r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])', 1, 2),
+}
+
+_ISO_DATE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+_INVALID = object()
+
+
+class DateFormat:
+    """
+    A strptime date format built from %Y, %m and %d.
+    
+    Attributes:
+        format: The strptime format string
+        pattern: Compiled regular expression matching what strptime accepts
+        shape: Per-field (separator, min_length, max_length) used to tell
+            whether two formats can match the same string
+    """
+    
+    def __init__(self, format_string: str) -> None:
+        self.format = format_string
+        
+        parts = re.split(r'%(.)', format_string)
+        regex = []
+        shape = []
+        for index, part in enumerate(parts):
+            if index % 2 == 0:
+                regex.append(re.escape(part))
+                if part:
+                    shape.append((part, len(part), len(part)))
+            elif part in _DIRECTIVES:
+                directive, min_length, max_length = _DIRECTIVES[part]
+                regex.append(directive)
+                shape.append((None, min_length, max_length))
+            else:
+                raise ValueError(f"Unsupported date directive: %{part}")
+        
+        self.pattern: Pattern = re.compile(''.join(regex), re.IGNORECASE)
+        self.shape = tuple(shape)
+    
+    def __repr__(self) -> str:
+        """String representation of DateFormat object."""
+        return f'<DateFormat {self.format}>'
+    
+    def match(self, value: str) -> Optional[date]:
+        """
+        Parse a value with this format.
+        
+        Args:
+            value: Date string
+            
+        Returns:
+            Parsed date, or None if strptime would reject the value
+        """
+        found = self.pattern.fullmatch(value)
+        if not found:
+            return None
+        try:
+            return date(int(found.group('Y')), int(found.group('m')), int(found.group('d')))
+        except ValueError:
+            # Matched the pattern but is not a real date, e.g. 2023-02-30
+            return None
+    
+    def overlaps(self, other: 'DateFormat') -> bool:
+        """Check if some string could be matched by both formats."""
+        if len(self.shape) != len(other.shape):
+            return False
+        for (sep, low, high), (other_sep, other_low, other_high) in zip(self.shape, other.shape):
+            if sep != other_sep or high < other_low or other_high < low:
+                return False
+        return True
+
+
+class DateParser:
+    """
+    Parser for date columns of bulk imports.
+    
+    Parsing is equivalent to trying each format in order with
+    datetime.strptime and taking the first that succeeds. Sniffing only
+    changes which format is tried first; a value is checked against any
+    higher priority format that could also match it, so ambiguous values
+    still resolve exactly as before.
+    """
+    
+    # Values per column used to detect its format
+    SNIFF_SAMPLES = 20
+    
+    # Memoized values; the memo is cleared when full
+    CACHE_SIZE = 10000
+    
+    def __init__(self, formats: Tuple[str, ...] = DATE_FORMATS) -> None:
+        self.formats = [DateFormat(format_string) for format_string in formats]
+        self._has_iso_format = formats[0] == '%Y-%m-%d'
+        
+        # Higher priority formats able to match the same strings as each format
+        self._conflicts = {
+            fmt: [earlier for earlier in self.formats[:index] if earlier.overlaps(fmt)]
+            for index, fmt in enumerate(self.formats)
+        }
+        
+        self._cache: Dict[str, object] = {}
+        self._column_formats: Dict[str, DateFormat] = {}
+        self._samples: Dict[str, Dict[DateFormat, int]] = {}
+        self._lock = threading.Lock()
+    
+    def parse(self, value: str, column: Optional[str] = None) -> Optional[date]:
+        """
+        Parse a date string.
+        
+        Args:
+            value: Date string, already stripped
+            column: Name of the column the value comes from, for sniffing
+            
+        Returns:
+            Parsed date, or None for an empty value
+            
+        Raises:
+            ValueError: If no format matches the value
+        """
+        if not value:
+            return None
+        
+        parsed = self._cache.get(value)
+        if parsed is None:
+            parsed = self._parse(value, column)
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[value] = parsed
+        
+        if parsed is _INVALID:
+            raise ValueError(f"Invalid date format: {value}. Use YYYY-MM-DD format.")
+        return parsed
+    
+    def reset(self) -> None:
+        """Forget memoized values and sniffed column formats."""
+        with self._lock:
+            self._cache.clear()
+            self._column_formats.clear()
+            self._samples.clear()
+    
+    def _parse(self, value: str, column: Optional[str]) -> object:
+        """Parse a value that is not memoized; returns _INVALID if no format matches."""
+        if self._has_iso_format and len(value) == 10 and _ISO_DATE.fullmatch(value):
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+        
+        column_format = self._column_formats.get(column) if column else None
+        if column_format is not None:
+            parsed = column_format.match(value)
+            if parsed is not None:
+                for earlier in self._conflicts[column_format]:
+                    earlier_parsed = earlier.match(value)
+                    if earlier_parsed is not None:
+                        return earlier_parsed
+                return parsed
+        
+        for fmt in self.formats:
+            parsed = fmt.match(value)
+            if parsed is not None:
+                if column and column_format is None:
+                    self._sample(column, fmt)
+                return parsed
+        return _INVALID
+    
+    def _sample(self, column: str, fmt: DateFormat) -> None:
+        """Count the format of a column value and settle the column format once sampled."""
+        with self._lock:
+            if column in self._column_formats:
+                return
+            counts = self._samples.setdefault(column, {})
+            counts[fmt] = counts.get(fmt, 0) + 1
+            if sum(counts.values()) >= self.SNIFF_SAMPLES:
+                self._column_formats[column] = max(counts, key=counts.get)
+                del self._samples[column]
+
@@ -0,0 +1,215 @@
+"""
+Keyset (cursor) pagination utilities.
+
+This module implements cursor-based pagination over a sort column plus the
+primary key as a tie-breaker. Unlike OFFSET pagination, every page is fetched
+with an indexed range predicate, so page 5,000 costs the same as page 1.
+"""
+
+import base64
+import json
+from datetime import datetime, date
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import and_, or_
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class KeysetPage:
+    """
+    A single page of keyset-paginated results.
+    
+    Attributes:
+        items: Rows on this page, in display order
+        limit: Page size used for the query
+        next_cursor: Opaque cursor for the following page, if any
+        prev_cursor: Opaque cursor for the preceding page, if any
+    """
+    
+    def __init__(self, items: List[Any], limit: int,
+                 next_cursor: Optional[str] = None,
+                 prev_cursor: Optional[str] = None) -> None:
+        self.items = items
+        self.limit = limit
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+    
+    @property
+    def has_next(self) -> bool:
+        """Check if a following page exists."""
+        return self.next_cursor is not None
+    
+    @property
+    def has_prev(self) -> bool:
+        """Check if a preceding page exists."""
+        return self.prev_cursor is not None
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def clamp_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """
+    Convert a requested page size into a safe integer.
+    
+    Args:
+        value: Requested page size (usually a query string value)
+        default: Page size to use when the value is missing or invalid
+        maximum: Upper bound for the page size
+        
+    Returns:
+        Page size between 1 and maximum
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, maximum))
+
+
+def encode_cursor(values: Sequence[Any], sort_key: str, backward: bool = False) -> str:
+    """
+    Encode keyset values into an opaque URL-safe cursor.
+    
+    Args:
+        values: Sort column value followed by the primary key value
+        sort_key: Identifier of the ordering the cursor belongs to
+        backward: True if the cursor points to the preceding page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {
+        's': sort_key,
+        'd': 'p' if backward else 'n',
+        'v': [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any], sort_key: str) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string from the client
+        columns: Keyset columns, used to restore value types
+        sort_key: Identifier of the ordering the cursor must belong to
+        
+    Returns:
+        Tuple of (values, backward)
+        
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another ordering
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = payload['v']
+        backward = payload['d'] == 'p'
+        cursor_sort = payload['s']
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    
+    if cursor_sort != sort_key or len(values) != len(columns):
+        raise ValueError("Cursor does not match the requested ordering")
+    
+    return [_restore_value(column, value) for column, value in zip(columns, values)], backward
+
+
+def keyset_paginate(query, sort_column, id_column, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE, descending: bool = True) -> KeysetPage:
+    """
+    Fetch one page of a query ordered by (sort_column, id_column).
+    
+    The query must not already be ordered or limited. Both columns should be
+    non-nullable so that the ordering is total and stable.
+    
+    Args:
+        query: SQLAlchemy query to paginate
+        sort_column: Column to order by
+        id_column: Unique tie-breaker column (usually the primary key)
+        cursor: Cursor returned by a previous page, or None for the first page
+        limit: Number of rows per page
+        descending: True to order newest/highest first
+        
+    Returns:
+        KeysetPage with items and next/prev cursors
+        
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    columns = [sort_column, id_column]
+    sort_key = f"{sort_column.key}:{'desc' if descending else 'asc'}"
+    
+    backward = False
+    if cursor:
+        values, backward = decode_cursor(cursor, columns, sort_key)
+        # Walking backward flips the comparison and the ordering
+        after = descending == backward
+        query = query.filter(_keyset_predicate(columns, values, after))
+    
+    ascending_fetch = descending == backward
+    ordering = [c.asc() if ascending_fetch else c.desc() for c in columns]
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+    
+    if not rows:
+        return KeysetPage([], limit)
+    
+    first_values = _row_values(rows[0], columns)
+    last_values = _row_values(rows[-1], columns)
+    
+    if backward:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+    
+    return KeysetPage(
+        rows,
+        limit,
+        next_cursor=encode_cursor(last_values, sort_key) if has_next else None,
+        prev_cursor=encode_cursor(first_values, sort_key, backward=True) if has_prev else None
+    )
+
+
+def _keyset_predicate(columns: Sequence[Any], values: Sequence[Any], after: bool):
+    """Build (a > x) OR (a = x AND b > y) for ascending, or the mirror for descending."""
+    sort_column, id_column = columns
+    sort_value, id_value = values
+    if after:
+        return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > id_value))
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < id_value))
+
+
+def _row_values(row: Any, columns: Sequence[Any]) -> List[Any]:
+    """Read keyset values from an ORM object or a result row."""
+    return [getattr(row, column.key) for column in columns]
+
+
+def _restore_value(column: Any, value: Any) -> Any:
+    """Convert a JSON cursor value back to the column's Python type."""
+    if value is None:
+        return None
+    
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return value
+    
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
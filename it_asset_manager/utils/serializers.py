@@ -0,0 +1,149 @@
+"""
+Bulk serialization utilities for list and export APIs.
+
+This module turns rows of plain column tuples, as returned by a select()
+of model columns, into dictionaries and JSON without loading ORM objects:
+
+- RowSerializer names the columns of each row and adds derived fields,
+  which are computed against one "as of" date per batch instead of
+  calling date.today() per row. subset() narrows it to a sparse fieldset,
+  selecting only the columns those fields need.
+- dumps() and json_response() encode with orjson when it is installed,
+  falling back to the standard library json module. Dates and datetimes
+  are encoded as ISO 8601 strings by either encoder.
+"""
+
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Derived field: (name, function of the row dictionary and the as-of date,
+# keys of the fields the function reads)
+DerivedField = Tuple[str, Callable[[Dict[str, Any], date], Any], Sequence[str]]
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values the json module does not support natively."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode data as compact UTF-8 JSON.
+    
+    Args:
+        data: JSON-compatible data, which may contain dates and datetimes
+        
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(data: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response using dumps().
+    
+    Args:
+        data: JSON-compatible data
+        status: HTTP status code
+        
+    Returns:
+        Flask response
+    """
+    return Response(dumps(data), status=status, mimetype='application/json')
+
+
+class RowSerializer:
+    """
+    Serializer from column tuples to dictionaries.
+    
+    Attributes:
+        fields: (key, column) pairs; columns() selects them in this order
+        derived: Derived fields added to each dictionary, in order
+        output: Keys kept in the dictionaries, or None for all of them
+    """
+    
+    def __init__(self, fields: Sequence[Tuple[str, Any]], derived: Sequence[DerivedField] = (),
+                 output: Optional[Sequence[str]] = None) -> None:
+        self.fields = list(fields)
+        self.derived = list(derived)
+        self.output = list(output) if output is not None else None
+        self._keys = [key for key, column in self.fields]
+    
+    @property
+    def field_names(self) -> List[str]:
+        """Keys of all fields, columns first, then derived fields."""
+        return self._keys + [name for name, compute, requires in self.derived]
+    
+    def columns(self) -> List[Any]:
+        """Columns to select, in the order serialize() expects them."""
+        return [column for key, column in self.fields]
+    
+    def subset(self, names: Iterable[str], required: Iterable[str] = ()) -> 'RowSerializer':
+        """
+        Narrow the serializer to a sparse fieldset.
+        
+        Args:
+            names: Keys to output, columns or derived fields
+            required: Column keys to select even if not output, e.g. for cursors
+            
+        Returns:
+            RowSerializer selecting only the columns the names and required keys need
+            
+        Raises:
+            ValueError: If a name is not a field of this serializer
+        """
+        names = list(OrderedDict.fromkeys(names))
+        unknown = [name for name in names if name not in self.field_names]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        
+        derived = [field for field in self.derived if field[0] in names]
+        needed = set(names) | set(required)
+        for name, compute, requires in derived:
+            needed.update(requires)
+        
+        fields = [(key, column) for key, column in self.fields if key in needed]
+        return RowSerializer(fields, derived, output=names)
+    
+    def serialize(self, rows: Iterable[Sequence[Any]], as_of: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        Convert rows to dictionaries.
+        
+        Args:
+            rows: Tuples of values for columns()
+            as_of: Date derived fields are computed against, defaults to today
+            
+        Returns:
+            List of dictionaries with the field keys followed by the derived
+            keys, or with the output keys in their order
+        """
+        as_of = as_of or date.today()
+        keys = self._keys
+        derived = self.derived
+        
+        items = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            for name, compute, requires in derived:
+                item[name] = compute(item, as_of)
+            items.append(item)
+        
+        if self.output is not None:
+            output = self.output
+            items = [{key: item[key] for key in output} for item in items]
+        return items
@@ -7,10 +7,12 @@ This module contains shared fixtures and configuration for all tests.
 import pytest
 import tempfile
 import os
+from contextlib import contextmanager
 from datetime import date
 
 from it_asset_manager.core.app import create_app
 from it_asset_manager.core.database import db
+from it_asset_manager.core.instrumentation import count_queries
 from it_asset_manager.models.user import User
 from it_asset_manager.models.asset import Asset
 from it_asset_manager.models.access import ApplicationAccess, GitHubAccess
@@ -48,6 +50,24 @@ def runner(app):
     return app.test_cli_runner()
 
 
+@pytest.fixture
+def max_queries():
+    """
+    Assert that a block executes at most a given number of SQL statements.
+    
+    Usage: with max_queries(3): client.get('/assets/')
+    """
+    @contextmanager
+    def check(limit):
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"{stats.count} queries executed, expected at most {limit}:\n" + '\n'.join(stats.statements)
+        )
+    
+    return check
+
+
 @pytest.fixture
 def auth_headers(client):
     """Create authentication headers for API requests."""
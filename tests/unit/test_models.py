@@ -11,6 +11,8 @@ from datetime import date, datetime, timedelta
 from it_asset_manager.models.user import User
 from it_asset_manager.models.asset import Asset
 from it_asset_manager.models.access import ApplicationAccess, GitHubAccess
+from it_asset_manager.models.facet import AssetFacet, rebuild_facets
+from it_asset_manager.models.stats_counter import StatsCounter, reconcile_counters
 from it_asset_manager.core.database import db
 
 
@@ -216,6 +218,142 @@ class TestAssetModel:
             assert len(results) == 1
             assert results[0].brand == 'Dell'
 
+    def test_asset_search_prefix_and_sync(self, app, sample_asset):
+        """Test prefix search and index updates on change and delete."""
+        with app.app_context():
+            # Every word must prefix-match some field
+            assert len(Asset.search('lati 55')) == 1
+            assert len(Asset.search('Dell HP')) == 0
+            
+            asset = Asset.find_by_tag('LAP0001')
+            asset.assign_to_user('john.doe', 'Office Floor 2')
+            db.session.commit()
+            assert [a.id for a in Asset.search('john.doe')] == [asset.id]
+            assert Asset.search_query('office').count() == 1
+            
+            db.session.delete(asset)
+            db.session.commit()
+            assert Asset.search('Dell') == []
+    
+    def test_asset_fragment_search(self, app, sample_asset):
+        """Test substring matches inside serial numbers and asset tags."""
+        with app.app_context():
+            asset = Asset.find_by_tag('LAP0001')
+            
+            assert [a.id for a in Asset.search('456789')] == [asset.id]
+            assert [a.id for a in Asset.find_by_serial_fragment('5678')] == [asset.id]
+            assert [a.id for a in Asset.find_by_tag_fragment('p00')] == [asset.id]
+            assert Asset.find_by_serial_fragment('999') == []
+            
+            # Fragments shorter than a trigram still match via a scan
+            assert [a.id for a in Asset.find_by_tag_fragment('01')] == [asset.id]
+            
+            asset.serial_number = 'XYZ-98765'
+            db.session.commit()
+            assert Asset.find_by_serial_fragment('5678') == []
+            assert [a.id for a in Asset.search('z-987')] == [asset.id]
+            
+            # Exact lookups are unchanged
+            assert Asset.find_by_serial('98765') is None
+    
+    def test_search_index_rebuild_command(self, app, runner, sample_asset):
+        """Test the search index rebuild CLI command."""
+        with app.app_context():
+            result = runner.invoke(args=['search-index', 'rebuild'])
+            assert 'Search index rebuilt' in result.output
+            assert len(Asset.search('LAP0001')) == 1
+
+
+class TestAssetFacetModel:
+    """Test cases for the trigger-maintained asset facet counts."""
+    
+    def test_facets_follow_inserts_updates_and_deletes(self, app, sample_asset):
+        """Test that facet counts track asset changes."""
+        with app.app_context():
+            assert AssetFacet.counts('brand') == [('Dell', 1)]
+            assert AssetFacet.counts('status') == [('unassigned', 1)]
+            
+            other = Asset()
+            other.asset_tag = 'LAP0002'
+            other.asset_type = 'laptop'
+            other.asset_category = 'Computing'
+            other.serial_number = 'SN000000002'
+            other.brand = 'HP'
+            db.session.add(other)
+            db.session.commit()
+            assert AssetFacet.counts('asset_type') == [('laptop', 2)]
+            assert AssetFacet.counts('brand') == [('Dell', 1), ('HP', 1)]
+            
+            asset = Asset.find_by_tag('LAP0001')
+            asset.assign_to_user('john.doe', 'HQ')
+            db.session.commit()
+            facets = AssetFacet.all_counts()
+            assert facets['status'] == [('assigned', 1), ('unassigned', 1)]
+            assert facets['location'] == [('HQ', 1)]
+            
+            # Bulk statements bypass the ORM but not the triggers
+            Asset.query.filter_by(brand='HP').update({'brand': 'Dell'})
+            db.session.commit()
+            assert AssetFacet.counts('brand') == [('Dell', 2)]
+            
+            db.session.delete(asset)
+            db.session.commit()
+            facets = AssetFacet.all_counts()
+            assert facets['location'] == []
+            assert facets['status'] == [('unassigned', 1)]
+            assert AssetFacet.query.filter(AssetFacet.count <= 0).count() == 0
+    
+    def test_rebuild_facets(self, app, runner, sample_asset):
+        """Test repairing the facet table and the rebuild CLI command."""
+        with app.app_context():
+            AssetFacet.query.delete()
+            db.session.commit()
+            assert AssetFacet.counts('brand') == []
+            
+            assert rebuild_facets()['brand'] == 1
+            assert AssetFacet.counts('condition') == [('excellent', 1)]
+            
+            result = runner.invoke(args=['facets', 'rebuild'])
+            assert 'Facets rebuilt' in result.output
+            
+            with pytest.raises(ValueError):
+                AssetFacet.counts('unknown')
+
+
+class TestStatsCounterModel:
+    """Test cases for the trigger-maintained statistics counters."""
+    
+    def test_counters_follow_inserts_updates_and_deletes(self, app, sample_application_access):
+        """Test that counters track access changes, counting only active grants where scoped."""
+        with app.app_context():
+            counts, _ = StatsCounter.read(['app_access_status', 'app_access_application'])
+            assert counts == {'app_access_status': {'active': 1}, 'app_access_application': {'TestApp': 1}}
+            
+            access = ApplicationAccess.query.filter_by(user_name='testuser').first()
+            access.revoke_access()
+            db.session.commit()
+            counts, _ = StatsCounter.read(['app_access_status', 'app_access_application'])
+            assert counts == {'app_access_status': {'revoked': 1}, 'app_access_application': {}}
+            
+            db.session.delete(access)
+            db.session.commit()
+            assert StatsCounter.query.filter(StatsCounter.scope.like('app_access%')).count() == 0
+    
+    def test_reconcile_counters(self, app, runner, sample_asset):
+        """Test repairing drifted counters and the reconcile CLI command."""
+        with app.app_context():
+            StatsCounter.query.filter_by(scope='asset_type').delete()
+            db.session.commit()
+            
+            drift = reconcile_counters()
+            assert drift['asset_type'] == 1
+            assert drift['asset_status'] == 0
+            assert StatsCounter.read(['asset_type'])[0] == {'asset_type': {'laptop': 1}}
+            
+            result = runner.invoke(args=['stats', 'reconcile'])
+            assert 'Statistics counters reconciled' in result.output
+            assert reconcile_counters()['asset_type'] == 0
+
 
 class TestApplicationAccessModel:
     """Test cases for ApplicationAccess model."""
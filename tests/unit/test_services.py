@@ -5,16 +5,36 @@ This module contains unit tests for all service classes including
 AssetService, AuthService, and AccessService.
 """
 
+import io
+import re
 import pytest
-from datetime import date
+from datetime import date, datetime, timedelta
+from werkzeug.datastructures import FileStorage
 
 from it_asset_manager.services.asset_service import AssetService
 from it_asset_manager.services.auth_service import AuthService
 from it_asset_manager.services.access_service import AccessService
+from it_asset_manager.services import csv_import
+from it_asset_manager.services.csv_service import CSVService
+from it_asset_manager.services.app_access_csv_service import AppAccessCSVService
+from it_asset_manager.services.github_access_csv_service import GitHubAccessCSVService
+from it_asset_manager.services.import_job_service import ImportJobService
+from it_asset_manager.services.statistics_service import StatisticsService
+from it_asset_manager.services.trend_service import TrendService
+from it_asset_manager.services.expiry_service import ExpiryService
+from it_asset_manager.services import financial_service
+from it_asset_manager.services.financial_service import FinancialService
+from it_asset_manager.services.offboarding_service import OffboardingService
 from it_asset_manager.models.user import User
 from it_asset_manager.models.asset import Asset
 from it_asset_manager.models.access import ApplicationAccess, GitHubAccess
+from it_asset_manager.models.job import ImportJob
+from it_asset_manager.models.stats_snapshot import StatsSnapshot
 from it_asset_manager.core.database import db
+from it_asset_manager.core.jobs import get_job_runner
+from it_asset_manager.core.cache import GenerationCounter
+from it_asset_manager.core.instrumentation import count_queries
+from it_asset_manager.core.autocomplete import SortedValues, get_autocomplete
 
 
 class TestAssetService:
@@ -132,6 +152,328 @@ class TestAssetService:
             
             assert stats['total_assets'] >= 1
             assert isinstance(stats['asset_types'], dict)
+    
+    def test_iter_assets_csv_streams_in_batches(self, app, sample_asset):
+        """Test that the CSV export streams a header chunk and then row batches."""
+        with app.app_context():
+            for i in range(2, 6):
+                asset = Asset()
+                asset.asset_tag = f'LAP000{i}'
+                asset.asset_type = 'laptop'
+                asset.asset_category = 'Computing'
+                asset.serial_number = f'SN00000000{i}'
+                db.session.add(asset)
+            db.session.commit()
+            
+            chunks = list(AssetService.iter_assets_csv(batch_size=2))
+            assert chunks[0].startswith('Asset Tag,Asset Type,Category')
+            assert chunks[0].count('\n') == 1
+            assert [chunk.count('\n') for chunk in chunks[1:]] == [2, 2, 1]
+            
+            lines = ''.join(chunks).splitlines()
+            assert lines[1].startswith('LAP0001,laptop,Computing,purchased,Dell,Latitude 5520,SN123456789')
+            assert AssetService.export_assets_csv() == ''.join(chunks)
+
+
+class TestCSVService:
+    """Test cases for CSVService."""
+    
+    @staticmethod
+    def _row(tag, serial, **fields):
+        """Build a validated import row."""
+        row = {header: None for header in CSVService.CSV_HEADERS}
+        row.update({
+            'asset_tag': tag,
+            'asset_type': 'laptop',
+            'asset_category': 'Computing',
+            'ownership_type': 'purchased',
+            'serial_number': serial,
+            'status': 'unassigned',
+            'condition': 'good'
+        })
+        row.update(fields)
+        return row
+    
+    def test_bulk_import_creates_and_updates(self, app, sample_asset, monkeypatch):
+        """Test created/updated/error counts across chunk boundaries."""
+        with app.app_context():
+            monkeypatch.setattr(CSVService, 'IMPORT_CHUNK_SIZE', 2)
+            rows = [
+                self._row('LAP0001', 'SN123456789', location='HQ'),
+                self._row('LAP0002', 'SN000000002', brand='HP'),
+                self._row('LAP0003', 'SN123456789'),
+                self._row('LAP0002', 'SN000000022', model='EliteBook'),
+                self._row('LAP0004', 'SN000000002'),
+                self._row('LAP0005', 'SN000000022'),
+            ]
+            
+            created, updated, errors = CSVService.bulk_import_assets(rows)
+            
+            assert (created, updated) == (2, 2)
+            assert errors == [
+                'Serial number SN123456789 already exists for asset LAP0001',
+                'Serial number SN000000022 already exists for asset LAP0002',
+            ]
+            
+            # Updates keep stored values for empty cells
+            existing = Asset.find_by_tag('LAP0001')
+            assert existing.location == 'HQ'
+            assert existing.brand == 'Dell'
+            assert existing.purchase_cost == 1200.00
+            
+            # A later row for a tag created earlier updates it
+            merged = Asset.find_by_tag('LAP0002')
+            assert (merged.serial_number, merged.brand, merged.model) == ('SN000000022', 'HP', 'EliteBook')
+            assert merged.created_at is not None
+            
+            # The serial released by that update is free for a new asset
+            assert Asset.find_by_tag('LAP0004').serial_number == 'SN000000002'
+            assert Asset.query.count() == 3
+    
+    def test_bulk_import_reassigns_serials_in_order(self, app, sample_asset):
+        """Test that a tag updated again in a chunk may take a serial released in between."""
+        with app.app_context():
+            CSVService.bulk_import_assets([self._row('LAP0002', 'SN000000002')])
+            rows = [
+                self._row('LAP0001', 'SN000000003'),
+                self._row('LAP0002', 'SN123456789'),
+                self._row('LAP0001', 'SN000000002'),
+            ]
+            
+            created, updated, errors = CSVService.bulk_import_assets(rows)
+            
+            assert (created, updated, errors) == (0, 3, [])
+            assert Asset.find_by_tag('LAP0001').serial_number == 'SN000000002'
+            assert Asset.find_by_tag('LAP0002').serial_number == 'SN123456789'
+    
+    def test_import_csv_stream(self, app):
+        """Test streaming import of an uploaded file in chunks."""
+        with app.app_context():
+            lines = ['asset_tag,asset_type,serial_number,purchase_date']
+            lines += [f'LAP{i:04d},laptop,SN{i:09d},2024-01-{i + 1:02d}' for i in range(5)]
+            upload = io.BytesIO('\n'.join(lines).encode('utf-8'))
+            
+            summary = CSVService.import_csv_stream(upload, chunk_size=2)
+            
+            assert (summary.created, summary.updated) == (5, 0)
+            assert summary.rows_processed == summary.valid_rows == 5
+            assert summary.parse_errors == [] and summary.import_errors == []
+            assert Asset.find_by_tag('LAP0004').purchase_date == date(2024, 1, 5)
+    
+    def test_import_csv_stream_invalid_row_imports_nothing(self, app):
+        """Test that one invalid row rolls back chunks already written."""
+        with app.app_context():
+            lines = ['asset_tag,asset_type,serial_number,purchase_date']
+            lines += [f'LAP{i:04d},laptop,SN{i:09d},' for i in range(4)]
+            lines.append('LAP0004,laptop,SN000000004,not-a-date')
+            upload = io.BytesIO('\n'.join(lines).encode('utf-8'))
+            
+            summary = CSVService.import_csv_stream(upload, chunk_size=2)
+            
+            assert summary.parse_errors == [
+                'Row 6: Invalid date format: not-a-date. Use YYYY-MM-DD format.'
+            ]
+            assert (summary.created, summary.updated) == (0, 0)
+            assert Asset.query.count() == 0
+            
+            summary = CSVService.import_csv_stream(io.BytesIO(b'name,type\nfoo,bar\n'))
+            assert summary.parse_errors == ['Invalid CSV headers. Please use the sample CSV template.']
+
+    
+    def test_parallel_validation_matches_serial(self, monkeypatch):
+        """Test that validating on a process pool keeps row numbers, messages and order."""
+        monkeypatch.setattr(csv_import, 'VALIDATION_BATCH_SIZE', 3)
+        lines = ['asset_tag,asset_type,serial_number,purchase_date']
+        lines += [f'LAP{i:04d},laptop,SN{i:09d},{"bad" if i % 4 == 0 else "2024-01-01"}' for i in range(10)]
+        lines.insert(5, '')
+        lines.append(',laptop,SN999999999,')
+        text = '\n'.join(lines)
+        
+        serial = list(CSVService.iter_csv_rows(io.StringIO(text)))
+        parallel = list(CSVService.iter_csv_rows(io.StringIO(text), workers=2))
+        
+        assert parallel == serial
+        assert [error for _, _, error in serial if error] == [
+            'Row 2: Invalid date format: bad. Use YYYY-MM-DD format.',
+            'Row 6: Invalid date format: bad. Use YYYY-MM-DD format.',
+            'Row 10: Invalid date format: bad. Use YYYY-MM-DD format.',
+            'Row 12: Asset tag is required'
+        ]
+
+
+class TestAccessCSVImport:
+    """Test cases for the application and GitHub access CSV importers."""
+    
+    def test_app_access_import_upserts_by_key(self, app, sample_application_access, monkeypatch):
+        """Test keyed creates and updates with a constant number of statements per chunk."""
+        with app.app_context():
+            monkeypatch.setattr(csv_import, 'KEY_LOOKUP_CHUNK', 2)
+            # Revoked history next to the active grant; the oldest record is updated
+            db.session.add(ApplicationAccess(user_name='testuser', application_name='TestApp', access_level='Admin',
+                                             assign_date=date.today(), status='revoked'))
+            db.session.commit()
+            lines = ['user_name,application_name,access_level,assign_date,remarks']
+            # The first lookup also matches testuser@TestApp, which is not one of its keys
+            lines += [
+                'testuser,NewApp,Read,,',
+                'jane,TestApp,Read,2024-01-01,Contractor',
+                'testuser,TestApp,Write,,',
+                'jane,TestApp,Admin,,'
+            ]
+            
+            with count_queries() as queries:
+                summary = AppAccessCSVService.import_csv_stream(io.BytesIO('\n'.join(lines).encode('utf-8')))
+            
+            assert (summary.created, summary.updated) == (2, 2)
+            assert summary.import_errors == []
+            # Two key lookups, one UPDATE and one INSERT
+            assert queries.count == 4
+            
+            updated = db.session.get(ApplicationAccess, sample_application_access.id)
+            assert updated.access_level == 'Write'
+            assert updated.assign_date == date.today()
+            assert ApplicationAccess.query.filter_by(access_level='Admin', status='revoked').count() == 1
+            
+            # A later row for a key created earlier merges into it, keeping earlier cells
+            merged = ApplicationAccess.query.filter_by(user_name='jane', application_name='TestApp').one()
+            assert (merged.access_level, merged.remarks) == ('Admin', 'Contractor')
+            assert merged.created_at is not None and merged.status == 'active'
+            assert ApplicationAccess.query.count() == 4
+    
+    def test_github_access_import_keeps_stored_values(self, app, sample_github_access):
+        """Test that updates keep stored values for empty cells."""
+        with app.app_context():
+            db.session.get(GitHubAccess, sample_github_access.id).remarks = 'Initial'
+            db.session.commit()
+            rows = [
+                {'user_name': 'testuser', 'organization_name': 'testorg', 'repo_name': 'testrepo',
+                 'access_type': 'Admin', 'assign_date': date(2024, 2, 1), 'remove_date': None,
+                 'status': 'active', 'remarks': None},
+                {'user_name': 'testuser', 'organization_name': 'testorg', 'repo_name': 'otherrepo',
+                 'access_type': 'Read', 'assign_date': date(2024, 2, 1), 'remove_date': None,
+                 'status': 'active', 'remarks': None}
+            ]
+            
+            created, updated, errors = GitHubAccessCSVService.bulk_import_github_access(rows)
+            
+            assert (created, updated, errors) == (1, 1, [])
+            access = GitHubAccess.find_user_repo_access('testuser', 'testorg', 'testrepo')
+            assert (access.access_type, access.assign_date, access.remarks) == ('Admin', date(2024, 2, 1), 'Initial')
+            assert GitHubAccess.find_user_repo_access('testuser', 'testorg', 'otherrepo').access_type == 'Read'
+
+
+class TestImportJobService:
+    """Test cases for ImportJobService."""
+    
+    def test_submit_runs_import_in_background(self, app, tmp_path):
+        """Test that a queued import runs on the job runner and records its outcome."""
+        with app.app_context():
+            app.config['IMPORT_UPLOAD_FOLDER'] = str(tmp_path)
+            lines = ['asset_tag,asset_type,serial_number']
+            lines += [f'LAP{i:04d},laptop,SN{i:09d}' for i in range(3)]
+            upload = FileStorage(io.BytesIO('\n'.join(lines).encode('utf-8')), filename='assets.csv')
+            
+            success, message, job = ImportJobService.submit('assets', upload, 'testuser')
+            assert success is True
+            get_job_runner().shutdown(wait=True)
+            
+            progress = ImportJobService.get_progress(job.id)
+            assert progress['status'] == 'completed'
+            assert progress['rows_processed'] == 3
+            assert progress['progress_percent'] == 100.0
+            assert progress['summary'] == {
+                'created': 3,
+                'updated': 0,
+                'message': 'Import completed: 3 assets created, 0 assets updated',
+                'errors': []
+            }
+            assert Asset.query.count() == 3
+            assert list(tmp_path.iterdir()) == []
+    
+    def test_run_reports_invalid_rows(self, app, tmp_path):
+        """Test that a file with invalid rows fails the job without importing."""
+        with app.app_context():
+            path = tmp_path / 'bad.csv'
+            path.write_text('asset_tag,asset_type,serial_number,purchase_date\nLAP0001,laptop,SN000000001,yesterday\n')
+            job = ImportJob(kind='assets', filename='bad.csv', file_path=str(path),
+                            total_bytes=path.stat().st_size)
+            db.session.add(job)
+            db.session.commit()
+            
+            ImportJobService.run(job.id)
+            
+            progress = ImportJobService.get_progress(job.id)
+            assert progress['status'] == 'failed'
+            assert progress['summary']['created'] == 0
+            assert progress['summary']['errors'] == ['Row 2: Invalid date format: yesterday. Use YYYY-MM-DD format.']
+            assert Asset.query.count() == 0
+            assert not path.exists()
+    
+    def test_stale_jobs_fail_as_interrupted(self, app, tmp_path):
+        """Test that jobs left queued or running by a stopped worker fail and release their uploads."""
+        with app.app_context():
+            long_ago = datetime.utcnow() - timedelta(hours=1)
+            jobs = {}
+            for name, status, heartbeat in [('lost', 'running', long_ago), ('waiting', 'queued', long_ago),
+                                             ('live', 'running', datetime.utcnow())]:
+                path = tmp_path / f'{name}.csv'
+                path.write_text('asset_tag,asset_type,serial_number\n')
+                jobs[name] = ImportJob(kind='assets', filename=path.name, file_path=str(path), status=status,
+                                       created_at=long_ago, heartbeat_at=heartbeat)
+                db.session.add(jobs[name])
+            db.session.commit()
+            ids = {name: job.id for name, job in jobs.items()}
+            
+            assert ImportJobService.fail_stale_jobs() == 2
+            
+            progress = ImportJobService.get_progress(ids['lost'])
+            assert progress['status'] == 'failed'
+            assert progress['summary']['message'] == ImportJobService.INTERRUPTED_MESSAGE
+            assert not (tmp_path / 'lost.csv').exists()
+            assert ImportJobService.get_progress(ids['waiting'])['status'] == 'failed'
+            assert ImportJobService.get_progress(ids['live'])['status'] == 'running'
+            assert (tmp_path / 'live.csv').exists()
+            
+            # Polling fails a job once its worker stops writing to it
+            app.config['JOB_STALE_SECONDS'] = 0
+            assert ImportJobService.get_progress(ids['live'])['status'] == 'failed'
+            assert not (tmp_path / 'live.csv').exists()
+    
+    def test_queued_job_waiting_behind_import_stays_queued(self, app, tmp_path, monkeypatch):
+        """Test that a running import keeps the jobs queued behind it alive."""
+        with app.app_context():
+            long_ago = datetime.utcnow() - timedelta(hours=1)
+            waiting = ImportJob(kind='assets', filename='later.csv', file_path=str(tmp_path / 'later.csv'),
+                                created_at=long_ago, heartbeat_at=long_ago)
+            path = tmp_path / 'now.csv'
+            lines = ['asset_tag,asset_type,serial_number']
+            lines += [f'LAP{i:04d},laptop,SN{i:09d}' for i in range(csv_import.DEFAULT_CHUNK_SIZE)]
+            path.write_text('\n'.join(lines))
+            running = ImportJob(kind='assets', filename='now.csv', file_path=str(path), total_bytes=path.stat().st_size)
+            db.session.add_all([waiting, running])
+            db.session.commit()
+            monkeypatch.setattr(ImportJobService, '_waiting', {waiting.id})
+            
+            ImportJobService.run(running.id)
+            
+            assert ImportJobService.get_progress(waiting.id)['status'] == 'queued'
+            assert ImportJobService.fail_stale_jobs() == 0
+            
+            # A job failed as interrupted is never started afterwards
+            app.config['JOB_STALE_SECONDS'] = 0
+            assert ImportJobService.get_progress(waiting.id)['status'] == 'failed'
+            assert ImportJob.start(waiting.id) is False
+            assert ImportJobService.run(waiting.id) is None
+    
+    def test_submit_unknown_kind(self, app):
+        """Test submitting an import of an unknown kind."""
+        with app.app_context():
+            upload = FileStorage(io.BytesIO(b''), filename='x.csv')
+            success, message, job = ImportJobService.submit('printers', upload)
+            
+            assert success is False
+            assert job is None
+            assert 'Unknown import kind' in message
 
 
 class TestAuthService:
@@ -371,3 +713,502 @@ class TestAccessService:
             assert 'total' in github_stats
             assert 'active' in github_stats
             assert 'by_type' in github_stats
+
+    def test_batch_grant_github_access(self, app, sample_github_access):
+        """Test granting many repositories in one transaction with per-item results."""
+        with app.app_context():
+            items = [
+                {'username': 'testuser', 'organization': 'testorg', 'repo_name': 'testrepo', 'access_type': 'Read'},
+                {'username': 'testuser', 'organization': 'testorg', 'repo_name': 'other', 'access_type': 'Write'},
+                {'username': 'jane', 'organization': 'testorg', 'repo_name': 'testrepo', 'access_type': 'Admin'},
+                {'username': 'jane', 'organization': 'testorg', 'repo_name': 'testrepo', 'access_type': 'Read'},
+                {'username': 'jane', 'organization': 'testorg', 'access_type': 'Read'},
+                {'username': 'jane', 'organization': 'testorg', 'repo_name': 'x', 'access_type': 'Owner'}
+            ]
+            with count_queries() as queries:
+                success, message, results = AccessService.batch_grant_github_access(items, 'onboarding')
+            
+            assert success is True
+            assert [result['status'] for result in results] == [
+                'unchanged', 'granted', 'granted', 'duplicate', 'invalid', 'invalid'
+            ]
+            assert sum('FROM github_access' in statement for statement in queries.statements) == 1
+            assert GitHubAccess.find_user_repo_access('jane', 'testorg', 'testrepo').id == results[2]['id']
+            
+            items[0]['access_type'] = 'Admin'
+            success, message, results = AccessService.batch_grant_github_access(items[:1])
+            assert results[0]['status'] == 'updated'
+            assert GitHubAccess.find_user_repo_access('testuser', 'testorg', 'testrepo').access_type == 'Admin'
+    
+    def test_batch_revoke_application_access(self, client, auth_headers, sample_application_access):
+        """Test the batch revoke endpoint."""
+        response = client.post('/access/api/applications/batch-revoke', json={'items': [
+            {'username': 'testuser', 'application_name': 'TestApp'},
+            {'username': 'nobody', 'application_name': 'TestApp'}
+        ], 'remarks': 'offboarded'})
+        
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body['message'] == '1 revoked, 1 not found'
+        assert [result['status'] for result in body['results']] == ['revoked', 'not_found']
+        assert ApplicationAccess.find_user_app_access('testuser', 'TestApp') is None
+        
+        assert client.post('/access/api/applications/batch-revoke', json={'items': 'all'}).status_code == 400
+
+
+class TestAccessListings:
+    """Test cases for the paginated access listings."""
+    
+    @pytest.fixture
+    def github_accesses(self, app):
+        """Twelve GitHub access records, every third one revoked."""
+        with app.app_context():
+            for i in range(12):
+                db.session.add(GitHubAccess(user_name=f'user{i:02d}', organization_name='testorg',
+                                            repo_name=f'repo{i % 3}', access_type='Read', assign_date=date.today(),
+                                            status='revoked' if i % 3 == 0 else 'active'))
+            db.session.commit()
+    
+    def test_match_modes(self, app, github_accesses):
+        """Test contains, prefix and exact text filters."""
+        with app.app_context():
+            def users(match, value):
+                query = AccessService.github_access_query({'user': value}, match=match)
+                return sorted(access.user_name for access in query)
+            
+            assert users('contains', 'SER1') == ['user10', 'user11']
+            assert users('prefix', 'user1') == ['user10', 'user11']
+            assert users('prefix', 'ser1') == []
+            assert users('exact', 'user1') == []
+            assert users('exact', 'user01') == ['user01']
+            
+            with pytest.raises(ValueError):
+                AccessService.github_access_query({'user': 'x'}, match='regex')
+    
+    def test_listing_pages(self, client, auth_headers, github_accesses):
+        """Test walking the listing newest first, filtered by status."""
+        first_page = client.get('/access/github?status=active&limit=5').data.decode()
+        assert re.findall(r'<strong>(user\d+)</strong>', first_page) == ['user11', 'user10', 'user08', 'user07', 'user05']
+        
+        next_link = re.search(r'class="page-link" href="([^"#]+)">\s*Next', first_page).group(1)
+        second_page = client.get(next_link.replace('&amp;', '&')).data.decode()
+        assert re.findall(r'<strong>(user\d+)</strong>', second_page) == ['user04', 'user02', 'user01']
+        assert not re.search(r'class="page-link" href="([^"#]+)">\s*Next', second_page)
+    
+    def test_invalid_cursor_shows_first_page(self, client, auth_headers, sample_application_access):
+        """Test that a broken page link falls back to the first page."""
+        response = client.get('/access/applications?cursor=garbage&match=bogus')
+        assert response.status_code == 200
+        assert 'TestApp' in response.data.decode()
+
+
+class TestAutocomplete:
+    """Test cases for access autocomplete suggestions."""
+    
+    def test_sorted_values_prefix_search(self):
+        """Test case-insensitive prefix search with a cap."""
+        values = SortedValues(['bob', 'alice', 'Alan', 'alice', None, 'albert'])
+        
+        assert len(values) == 4
+        assert values.search('AL', 10) == ['Alan', 'albert', 'alice']
+        assert values.search('al', 2) == ['Alan', 'albert']
+        assert values.search('', 1) == ['Alan']
+        assert values.search('carol', 10) == []
+        
+        values.add('alfred')
+        values.add('alice')
+        assert values.search('alf', 10) == ['alfred']
+        assert len(values) == 5
+    
+    def test_suggestions_follow_writes(self, app, client, auth_headers, sample_github_access):
+        """Test that inserts update the index in place and other changes rebuild it."""
+        def suggest(prefix):
+            return client.get(f'/access/api/autocomplete/github_user?q={prefix}').get_json()['suggestions']
+        
+        with app.app_context():
+            index = get_autocomplete()
+            assert suggest('test') == ['testuser']
+            assert index.rebuilds == 1
+            
+            db.session.add(GitHubAccess(user_name='tester', organization_name='testorg', repo_name='testrepo',
+                                        access_type='Read', assign_date=date.today()))
+            db.session.commit()
+            GitHubAccess.query.filter_by(user_name='tester').first().revoke_access()
+            db.session.commit()
+            with count_queries() as queries:
+                assert suggest('TEST') == ['tester', 'testuser']
+            assert all('users' in statement for statement in queries.statements)  # login only
+            assert index.rebuilds == 1
+            
+            GitHubAccess.query.filter_by(user_name='tester').first().user_name = 'renamed'
+            db.session.commit()
+            assert suggest('test') == ['testuser']
+            assert index.rebuilds == 2
+    
+    def test_unknown_field_and_limit(self, client, auth_headers, sample_application_access):
+        """Test that unknown fields are rejected and limits are capped."""
+        assert client.get('/access/api/autocomplete/password').status_code == 400
+        
+        body = client.get('/access/api/autocomplete/application?limit=1000').get_json()
+        assert body == {'field': 'application', 'suggestions': ['TestApp']}
+
+
+class TestOffboardingService:
+    """Test cases for OffboardingService."""
+    
+    def test_offboard_user(self, app, sample_asset, sample_application_access, sample_github_access):
+        """Test revoking all access and unassigning all assets in one go."""
+        with app.app_context():
+            Asset.find_by_tag('LAP0001').assign_to_user('testuser')
+            db.session.add(ApplicationAccess(user_name='stays', application_name='TestApp', access_level='Read',
+                                             assign_date=date.today()))
+            db.session.commit()
+            
+            with count_queries() as queries:
+                success, message, result = OffboardingService.offboard(['testuser', 'testuser', 'nobody'], 'Left company')
+            
+            assert success is True
+            assert queries.count == 6  # one select and one update per table
+            assert result['usernames'] == ['testuser', 'nobody']
+            assert result['totals'] == {'application_access': 1, 'github_access': 1, 'assets': 1}
+            assert result['by_user']['nobody'] == {'application_access': 0, 'github_access': 0, 'assets': 0}
+            assert [item['target'] for item in result['items']] == ['TestApp', 'testorg/testrepo', 'LAP0001']
+            
+            access = ApplicationAccess.query.filter_by(user_name='testuser').one()
+            assert access.status == 'revoked'
+            assert access.remove_date == date.today()
+            assert access.remarks == 'Left company'
+            assert GitHubAccess.find_user_repo_access('testuser', 'testorg', 'testrepo') is None
+            asset = Asset.find_by_tag('LAP0001')
+            assert asset.status == 'unassigned'
+            assert asset.assigned_to == 'testuser'
+            assert ApplicationAccess.find_user_app_access('stays', 'TestApp') is not None
+            
+            receipt = OffboardingService.receipt_csv(result).splitlines()
+            assert receipt[0] == ','.join(OffboardingService.RECEIPT_HEADERS)
+            assert receipt[3] == f"assets,{asset.id},testuser,LAP0001,laptop,assigned,unassigned,{date.today().isoformat()}"
+    
+    def test_offboard_route(self, client, auth_headers, sample_github_access):
+        """Test the offboarding endpoint and its CSV receipt."""
+        response = client.post('/access/api/offboard?format=csv', json={'username': 'testuser'})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert len(response.data.decode().splitlines()) == 2
+        
+        body = client.post('/access/api/offboard', json={'usernames': ['testuser']}).get_json()
+        assert body['totals']['github_access'] == 0
+        
+        assert client.post('/access/api/offboard', json={'usernames': []}).status_code == 400
+
+
+class TestStatisticsService:
+    """Test cases for StatisticsService."""
+    
+    def test_asset_statistics_single_query(self, app, sample_asset):
+        """Test that asset statistics are read in one query."""
+        with app.app_context():
+            with count_queries() as queries:
+                stats = AssetService.get_asset_statistics()
+            
+            assert queries.count == 1
+            assert stats['total_assets'] == 1
+            assert stats['asset_types'] == {'laptop': 1}
+    
+    def test_access_statistics_single_query(self, app, sample_application_access, sample_github_access):
+        """Test that access statistics are read from the counters in one query."""
+        with app.app_context():
+            with count_queries() as queries:
+                stats = AccessService.get_access_statistics()
+            
+            assert queries.count == 1
+            assert stats['application_access']['active'] == 1
+            assert stats['top_applications'] == [{'name': 'TestApp', 'users': 1}]
+            assert stats['top_repositories'] == [{'repo': 'testorg/testrepo', 'users': 1}]
+    
+    def test_statistics_cached_until_commit(self, app, sample_asset):
+        """Test that statistics are served from cache until a commit changes the table."""
+        with app.app_context():
+            AssetService.get_asset_statistics()
+            with count_queries() as queries:
+                AccessService.get_access_statistics()
+                stats = AssetService.get_asset_statistics()
+            assert queries.count == 1  # access statistics only
+            assert stats['unassigned_assets'] == 1
+            
+            Asset.find_by_tag('LAP0001').status = 'retired'
+            db.session.commit()
+            
+            stats = AssetService.get_asset_statistics()
+            assert stats['unassigned_assets'] == 0
+            assert stats['retired_assets'] == 1
+    
+    def test_counters_match_aggregation(self, app, sample_asset, sample_application_access, sample_github_access):
+        """Test that counter reads agree with the aggregation queries."""
+        with app.app_context():
+            Asset.find_by_tag('LAP0001').warranty_expiry = date.today() + timedelta(days=5)
+            db.session.add(GitHubAccess(user_name='jane.doe', organization_name='testorg', repo_name='other',
+                                        access_type='admin', assign_date=date.today(), status='revoked'))
+            db.session.commit()
+            
+            assert StatisticsService.counted_asset_statistics() == StatisticsService.compute_asset_statistics()
+            assert StatisticsService.counted_access_statistics() == StatisticsService.compute_access_statistics()
+    
+    def test_statistics_conditional_get(self, app, client, auth_headers, sample_asset):
+        """Test that unchanged statistics are answered with 304 Not Modified."""
+        response = client.get('/assets/api/statistics')
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        
+        with app.app_context():
+            with count_queries() as queries:
+                response = client.get('/assets/api/statistics', headers={'If-None-Match': etag})
+            assert response.status_code == 304
+            assert response.data == b''
+            assert all('users' in statement for statement in queries.statements)  # login only
+            
+            Asset.find_by_tag('LAP0001').status = 'retired'
+            db.session.commit()
+        
+        response = client.get('/assets/api/statistics', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()['retired_assets'] == 1
+    
+    def test_generation_counter_shared_through_file(self, tmp_path):
+        """Test that counters mapping the same file see each other's bumps."""
+        path = str(tmp_path / 'generations.bin')
+        first, second = GenerationCounter(path), GenerationCounter(path)
+        
+        first.bump(['assets'])
+        first.bump(['assets', 'github_access'])
+        
+        assert second.snapshot(['assets', 'application_access', 'github_access']) == (first.epoch, 2, 0, 1)
+        first.close()
+        second.close()
+
+
+class TestInstrumentation:
+    """Test cases for per-request query counting."""
+    
+    def test_server_timing_header(self, client, auth_headers, sample_asset):
+        """Test that responses report the request's queries and time."""
+        response = client.get('/assets/')
+        
+        db_timing, app_timing = response.headers.getlist('Server-Timing')
+        assert db_timing.startswith('db;dur=') and db_timing.endswith(' queries"')
+        assert app_timing.startswith('app;dur=')
+    
+    def test_server_timing_disabled(self, app, client, auth_headers):
+        """Test that SERVER_TIMING = False drops the header."""
+        app.config['SERVER_TIMING'] = False
+        assert 'Server-Timing' not in client.get('/assets/').headers
+    
+    def test_listing_query_budgets(self, client, auth_headers, sample_asset,
+                                   sample_application_access, sample_github_access, max_queries):
+        """Test that list pages stay within their query budgets."""
+        for url, limit in [('/assets/', 3), ('/access/applications', 2), ('/access/github', 2)]:
+            with max_queries(limit):
+                assert client.get(url).status_code == 200
+
+
+class TestTrendService:
+    """Test cases for TrendService."""
+    
+    def test_take_snapshot(self, app, runner, sample_asset):
+        """Test recording today's statistics, replacing an earlier snapshot."""
+        with app.app_context():
+            success, message, metrics = TrendService.take_snapshot()
+            assert success is True
+            assert metrics['assets.unassigned'] == 1
+            assert metrics['assets.type.laptop'] == 1
+            
+            Asset.find_by_tag('LAP0001').assign_to_user('john.doe')
+            db.session.commit()
+            result = runner.invoke(args=['stats', 'snapshot'])
+            assert 'Recorded' in result.output
+            
+            rows = StatsSnapshot.query.filter_by(metric='assets.assigned').all()
+            assert [(row.snapshot_date, row.value) for row in rows] == [(date.today(), 1)]
+    
+    def test_get_trends(self, app):
+        """Test range queries over snapshots at daily and monthly intervals."""
+        with app.app_context():
+            for day, assigned, grants in [(date(2024, 1, 30), 5, 10), (date(2024, 1, 31), 6, 12),
+                                          (date(2024, 2, 15), 4, 15), (date(2024, 3, 1), 7, 15)]:
+                StatsSnapshot.replace_day(day, {'assets.assigned': assigned, 'application_access.total': grants,
+                                                'assets.type.laptop': assigned})
+            db.session.commit()
+            
+            success, _, trends = TrendService.get_trends(['assets.assigned'], date(2024, 1, 31), date(2024, 2, 29))
+            assert success is True
+            assert trends['series'] == {'assets.assigned': [
+                {'date': '2024-01-31', 'value': 6, 'change': None},
+                {'date': '2024-02-15', 'value': 4, 'change': -2}
+            ]}
+            
+            success, _, trends = TrendService.get_trends(
+                ['application_access.total', 'assets.type.*'], date(2024, 1, 1), date(2024, 3, 31), 'month'
+            )
+            assert [point['change'] for point in trends['series']['application_access.total']] == [None, 3, 0]
+            assert [point['date'] for point in trends['series']['assets.type.laptop']] == [
+                '2024-01-01', '2024-02-01', '2024-03-01'
+            ]
+    
+    def test_get_trends_invalid_arguments(self, app):
+        """Test rejecting unknown intervals and reversed ranges."""
+        with app.app_context():
+            success, message, _ = TrendService.get_trends(interval='hour')
+            assert success is False
+            assert 'Invalid interval' in message
+            
+            success, _, _ = TrendService.get_trends(start=date(2024, 2, 1), end=date(2024, 1, 1))
+            assert success is False
+
+
+class TestExpiryService:
+    """Test cases for ExpiryService."""
+    
+    def test_expiry_buckets(self, app, runner, sample_asset):
+        """Test sorting warranty and rental end dates into buckets."""
+        with app.app_context():
+            today = date.today()
+            asset = Asset.find_by_tag('LAP0001')
+            asset.warranty_expiry = today + timedelta(days=20)
+            rental = Asset(asset_tag='MON0001', asset_type='monitor', asset_category='Display',
+                           serial_number='SN000000002', ownership_type='rented',
+                           rental_end_date=today + timedelta(days=3), warranty_expiry=today + timedelta(days=200))
+            db.session.add(rental)
+            db.session.commit()
+            
+            buckets = ExpiryService.expiry_buckets()
+            assert [entry['asset_tag'] for entry in buckets['warranty'][30]] == ['LAP0001']
+            assert buckets['warranty'][7] == [] and buckets['warranty'][90] == []
+            assert buckets['rental'][7][0]['days_remaining'] == 3
+            
+            success, _, entries = ExpiryService.get_expiring('warranty', 90)
+            assert [entry['asset_tag'] for entry in entries] == ['LAP0001']
+            success, _, entries = ExpiryService.get_expiring('warranty', 7)
+            assert entries == []
+            
+            # Purchased assets have no rental end even if the date is set
+            asset.rental_end_date = today
+            db.session.commit()
+            success, _, entries = ExpiryService.get_expiring('rental', 7)
+            assert [entry['asset_tag'] for entry in entries] == ['MON0001']
+            
+            result = runner.invoke(args=['expiry', 'digest'])
+            assert 'rental ending within 7 days: 1' in result.output
+            assert 'MON0001 (monitor, unassigned)' in result.output
+    
+    def test_get_expiring_invalid_arguments(self, app):
+        """Test rejecting unknown kinds and bucket sizes."""
+        with app.app_context():
+            success, message, _ = ExpiryService.get_expiring('lease', 30)
+            assert success is False
+            assert 'Invalid kind' in message
+            
+            success, _, _ = ExpiryService.get_expiring('warranty', 14)
+            assert success is False
+
+
+class TestFinancialService:
+    """Test cases for FinancialService."""
+    
+    @pytest.fixture
+    def fleet(self, app, sample_asset):
+        """Purchased laptop from the sample asset plus a rented monitor."""
+        with app.app_context():
+            asset = Asset.find_by_tag('LAP0001')
+            asset.purchase_cost = 1200.0
+            asset.purchase_date = date(2022, 1, 1)
+            rental = Asset(asset_tag='MON0001', asset_type='monitor', asset_category='Display',
+                           serial_number='SN000000002', ownership_type='rented', vendor_name='RentCo',
+                           rental_cost_monthly=50.0, rental_start_date=date(2023, 6, 1),
+                           rental_end_date=date(2024, 6, 1))
+            db.session.add(rental)
+            db.session.commit()
+    
+    def test_compute_report(self, app, fleet):
+        """Test book values, rental burn and group totals."""
+        with app.app_context():
+            age = (date(2024, 1, 1) - date(2022, 1, 1)).days / 365.25
+            
+            report = FinancialService.compute_report('straight_line', date(2024, 1, 1), 4)
+            assert report['totals'] == {
+                'assets': 2, 'active_rentals': 1, 'purchase_cost': 1200.0,
+                'book_value': round(1200.0 * (1 - age / 4), 2), 'monthly_rental_burn': 50.0
+            }
+            assert [entry['name'] for entry in report['by_category']] == ['Computing', 'Display']
+            assert report['by_vendor'][1]['monthly_rental_burn'] == 50.0
+            
+            report = FinancialService.compute_report('declining_balance', date(2024, 7, 1), 4)
+            assert report['totals']['book_value'] == round(1200.0 * 0.5 ** ((date(2024, 7, 1) - date(2022, 1, 1)).days / 365.25), 2)
+            assert report['totals']['active_rentals'] == 0
+            
+            csv_data = FinancialService.report_csv(report)
+            assert csv_data.splitlines()[-1].startswith('total,All assets,2,0,1200.00,')
+    
+    def test_python_fallback_matches_numpy(self, app, fleet, monkeypatch):
+        """Test that the pure-Python path reports the same numbers as NumPy."""
+        if not financial_service.NUMPY_AVAILABLE:
+            pytest.skip('NumPy is not installed')
+        with app.app_context():
+            vectorized = FinancialService.compute_report('declining_balance', date(2024, 1, 1), 5)
+            monkeypatch.setattr(financial_service, 'NUMPY_AVAILABLE', False)
+            assert FinancialService.compute_report('declining_balance', date(2024, 1, 1), 5) == vectorized
+    
+    def test_get_report_invalid_method(self, app):
+        """Test rejecting unknown depreciation methods."""
+        with app.app_context():
+            success, message, _ = FinancialService.get_report('sum_of_years')
+            assert success is False
+            assert 'Invalid method' in message
+
+
+class TestAssetApi:
+    """Test cases for the /api/v1/assets resource built on AssetService."""
+    
+    @pytest.fixture
+    def assets(self, app):
+        """Five laptops and monitors, every other one assigned."""
+        with app.app_context():
+            for i in range(5):
+                asset = Asset(asset_tag=f'API{i:04d}', asset_type='laptop' if i % 2 else 'monitor',
+                              asset_category='Computing', serial_number=f'SNAPI{i:05d}', brand='Dell')
+                if i % 2 == 0:
+                    asset.assign_to_user(f'user{i}', 'HQ')
+                db.session.add(asset)
+            db.session.commit()
+    
+    def test_pagination_and_sparse_fields(self, client, auth_headers, assets):
+        """Test walking the pages with only the requested fields."""
+        url = '/api/v1/assets?fields=asset_tag,is_assigned&sort=asset_tag&order=asc&limit=2'
+        tags = []
+        while url:
+            body = client.get(url).get_json()
+            assert all(set(item) == {'asset_tag', 'is_assigned'} for item in body['data'])
+            tags.extend(item['asset_tag'] for item in body['data'])
+            url = body['links']['next']
+        
+        assert tags == [f'API{i:04d}' for i in range(5)]
+    
+    def test_filters(self, client, auth_headers, assets):
+        """Test exact match filters, with repeated parameters matching any value."""
+        body = client.get('/api/v1/assets?fields=asset_tag&status=assigned&type=monitor&sort=asset_tag&order=asc').get_json()
+        assert [item['asset_tag'] for item in body['data']] == ['API0000', 'API0002', 'API0004']
+        
+        body = client.get('/api/v1/assets?fields=asset_tag&assigned_to=user0&assigned_to=user4').get_json()
+        assert sorted(item['asset_tag'] for item in body['data']) == ['API0000', 'API0004']
+    
+    def test_bulk_get_by_tags(self, client, auth_headers, assets):
+        """Test fetching assets by tag in the requested order."""
+        body = client.get('/api/v1/assets?tags=API0003,MISSING,API0001&fields=serial_number').get_json()
+        assert body['data'] == [{'serial_number': 'SNAPI00003'}, {'serial_number': 'SNAPI00001'}]
+        assert body['missing'] == ['MISSING']
+    
+    def test_invalid_parameters(self, client, auth_headers):
+        """Test that bad fields, sorts and cursors are rejected with 400."""
+        for query in ['fields=asset_tag,password', 'sort=brand', 'cursor=garbage']:
+            response = client.get(f'/api/v1/assets?{query}')
+            assert response.status_code == 400
+            assert 'error' in response.get_json()
@@ -0,0 +1,179 @@
+"""
+Unit tests for utility modules.
+
+This module contains unit tests for shared helpers such as
+keyset pagination, date parsing and bulk serialization.
+"""
+
+import json
+import pytest
+from datetime import date, datetime, timedelta
+
+from it_asset_manager.models.asset import Asset, ASSET_SERIALIZER
+from it_asset_manager.models.access import GitHubAccess, GITHUB_ACCESS_SERIALIZER
+from it_asset_manager.core.database import db
+from it_asset_manager.utils.pagination import keyset_paginate, clamp_page_size
+from it_asset_manager.utils.dates import DATE_FORMATS, DateParser
+from it_asset_manager.utils import serializers
+
+
+def _create_assets(count):
+    """Create assets sharing one updated_at value to exercise the id tie-breaker."""
+    stamp = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(count):
+        asset = Asset()
+        asset.asset_tag = f'LAP{i:04d}'
+        asset.asset_type = 'laptop'
+        asset.asset_category = 'Computing'
+        asset.serial_number = f'SN{i:09d}'
+        asset.updated_at = stamp + timedelta(minutes=i // 2)
+        db.session.add(asset)
+    db.session.commit()
+
+
+class TestKeysetPagination:
+    """Test cases for keyset pagination."""
+    
+    def test_walks_forward_and_backward(self, app):
+        """Test that next/prev cursors visit every row exactly once."""
+        with app.app_context():
+            _create_assets(7)
+            
+            seen = []
+            page = keyset_paginate(Asset.query, Asset.updated_at, Asset.id, limit=3)
+            assert page.has_prev is False
+            pages = [page]
+            while page.has_next:
+                page = keyset_paginate(Asset.query, Asset.updated_at, Asset.id,
+                                       cursor=page.next_cursor, limit=3)
+                pages.append(page)
+            
+            for p in pages:
+                seen.extend(a.asset_tag for a in p.items)
+            
+            assert len(pages) == 3
+            assert len(seen) == len(set(seen)) == 7
+            assert seen[0] == 'LAP0006'
+            
+            # Walking back from the last page returns the middle page unchanged
+            previous = keyset_paginate(Asset.query, Asset.updated_at, Asset.id,
+                                       cursor=pages[-1].prev_cursor, limit=3)
+            assert [a.id for a in previous.items] == [a.id for a in pages[1].items]
+            assert previous.has_next is True
+    
+    def test_ascending_order_with_filter(self, app):
+        """Test ascending pagination over a filtered query."""
+        with app.app_context():
+            _create_assets(5)
+            
+            query = Asset.query.filter(Asset.asset_tag != 'LAP0002')
+            page = keyset_paginate(query, Asset.asset_tag, Asset.id, limit=2, descending=False)
+            assert [a.asset_tag for a in page.items] == ['LAP0000', 'LAP0001']
+            
+            page = keyset_paginate(query, Asset.asset_tag, Asset.id,
+                                   cursor=page.next_cursor, limit=2, descending=False)
+            assert [a.asset_tag for a in page.items] == ['LAP0003', 'LAP0004']
+            assert page.has_next is False
+    
+    def test_rejects_foreign_cursor(self, app):
+        """Test that a cursor from another ordering is rejected."""
+        with app.app_context():
+            _create_assets(3)
+            
+            page = keyset_paginate(Asset.query, Asset.updated_at, Asset.id, limit=1)
+            with pytest.raises(ValueError):
+                keyset_paginate(Asset.query, Asset.asset_tag, Asset.id, cursor=page.next_cursor)
+            with pytest.raises(ValueError):
+                keyset_paginate(Asset.query, Asset.updated_at, Asset.id, cursor='not-a-cursor')
+    
+    def test_clamp_page_size(self):
+        """Test page size bounds."""
+        assert clamp_page_size(None) == 50
+        assert clamp_page_size('abc', default=20) == 20
+        assert clamp_page_size('0') == 1
+        assert clamp_page_size('10000', maximum=200) == 200
+
+
+class TestDateParser:
+    """Test cases for DateParser."""
+    
+    @staticmethod
+    def _strptime(value):
+        """Parse the way the CSV services did before DateParser."""
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+        return None
+    
+    def test_matches_strptime_in_priority_order(self):
+        """Test that every format resolves exactly like trying strptime in order."""
+        parser = DateParser()
+        values = [
+            '2024-01-05', '2024-1-5', '2024-02-30', '03/04/2023', '13/04/2023', '3/4/2023',
+            '2023/04/13', '04/31/2023', '2023-13-01', '20240105', '2024-01-05T10:00', '1/ 9/2023'
+        ]
+        for value in values:
+            try:
+                parsed = parser.parse(value)
+            except ValueError:
+                parsed = None
+            assert parsed == self._strptime(value), value
+    
+    def test_sniffed_column_keeps_ambiguous_values(self):
+        """Test that a column sniffed as day-first still reads 03/04 as March 4."""
+        parser = DateParser()
+        for month in range(1, 1 + parser.SNIFF_SAMPLES):
+            parser.parse(f'{13 + month % 16}/{1 + month % 12:02d}/{2000 + month}', 'purchase_date')
+        
+        assert parser.parse('03/04/2023', 'purchase_date') == date(2023, 3, 4)
+        assert parser.parse('25/04/2023', 'purchase_date') == date(2023, 4, 25)
+    
+    def test_invalid_value_message(self):
+        """Test the error message for bad values, including memoized ones."""
+        parser = DateParser()
+        assert parser.parse('') is None
+        for _ in range(2):
+            with pytest.raises(ValueError, match=r'^Invalid date format: 31/31/2023\. Use YYYY-MM-DD format\.$'):
+                parser.parse('31/31/2023', 'assign_date')
+
+
+class TestRowSerializer:
+    """Test cases for the column tuple serializers."""
+    
+    def test_matches_to_dict(self, app, sample_asset, sample_github_access):
+        """Test that serialized rows encode like to_dict() of the ORM objects."""
+        with app.app_context():
+            asset = Asset.find_by_tag('LAP0001')
+            asset.ownership_type = 'rented'
+            asset.rental_end_date = date.today() + timedelta(days=12)
+            asset.warranty_expiry = date.today() - timedelta(days=1)
+            db.session.commit()
+            
+            for model, serializer in [(Asset, ASSET_SERIALIZER), (GitHubAccess, GITHUB_ACCESS_SERIALIZER)]:
+                rows = db.session.query(*serializer.columns()).all()
+                encoded = json.loads(serializers.dumps(serializer.serialize(rows)))
+                assert encoded == [record.to_dict() for record in model.query.all()]
+            
+            assert encoded[0]['full_repo_name'] == 'testorg/testrepo'
+    
+    def test_as_of_date(self, app, sample_github_access):
+        """Test that derived fields use the batch's as-of date."""
+        with app.app_context():
+            rows = db.session.query(*GITHUB_ACCESS_SERIALIZER.columns()).all()
+            assign_date = rows[0].assign_date
+            
+            item = GITHUB_ACCESS_SERIALIZER.serialize(rows, as_of=assign_date + timedelta(days=10))[0]
+            assert item['days_since_assigned'] == 10
+    
+    def test_json_fallback_matches_orjson(self, monkeypatch):
+        """Test that the json module fallback encodes like orjson."""
+        data = {'day': date(2024, 1, 2), 'stamp': datetime(2024, 1, 2, 3, 4, 5, 600), 'values': [1, 2.5, None]}
+        monkeypatch.setattr(serializers, 'ORJSON_AVAILABLE', False)
+        fallback = serializers.dumps(data)
+        
+        assert json.loads(fallback) == {'day': '2024-01-02', 'stamp': '2024-01-02T03:04:05.000600', 'values': [1, 2.5, None]}
+        if serializers.ORJSON_AVAILABLE:
+            monkeypatch.undo()
+            assert serializers.dumps(data) == fallback